@@ -1,9 +1,22 @@
+import { timingSafeEqual } from 'crypto'
 import { MongoClient } from 'mongodb'
 import { v4 as uuidv4 } from 'uuid'
 import { NextResponse } from 'next/server'
 import { getClient } from '@/lib/apollo-client'
-import { GET_AI_TOOLS, SEARCH_AI_TOOLS, isAITool } from '@/lib/producthunt'
+import { syncProductHunt } from '@/lib/producthunt-sync'
+import { enqueueJob, getJob, jobView } from '@/lib/jobs'
 import TargetedAiToolsScraper from '@/lib/scrapers/targeted-aitools-scraper'
+import PageCache from '@/lib/scrapers/page-cache'
+import { OPENAI_BASE_URL, ANTHROPIC_BASE_URL, GEMINI_BASE_URL } from '@/lib/llm-endpoints'
+import { buildSearchFilter, escapeRegex } from '@/lib/tool-search'
+import { SORT_MODES, DEFAULT_SORT, RELEVANCE, sortSpec, encodeCursor, encodeOffsetCursor, decodeCursor, keysetFilter } from '@/lib/tool-pagination'
+import { countCacheKey, cachedToolCount, countTools, invalidateToolCounts } from '@/lib/count-cache'
+import { ensureIndexes, createIndexes, explainHotQueries } from '@/lib/db-indexes'
+import { ingestTools, SCRAPED_INSERT_ONLY } from '@/lib/tool-ingest'
+import { getCatalogStats, refreshCatalogStats, refreshCatalogStatsSafely } from '@/lib/catalog-stats'
+import { buildKnowledgeIndex, deleteKnowledgeIndex, ensureKnowledgeIndex, searchKnowledge, snippet } from '@/lib/knowledge-index'
+import { getChatbotConfig, chatbotCacheStats } from '@/lib/chatbot-cache'
+import { recordChatInteraction, chatWriteStats } from '@/lib/chat-writes'
 
 // MongoDB connection
 let client
@@ -14,6 +27,8 @@ async function connectToMongo() {
     client = new MongoClient(process.env.MONGO_URL)
     await client.connect()
     db = client.db(process.env.DB_NAME)
+    // Builds in the background; requests don't wait on index builds
+    ensureIndexes(db)
   }
   return db
 }
@@ -24,9 +39,37 @@ function handleCORS(response) {
   response.headers.set('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
   response.headers.set('Access-Control-Allow-Headers', 'Content-Type, Authorization')
   response.headers.set('Access-Control-Allow-Credentials', 'true')
+  response.headers.set('Access-Control-Expose-Headers', 'Server-Timing, Location, ETag')
   return response
 }
 
+// Maintenance operations (index rebuilds, catalog recounts) need the
+// API_SECRET that the scheduled sync workflow sends as a bearer token
+function isAdminRequest(request) {
+  const secret = process.env.API_SECRET
+  const match = /^Bearer (.+)$/.exec(request.headers.get('authorization') || '')
+  if (!secret || !match) return false
+  const given = Buffer.from(match[1])
+  const expected = Buffer.from(secret)
+  return given.length === expected.length && timingSafeEqual(given, expected)
+}
+
+function adminRequired() {
+  return handleCORS(NextResponse.json({ error: 'Admin authorization required' }, { status: 401 }))
+}
+
+// JSON response tagged with an ETag; 304 when the client already has it
+function handleETag(request, etag, body) {
+  const headers = { ETag: etag, 'Cache-Control': 'no-cache' }
+  const ifNoneMatch = (request.headers.get('if-none-match') || '')
+    .split(',')
+    .map(tag => tag.trim().replace(/^W\//, ''))
+  if (ifNoneMatch.includes(etag) || ifNoneMatch.includes('*')) {
+    return handleCORS(new NextResponse(null, { status: 304, headers }))
+  }
+  return handleCORS(NextResponse.json(body, { headers }))
+}
+
 // OPTIONS handler for CORS
 export async function OPTIONS() {
   return handleCORS(new NextResponse(null, { status: 200 }))
@@ -189,31 +232,64 @@ function countNodes(workflowJson, platform) {
   }
 }
 
-// Helper function to transform Product Hunt data to our format
-function transformPHToolToDBFormat(phTool) {
-  return {
-    id: uuidv4(),
-    ph_id: phTool.id,
-    name: phTool.name,
-    tagline: phTool.tagline,
-    description: phTool.description,
-    votes: phTool.votesCount,
-    url: phTool.url,
-    website: phTool.website,
-    makers: [], // Simplified - no makers data in reduced query
-    topics: [], // Simplified - no topics data in reduced query
-    category: 'General',
-    pricing: 'Unknown',
-    rating: Math.random() * 2 + 3,
-    featured_at: new Date(phTool.createdAt),
-    source: 'Product Hunt',
-    created_at: new Date(),
-    updated_at: new Date()
-  }
+// Routes that can run as background jobs. Syncs do by default (?wait=true
+// blocks instead); generation endpoints when asked with ?async=true or a
+// `Prefer: respond-async` header. Syncs with the same parameters share a job.
+const JOB_ROUTES = {
+  '/ai-tools/sync': { byDefault: true, dedupe: true },
+  '/ai-tools/sync-aitools': { byDefault: true, dedupe: true },
+  '/ai-tools/sync-all': { byDefault: true, dedupe: true },
+  '/website-builder/generate': { byDefault: false, dedupe: false },
+  '/workflow-builder/generate': { byDefault: false, dedupe: false },
+  '/agents/run': { byDefault: false, dedupe: false }
+}
+
+function wantsJob(request, jobRoute) {
+  const searchParams = new URL(request.url).searchParams
+  if (searchParams.get('wait') === 'true') return false
+  if (searchParams.get('async') === 'true') return true
+  if (/respond-async/i.test(request.headers.get('prefer') || '')) return true
+  return jobRoute.byDefault
+}
+
+// Answers 202 with a job that replays the request through handleRoute with
+// ?wait=true, passing the job's progress callback as context.onProgress. The
+// body stays in memory only, since it can carry API keys.
+async function startRouteJob(db, request, context, route, jobRoute) {
+  const url = new URL(request.url)
+  url.searchParams.delete('async')
+  url.searchParams.set('wait', 'true')
+  url.searchParams.sort()
+  const body = await request.text()
+  const headers = new Headers(request.headers)
+  headers.delete('prefer')
+
+  const { job, created } = await enqueueJob(db, {
+    type: route,
+    dedupeKey: jobRoute.dedupe ? `${route}?${url.searchParams}` : null,
+    run: async (onProgress) => {
+      const response = await handleRoute(
+        new Request(url, { method: request.method, headers, body: body || undefined }),
+        { ...context, onProgress }
+      )
+      const result = await response.json()
+      if (!response.ok) {
+        throw Object.assign(new Error(result.error || `HTTP ${response.status}`), { result })
+      }
+      return result
+    }
+  })
+
+  const response = NextResponse.json(
+    { job: jobView(job), duplicate: !created, status_url: `/api/jobs/${job.id}` },
+    { status: 202 }
+  )
+  response.headers.set('Location', `/api/jobs/${job.id}`)
+  return handleCORS(response)
 }
 
 // Route handler function
-async function handleRoute(request, { params }) {
+async function handleRoute(request, { params, onProgress }) {
   const { path = [] } = params
   const route = `/${path.join('/')}`
   const method = request.method
@@ -221,6 +297,21 @@ async function handleRoute(request, { params }) {
   try {
     const db = await connectToMongo()
 
+    // Long-running requests can run as background jobs (see JOB_ROUTES)
+    const jobRoute = method === 'POST' && JOB_ROUTES[route]
+    if (jobRoute && wantsJob(request, jobRoute)) {
+      return await startRouteJob(db, request, { params }, route, jobRoute)
+    }
+
+    // Job status - GET /api/jobs/{id}
+    if (path[0] === 'jobs' && path.length === 2 && method === 'GET') {
+      const job = await getJob(db, path[1])
+      if (!job) {
+        return handleCORS(NextResponse.json({ error: "Job not found" }, { status: 404 }))
+      }
+      return handleCORS(NextResponse.json(jobView(job)))
+    }
+
     // Root endpoint - GET /api/root (since /api/ is not accessible with catch-all)
     if (route === '/root' && method === 'GET') {
       return handleCORS(NextResponse.json({ message: "Hello World" }))
@@ -239,49 +330,85 @@ async function handleRoute(request, { params }) {
       const category = searchParams.get('category') || '';
       const source = searchParams.get('source') || 'all';
       const sort = searchParams.get('sort') || 'featured_at';
-      
-      const skip = (page - 1) * limit;
+      const match = searchParams.get('match') || 'text';
+      const cursorParam = searchParams.get('cursor');
+      const estimate = searchParams.get('estimate') === 'true';
       
       // Build query
-      let query = {};
-      if (search) {
-        query.$or = [
-          { name: { $regex: search, $options: 'i' } },
-          { tagline: { $regex: search, $options: 'i' } },
-          { description: { $regex: search, $options: 'i' } }
-        ];
-      }
+      const { filter: query, textSearch } = await buildSearchFilter(db, search, match);
       if (category && category !== 'all') {
-        query.category = { $regex: category, $options: 'i' };
+        query.category = { $regex: escapeRegex(category), $options: 'i' };
       }
       if (source !== 'all') {
         query.source = source;
       }
       
-      // Build sort object
-      let sortObj = {};
-      switch (sort) {
-        case 'votes':
-          sortObj = { votes: -1 };
-          break;
-        case 'name':
-          sortObj = { name: 1 };
-          break;
-        case 'rating':
-          sortObj = { rating: -1 };
-          break;
-        default:
-          sortObj = { featured_at: -1 };
+      // Resolve the sort mode; _id breaks ties so every tool has a unique position
+      let sortMode = Object.hasOwn(SORT_MODES, sort) ? sort : DEFAULT_SORT;
+      let sortObj = sortSpec(sortMode);
+      if (sort === RELEVANCE && textSearch) {
+        // Only meaningful for text search; otherwise keep the default order
+        sortMode = RELEVANCE;
+        sortObj = { score: { $meta: 'textScore' }, votes: -1, _id: -1 };
       }
       
-      const aiTools = await db.collection('ai_tools')
-        .find(query)
+      // A cursor continues after the last tool of the previous page; page
+      // numbers are still accepted and fall back to skip()
+      let cursor = null;
+      if (cursorParam) {
+        try {
+          cursor = decodeCursor(cursorParam);
+        } catch (error) {
+          return handleCORS(NextResponse.json({ error: "Invalid cursor" }, { status: 400 }));
+        }
+        if (cursor.mode !== sortMode) {
+          return handleCORS(NextResponse.json(
+            { error: `Cursor was issued for sort '${cursor.mode}', not '${sortMode}'` },
+            { status: 400 }
+          ));
+        }
+      }
+      
+      let skip = (page - 1) * limit;
+      let findQuery = query;
+      if (cursor && sortMode === RELEVANCE) {
+        skip = cursor.offset;
+      } else if (cursor) {
+        skip = 0;
+        findQuery = { ...query, $and: [...(query.$and || []), keysetFilter(cursor)] };
+      }
+      
+      // Fetch one extra row to learn whether another page follows
+      const rows = await db.collection('ai_tools')
+        .find(findQuery)
         .sort(sortObj)
         .skip(skip)
-        .limit(limit)
+        .limit(limit + 1)
         .toArray();
+      const hasMore = rows.length > limit;
+      const aiTools = hasMore ? rows.slice(0, limit) : rows;
       
-      const total = await db.collection('ai_tools').countDocuments(query);
+      let nextCursor = null;
+      if (hasMore) {
+        nextCursor = sortMode === RELEVANCE
+          ? encodeOffsetCursor(sortMode, skip + limit)
+          : encodeCursor(sortMode, aiTools[aiTools.length - 1]);
+      }
+      
+      // hasMore comes from the extra row above, so the total is only
+      // metadata: cached per filter, never counted for cursor pages, and in
+      // estimate mode read from collection metadata when unfiltered
+      const countKey = countCacheKey({ search, match, category, source });
+      let total;
+      if (cursor) {
+        total = cachedToolCount(countKey);
+      } else if (estimate) {
+        total = Object.keys(query).length === 0
+          ? await db.collection('ai_tools').estimatedDocumentCount()
+          : cachedToolCount(countKey);
+      } else {
+        total = await countTools(db, query, countKey);
+      }
       
       // Remove MongoDB's _id field from response
       const cleanedTools = aiTools.map(({ _id, ...rest }) => rest);
@@ -289,10 +416,12 @@ async function handleRoute(request, { params }) {
       return handleCORS(NextResponse.json({
         tools: cleanedTools,
         pagination: {
-          page,
+          page: cursor ? null : page,
           limit,
           total,
-          hasMore: skip + limit < total
+          hasMore,
+          nextCursor,
+          ...(estimate && { estimated: true })
         }
       }));
     }
@@ -300,32 +429,14 @@ async function handleRoute(request, { params }) {
     // AI Tools sync endpoint - POST /api/ai-tools/sync (Product Hunt)
     if (route === '/ai-tools/sync' && method === 'POST') {
       try {
-        const apolloClient = getClient();
-        const { data } = await apolloClient.query({
-          query: GET_AI_TOOLS,
-          variables: { first: 10 } // Reduced from 50 to 10 to lower complexity
-        });
-        
-        const tools = data.posts.edges.map(edge => edge.node);
-        const aiTools = tools.filter(isAITool);
-        
-        let syncedCount = 0;
-        
-        for (const tool of aiTools) {
-          // Check if tool already exists
-          const existingTool = await db.collection('ai_tools').findOne({ ph_id: tool.id });
-          
-          if (!existingTool) {
-            const transformedTool = transformPHToolToDBFormat(tool);
-            await db.collection('ai_tools').insertOne(transformedTool);
-            syncedCount++;
-          }
-        }
+        // Pages through posts newer than the last sync; ?pages= caps the run
+        const maxPages = parseInt(new URL(request.url).searchParams.get('pages') || '10');
+        const result = await syncProductHunt(db, getClient(), { maxPages, onProgress });
         
         return handleCORS(NextResponse.json({
-          message: `Successfully synced ${syncedCount} new AI tools from Product Hunt`,
-          synced: syncedCount,
-          total_found: aiTools.length
+          message: `Successfully synced ${result.inserted} new AI tools from Product Hunt`,
+          synced: result.inserted,
+          ...result
         }));
         
       } catch (error) {
@@ -334,46 +445,39 @@ async function handleRoute(request, { params }) {
           { error: 'Failed to sync AI tools from Product Hunt' },
           { status: 500 }
         ));
+      } finally {
+        invalidateToolCounts();
+        await refreshCatalogStatsSafely(db);
       }
     }
 
     // AI Tools sync endpoint - POST /api/ai-tools/sync-aitools (Targeted AITools.fyi)
     if (route === '/ai-tools/sync-aitools' && method === 'POST') {
       try {
-        const scraper = new TargetedAiToolsScraper();
+        // ?force=true re-parses every page even if it hasn't changed
+        const force = new URL(request.url).searchParams.get('force') === 'true';
+        const pageCache = force ? null : new PageCache(db.collection('scrape_pages'));
+        const scraper = new TargetedAiToolsScraper({ pageCache, onProgress });
+        const scrapeStart = Date.now();
         const scrapedTools = await scraper.scrapeAllTargetPages();
+        const ingestStart = Date.now();
         
-        let syncedCount = 0;
-        
-        for (const tool of scrapedTools) {
-          // Check if tool already exists by name and source
-          const existingTool = await db.collection('ai_tools').findOne({ 
-            name: tool.name, 
-            source: tool.source 
-          });
-          
-          if (!existingTool) {
-            await db.collection('ai_tools').insertOne(tool);
-            syncedCount++;
-          } else {
-            // Update existing tool with new information
-            await db.collection('ai_tools').updateOne(
-              { _id: existingTool._id },
-              { 
-                $set: { 
-                  ...tool,
-                  updated_at: new Date()
-                }
-              }
-            );
-          }
+        const counts = await ingestTools(db.collection('ai_tools'), scrapedTools, { insertOnly: SCRAPED_INSERT_ONLY });
+        if (pageCache && !counts.failed) {
+          await pageCache.commit();
         }
         
         return handleCORS(NextResponse.json({
-          message: `Successfully synced ${syncedCount} new AI tools from targeted pages`,
-          synced: syncedCount,
+          message: `Successfully synced ${counts.inserted} new AI tools from targeted pages`,
+          synced: counts.inserted,
+          ...counts,
           total_found: scrapedTools.length,
-          pages_scraped: 20
+          pages_scraped: scraper.targetUrls.length,
+          ...(pageCache && { pages: pageCache.stats }),
+          timings: {
+            scrape_ms: ingestStart - scrapeStart,
+            ingest_ms: Date.now() - ingestStart
+          }
         }));
         
       } catch (error) {
@@ -382,61 +486,47 @@ async function handleRoute(request, { params }) {
           { error: 'Failed to sync AI tools from targeted sources' },
           { status: 500 }
         ));
+      } finally {
+        invalidateToolCounts();
+        await refreshCatalogStatsSafely(db);
       }
     }
 
     // AI Tools sync all endpoint - POST /api/ai-tools/sync-all
     if (route === '/ai-tools/sync-all' && method === 'POST') {
       try {
-        let totalSynced = 0;
+        // ?force=true re-parses every page even if it hasn't changed
+        const force = new URL(request.url).searchParams.get('force') === 'true';
+        const sources = {};
         
         // Sync from Product Hunt
         try {
-          const apolloClient = getClient();
-          const { data } = await apolloClient.query({
-            query: GET_AI_TOOLS,
-            variables: { first: 10 }
-          });
-          
-          const tools = data.posts.edges.map(edge => edge.node);
-          const aiTools = tools.filter(isAITool);
-          
-          for (const tool of aiTools) {
-            const existingTool = await db.collection('ai_tools').findOne({ ph_id: tool.id });
-            
-            if (!existingTool) {
-              const transformedTool = transformPHToolToDBFormat(tool);
-              await db.collection('ai_tools').insertOne(transformedTool);
-              totalSynced++;
-            }
-          }
+          sources.product_hunt = await syncProductHunt(db, getClient(), { onProgress });
         } catch (phError) {
           console.error('Product Hunt sync error:', phError);
         }
         
         // Sync from AITools.fyi
         try {
-          const scraper = new AiToolsScraper();
-          const scrapedTools = await scraper.scrapeWithFallback();
+          const pageCache = force ? null : new PageCache(db.collection('scrape_pages'));
+          const scraper = new TargetedAiToolsScraper({ pageCache, onProgress });
+          const scrapedTools = await scraper.scrapeAllTargetPages();
           
-          for (const tool of scrapedTools) {
-            const existingTool = await db.collection('ai_tools').findOne({ 
-              name: tool.name, 
-              source: tool.source 
-            });
-            
-            if (!existingTool) {
-              await db.collection('ai_tools').insertOne(tool);
-              totalSynced++;
-            }
+          const counts = await ingestTools(db.collection('ai_tools'), scrapedTools, { insertOnly: SCRAPED_INSERT_ONLY });
+          if (pageCache && !counts.failed) {
+            await pageCache.commit();
           }
+          sources.aitools_fyi = { ...counts, ...(pageCache && { pages: pageCache.stats }) };
         } catch (scrapeError) {
           console.error('AITools.fyi sync error:', scrapeError);
         }
         
+        const totalSynced = Object.values(sources).reduce((sum, counts) => sum + counts.inserted, 0);
+        
         return handleCORS(NextResponse.json({
           message: `Successfully synced ${totalSynced} new AI tools from all sources`,
-          synced: totalSynced
+          synced: totalSynced,
+          sources
         }));
         
       } catch (error) {
@@ -445,6 +535,9 @@ async function handleRoute(request, { params }) {
           { error: 'Failed to sync AI tools from all sources' },
           { status: 500 }
         ));
+      } finally {
+        invalidateToolCounts();
+        await refreshCatalogStatsSafely(db);
       }
     }
 
@@ -466,33 +559,29 @@ async function handleRoute(request, { params }) {
     }
 
     // AI Tools categories endpoint - GET /api/ai-tools/categories
+    // Served from the catalog_stats document that each sync refreshes
     if (route === '/ai-tools/categories' && method === 'GET') {
-      const categories = await db.collection('ai_tools')
-        .distinct('category');
+      const stats = await getCatalogStats(db);
       
-      return handleCORS(NextResponse.json({
-        categories: categories.filter(cat => cat && cat !== 'General')
-      }));
+      return handleETag(request, stats.etag, {
+        categories: stats.category_names
+      });
     }
 
     // AI Tools stats endpoint - GET /api/ai-tools/stats
-    if (route === '/ai-tools/stats' && method === 'GET') {
-      const totalTools = await db.collection('ai_tools').countDocuments();
-      const categoryCounts = await db.collection('ai_tools').aggregate([
-        { $group: { _id: '$category', count: { $sum: 1 } } },
-        { $sort: { count: -1 } }
-      ]).toArray();
-      
-      const sourceCounts = await db.collection('ai_tools').aggregate([
-        { $group: { _id: '$source', count: { $sum: 1 } } },
-        { $sort: { count: -1 } }
-      ]).toArray();
+    // POST recounts the catalog, e.g. after writing to ai_tools directly (admin only)
+    if (route === '/ai-tools/stats' && (method === 'GET' || method === 'POST')) {
+      if (method === 'POST' && !isAdminRequest(request)) {
+        return adminRequired()
+      }
+      const stats = method === 'POST' ? await refreshCatalogStats(db) : await getCatalogStats(db);
       
-      return handleCORS(NextResponse.json({
-        total: totalTools,
-        categories: categoryCounts,
-        sources: sourceCounts
-      }));
+      return handleETag(request, stats.etag, {
+        total: stats.total,
+        categories: stats.categories,
+        sources: stats.sources,
+        computed_at: stats.computed_at
+      });
     }
 
     // Website Builder generation endpoint - POST /api/website-builder/generate
@@ -575,7 +664,7 @@ Generate a complete, professional website that looks like it was built by a top-
         
         // Generate code based on provider
         if (provider === 'openai') {
-          const response = await fetch('https://api.openai.com/v1/chat/completions', {
+          const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
             method: 'POST',
             headers: {
               'Authorization': `Bearer ${apiKey}`,
@@ -601,7 +690,7 @@ Generate a complete, professional website that looks like it was built by a top-
           generatedCode = data.choices[0].message.content
           
         } else if (provider === 'claude') {
-          const response = await fetch('https://api.anthropic.com/v1/messages', {
+          const response = await fetch(`${ANTHROPIC_BASE_URL}/v1/messages`, {
             method: 'POST',
             headers: {
               'x-api-key': apiKey,
@@ -627,7 +716,7 @@ Generate a complete, professional website that looks like it was built by a top-
           generatedCode = data.content[0].text
           
         } else if (provider === 'gemini') {
-          const response = await fetch(`https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-pro:generateContent?key=${apiKey}`, {
+          const response = await fetch(`${GEMINI_BASE_URL}/v1beta/models/gemini-1.5-pro:generateContent?key=${apiKey}`, {
             method: 'POST',
             headers: {
               'Content-Type': 'application/json',
@@ -794,13 +883,25 @@ Generate a complete, professional website that looks like it was built by a top-
           })
         }
         
-        // Create chatbot record
+        // Create system prompt based on personality
+        const personalityPrompts = {
+          helpful: 'You are a helpful and informative assistant.',
+          friendly: 'You are a friendly and approachable assistant.',
+          expert: 'You are a knowledgeable expert in your field.',
+          creative: 'You are a creative and imaginative assistant.',
+          formal: 'You are a professional and formal assistant.'
+        }
+        
+        const systemPrompt = personalityPrompts[personality] || personalityPrompts.helpful
+        
+        // Create chatbot record; the knowledge itself is stored as chunks
         const chatbot = {
           id: uuidv4(),
           name: name,
           description: description || '',
           personality: personality || 'helpful',
-          knowledge_base: knowledgeText,
+          system_prompt: systemPrompt,
+          knowledge_length: knowledgeText.length,
           knowledge_sources: {
             documents: knowledge.documents?.map(doc => ({ name: doc.name, type: doc.type })) || [],
             urls: knowledge.urls?.filter(url => url.trim()) || [],
@@ -813,26 +914,20 @@ Generate a complete, professional website that looks like it was built by a top-
           embedding_active: true
         }
         
-        // Save to database
-        await db.collection('chatbots').insertOne(chatbot)
-        
-        // Create system prompt based on personality
-        const personalityPrompts = {
-          helpful: 'You are a helpful and informative assistant.',
-          friendly: 'You are a friendly and approachable assistant.',
-          expert: 'You are a knowledgeable expert in your field.',
-          creative: 'You are a creative and imaginative assistant.',
-          formal: 'You are a professional and formal assistant.'
+        // Chunk and index the knowledge base first and save the chatbot with
+        // the index summary, so a saved chatbot always has its knowledge. If
+        // either step fails, the chunks written so far are removed again.
+        let knowledgeIndex
+        try {
+          knowledgeIndex = await buildKnowledgeIndex(db, chatbot.id, knowledgeText, { embeddings: chatbot.embedding_active })
+          await db.collection('chatbots').insertOne({ ...chatbot, knowledge_index: knowledgeIndex })
+        } catch (error) {
+          await deleteKnowledgeIndex(db, chatbot.id).catch(cleanupError => {
+            console.error(`Failed to remove knowledge of unsaved chatbot ${chatbot.id}:`, cleanupError)
+          })
+          throw error
         }
         
-        const systemPrompt = personalityPrompts[personality] || personalityPrompts.helpful
-        
-        // Update chatbot with system prompt
-        await db.collection('chatbots').updateOne(
-          { id: chatbot.id },
-          { $set: { system_prompt: systemPrompt } }
-        )
-        
         return handleCORS(NextResponse.json({
           success: true,
           id: chatbot.id,
@@ -840,6 +935,7 @@ Generate a complete, professional website that looks like it was built by a top-
           status: chatbot.status,
           knowledge_stats: {
             total_content_length: knowledgeText.length,
+            chunks: knowledgeIndex.chunks,
             documents: knowledge.documents?.length || 0,
             urls: knowledge.urls?.filter(url => url.trim()).length || 0,
             has_text_content: !!knowledge.textContent
@@ -868,8 +964,8 @@ Generate a complete, professional website that looks like it was built by a top-
           ))
         }
         
-        // Get chatbot from database
-        const chatbot = await db.collection('chatbots').findOne({ id: chatbotId })
+        // Chatbot configuration, usually from the in-process cache
+        const chatbot = await getChatbotConfig(db, chatbotId)
         
         if (!chatbot) {
           return handleCORS(NextResponse.json(
@@ -886,23 +982,12 @@ Generate a complete, professional website that looks like it was built by a top-
         } else if (message.toLowerCase().includes('help') || message.toLowerCase().includes('what')) {
           response = `I'm here to help! I have knowledge about various topics from my training data. You can ask me questions and I'll do my best to provide helpful answers based on my knowledge base.`
         } else {
-          // Simple keyword matching from knowledge base
-          const knowledgeBase = chatbot.knowledge_base.toLowerCase()
-          const messageWords = message.toLowerCase().split(' ')
+          // Best matching knowledge chunk by BM25 (lib/knowledge-index.js)
+          const knowledgeIndex = await ensureKnowledgeIndex(db, chatbot)
+          const [bestChunk] = await searchKnowledge(db, chatbot.id, knowledgeIndex, message)
           
-          let relevantContent = ''
-          for (const word of messageWords) {
-            if (word.length > 3 && knowledgeBase.includes(word)) {
-              const index = knowledgeBase.indexOf(word)
-              const contextStart = Math.max(0, index - 100)
-              const contextEnd = Math.min(knowledgeBase.length, index + 200)
-              relevantContent = knowledgeBase.substring(contextStart, contextEnd)
-              break
-            }
-          }
-          
-          if (relevantContent) {
-            response = `Based on my knowledge: ${relevantContent.substring(0, 300)}...`
+          if (bestChunk) {
+            response = `Based on my knowledge: ${snippet(bestChunk.text, message)}...`
           } else {
             response = `I understand you're asking about "${message}". While I don't have specific information about that in my current knowledge base, I'm designed to help with questions related to ${chatbot.name}. Could you try rephrasing your question or ask about something more specific?`
           }
@@ -918,13 +1003,9 @@ Generate a complete, professional website that looks like it was built by a top-
           timestamp: new Date()
         }
         
-        await db.collection('chat_interactions').insertOne(chatInteraction)
-        
-        // Update chat count
-        await db.collection('chatbots').updateOne(
-          { id: chatbotId },
-          { $inc: { chat_count: 1 } }
-        )
+        // Buffered with the chat_count increment and written in batches
+        // (lib/chat-writes.js); waits for the write only under flush durability
+        await recordChatInteraction(db, chatInteraction)
         
         return handleCORS(NextResponse.json({
           success: true,
@@ -947,7 +1028,13 @@ Generate a complete, professional website that looks like it was built by a top-
       try {
         const chatbotId = route.split('/').pop()
         
-        const chatbot = await db.collection('chatbots').findOne({ id: chatbotId })
+        // Older chatbots still carry knowledge_base; measure it server side
+        // instead of loading it
+        const [chatbot] = await db.collection('chatbots').aggregate([
+          { $match: { id: chatbotId } },
+          { $set: { knowledge_length: { $ifNull: ['$knowledge_length', { $strLenCP: { $ifNull: ['$knowledge_base', ''] } }] } } },
+          { $project: { _id: 0, knowledge_base: 0 } }
+        ]).toArray()
         
         if (!chatbot) {
           return handleCORS(NextResponse.json(
@@ -956,14 +1043,15 @@ Generate a complete, professional website that looks like it was built by a top-
           ))
         }
         
-        const { _id, knowledge_base, ...publicChatbot } = chatbot
+        const { knowledge_length, ...publicChatbot } = chatbot
         
         return handleCORS(NextResponse.json({
           success: true,
           chatbot: {
             ...publicChatbot,
             knowledge_stats: {
-              content_length: knowledge_base?.length || 0,
+              content_length: knowledge_length,
+              chunks: chatbot.knowledge_index?.chunks ?? null,
               document_count: chatbot.knowledge_sources?.documents?.length || 0,
               url_count: chatbot.knowledge_sources?.urls?.length || 0
             }
@@ -995,7 +1083,7 @@ Generate a complete, professional website that looks like it was built by a top-
               result = 'Please provide business idea, industry, and target market.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1036,7 +1124,7 @@ Generate a complete, professional website that looks like it was built by a top-
               result = 'Please provide your company name and list of competitors.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1093,7 +1181,7 @@ Generate a complete, professional website that looks like it was built by a top-
                     systemPrompt += 'Create a comprehensive summary including key points, decisions, and action items.';
                 }
                 
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1134,7 +1222,7 @@ Generate a complete, professional website that looks like it was built by a top-
               result = 'Please provide product/service and target audience information.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1175,7 +1263,7 @@ Generate a complete, professional website that looks like it was built by a top-
               result = 'Please specify the market or industry to research.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1216,7 +1304,7 @@ Generate a complete, professional website that looks like it was built by a top-
               result = 'Please describe your product or service.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1257,7 +1345,7 @@ Generate a complete, professional website that looks like it was built by a top-
               result = 'Please specify your business type.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1298,7 +1386,7 @@ Generate a complete, professional website that looks like it was built by a top-
               result = 'Please provide the code to review.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1339,7 +1427,7 @@ Generate a complete, professional website that looks like it was built by a top-
               result = 'Please provide content and target keyword.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1380,7 +1468,7 @@ Generate a complete, professional website that looks like it was built by a top-
               result = 'Please describe the feature to test.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1445,7 +1533,7 @@ Introduction email generated between ${inputs.person1} and ${inputs.person2}`
               result = 'Please provide the previous email/conversation and recipient name.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1552,7 +1640,7 @@ Note: This is demo data. Real implementation would use CoinGecko or CoinMarketCa
               result = 'Please provide text to analyze.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1597,7 +1685,7 @@ Note: This is demo data. Real implementation would use CoinGecko or CoinMarketCa
                 const length = inputs.length || 'Medium (1000 words)'
                 const tone = inputs.tone || 'Professional'
                 
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1659,7 +1747,7 @@ Note: This is demo data. Real implementation would use CoinGecko or CoinMarketCa
                     break
                 }
                 
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1701,7 +1789,7 @@ Note: This is demo data. Real implementation would use CoinGecko or CoinMarketCa
             } else {
               try {
                 const focus = inputs.focus || 'All Issues'
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1745,7 +1833,7 @@ Note: This is demo data. Real implementation would use CoinGecko or CoinMarketCa
                 const mood = inputs.mood || 'Neutral'
                 const goal = inputs.goal || 'General guidance'
                 
-                const response = await fetch('https://api.openai.com/v1/chat/completions', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -1956,7 +2044,7 @@ Analysis for: ${inputs.question}`
               result = 'Please provide a description for the image you want to generate.'
             } else {
               try {
-                const response = await fetch('https://api.openai.com/v1/images/generations', {
+                const response = await fetch(`${OPENAI_BASE_URL}/v1/images/generations`, {
                   method: 'POST',
                   headers: {
                     'Authorization': `Bearer ${inputs.apiKey}`,
@@ -2034,6 +2122,52 @@ Analysis for: ${inputs.question}`
       return handleCORS(NextResponse.json(cleanedStatusChecks))
     }
 
+    // Index report - GET /api/indexes (bootstrap results plus a fresh explain of the hot queries)
+    // POST /api/indexes re-runs the bootstrap, e.g. after a collection was dropped (admin only)
+    if (route === '/indexes' && (method === 'GET' || method === 'POST')) {
+      if (method === 'POST' && !isAdminRequest(request)) {
+        return adminRequired()
+      }
+      const { indexes, error } = method === 'POST'
+        ? { indexes: await createIndexes(db) }
+        : await ensureIndexes(db)
+      const queries = await explainHotQueries(db)
+
+      return handleCORS(NextResponse.json({
+        indexes,
+        queries,
+        collscans: queries.filter(query => query.collscan).map(query => query.query),
+        ...(error && { error })
+      }))
+    }
+
+    // Process metrics - GET /api/metrics (polled by the soak tests)
+    if (route === '/metrics' && method === 'GET') {
+      const memory = process.memoryUsage()
+      const [chatInteractions, chatbots] = await Promise.all([
+        db.collection('chat_interactions').estimatedDocumentCount(),
+        db.collection('chatbots').estimatedDocumentCount()
+      ])
+
+      return handleCORS(NextResponse.json({
+        uptime_s: process.uptime(),
+        memory: {
+          rss: memory.rss,
+          heap_total: memory.heapTotal,
+          heap_used: memory.heapUsed,
+          external: memory.external,
+          array_buffers: memory.arrayBuffers
+        },
+        collections: {
+          chat_interactions: chatInteractions,
+          chatbots: chatbots
+        },
+        chatbot_cache: chatbotCacheStats(),
+        chat_writes: chatWriteStats(),
+        timestamp: new Date().toISOString()
+      }))
+    }
+
     // Workflow Builder generation endpoint - POST /api/workflow-builder/generate
     if (route === '/workflow-builder/generate' && method === 'POST') {
       try {
@@ -2108,7 +2242,7 @@ IMPORTANT: Return ONLY the JSON workflow, no explanations or markdown formatting
         
         // Generate workflow based on provider
         if (provider === 'openai') {
-          const response = await fetch('https://api.openai.com/v1/chat/completions', {
+          const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
             method: 'POST',
             headers: {
               'Authorization': `Bearer ${apiKey}`,
@@ -2134,7 +2268,7 @@ IMPORTANT: Return ONLY the JSON workflow, no explanations or markdown formatting
           generatedWorkflow = data.choices[0].message.content
           
         } else if (provider === 'claude') {
-          const response = await fetch('https://api.anthropic.com/v1/messages', {
+          const response = await fetch(`${ANTHROPIC_BASE_URL}/v1/messages`, {
             method: 'POST',
             headers: {
               'x-api-key': apiKey,
@@ -2160,7 +2294,7 @@ IMPORTANT: Return ONLY the JSON workflow, no explanations or markdown formatting
           generatedWorkflow = data.content[0].text
           
         } else if (provider === 'gemini') {
-          const response = await fetch(`https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-pro:generateContent?key=${apiKey}`, {
+          const response = await fetch(`${GEMINI_BASE_URL}/v1beta/models/gemini-1.5-pro:generateContent?key=${apiKey}`, {
             method: 'POST',
             headers: {
               'Content-Type': 'application/json',
@@ -2268,9 +2402,35 @@ IMPORTANT: Return ONLY the JSON workflow, no explanations or markdown formatting
   }
 }
 
+// Adds a Server-Timing header so clients can tell server time from network
+// time. The Mongo connection is opened first so a cold connect shows up as
+// its own phase.
+function withServerTiming(handler) {
+  return async (request, context) => {
+    const started = performance.now()
+    try {
+      await connectToMongo()
+    } catch (error) {
+      // handleRoute reports connection errors itself
+    }
+    const connected = performance.now()
+    const response = await handler(request, context)
+    const finished = performance.now()
+
+    response.headers.set('Server-Timing', [
+      `db-connect;dur=${(connected - started).toFixed(1)}`,
+      `app;dur=${(finished - connected).toFixed(1)}`,
+      `total;dur=${(finished - started).toFixed(1)}`
+    ].join(', '))
+    return response
+  }
+}
+
+const timedRoute = withServerTiming(handleRoute)
+
 // Export all HTTP methods
-export const GET = handleRoute
-export const POST = handleRoute
-export const PUT = handleRoute
-export const DELETE = handleRoute
-export const PATCH = handleRoute
\ No newline at end of file
+export const GET = timedRoute
+export const POST = timedRoute
+export const PUT = timedRoute
+export const DELETE = timedRoute
+export const PATCH = timedRoute
\ No newline at end of file
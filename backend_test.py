@@ -1,40 +1,177 @@
 #!/usr/bin/env python3
 
+import argparse
+import asyncio
+import io
 import requests
 import json
+import threading
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from tests.http_client import API_BASE_URL, ApiClient
+from tests.load import LoadTarget, add_load_arguments, run_load_from_args
+from tests.results import ResultStream, add_result_arguments
+
 # Configuration
-BASE_URL = "https://f2884661-c20b-483f-ad47-0b43883bbdde.preview.emergentagent.com/api"
-HEADERS = {
-    'Content-Type': 'application/json',
-    'Accept': 'application/json'
+BASE_URL = API_BASE_URL
+DEFAULT_CONCURRENCY = 8
+
+INTRO_EMAIL_PAYLOAD = {
+    "agentId": "intro-email",
+    "inputs": {
+        "person1": "Sarah Johnson",
+        "person2": "Michael Chen",
+        "purpose": "Sarah is a marketing expert who could help Michael with his startup's growth strategy",
+        "context": "Both are passionate about sustainable technology and could benefit from collaborating"
+    }
 }
 
+# Requests replayed by --load
+LOAD_TARGETS = [
+    LoadTarget("POST /agents/run intro-email", "POST", "/agents/run", json=INTRO_EMAIL_PAYLOAD),
+    LoadTarget("GET /ai-tools?limit=50", "GET", "/ai-tools?limit=50"),
+]
+
+class CaseOutput:
+    """Stand-in for sys.stdout that holds each thread's output while it runs a case.
+    
+    Concurrent cases would otherwise interleave their print() lines; a
+    buffered case is written out in one piece when it finishes.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def begin(self):
+        self._local.buffer = io.StringIO()
+    
+    def end(self):
+        buffer, self._local.buffer = self._local.buffer, None
+        return buffer.getvalue()
+    
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
 class BackendTester:
-    def __init__(self):
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, results=None):
         self.passed_tests = 0
         self.failed_tests = 0
         self.test_results = []
+        self.concurrency = concurrency
+        self.results = results or ResultStream("backend")
+        self._lock = threading.Lock()
+        self._case = threading.local()
+        
+        # Keep-alive client shared by every test case; the pool is sized so
+        # concurrent runs don't open a fresh connection per request.
+        self.client = ApiClient(BASE_URL, pool_size=concurrency)
         
     def log_test(self, test_name, passed, message=""):
         status = "✅ PASSED" if passed else "❌ FAILED"
         result = f"{status} - {test_name}"
         if message:
             result += f": {message}"
-        print(result)
-        self.test_results.append({
-            'test': test_name,
-            'passed': passed,
-            'message': message
-        })
+        timing = self.client.pop_last_timing()
+        if timing:
+            result += f" [{timing.summary()}]"
+        # A case that logs several results reports each one's own duration
+        started, now = getattr(self._case, 'started', None), time.time()
+        self._case.started = now
+        duration = now - started if started else None
+        self.results.record(test_name, passed, message, case=getattr(self._case, 'name', None),
+                            started_at=started, duration=duration, timing=timing)
+        with self._lock:
+            print(result)
+            self.test_results.append({
+                'test': test_name,
+                'passed': passed,
+                'message': message,
+                'duration': duration,
+                'timing': timing.as_dict() if timing else None
+            })
+            
+            if passed:
+                self.passed_tests += 1
+            else:
+                self.failed_tests += 1
+    
+    def run_case(self, case):
+        """Run one test case, marking its start in the result stream"""
+        self._case.name = case.__name__
+        self._case.started = time.time()
+        self.results.start(case.__name__, self._case.started)
+        output = sys.stdout if isinstance(sys.stdout, CaseOutput) else None
+        if output is None:
+            case()
+            return
+        output.begin()
+        try:
+            case()
+        finally:
+            text = output.end()
+            with self._lock:
+                output.stream.write(text)
+                output.stream.flush()
+    
+    def agent_cases(self):
+        return [
+            self.test_intro_email,
+            self.test_follow_up_writer_no_key,
+            self.test_follow_up_writer_fake_key,
+            self.test_stock_finder_demo,
+            self.test_crypto_pulse,
+            self.test_ai_detector_no_key,
+            self.test_seo_writer_no_key,
+            self.test_pdf_explainer_no_key,
+            self.test_fine_print_checker_no_key,
+            self.test_clara_coach_no_key,
+        ]
+    
+    def scraping_cases(self):
+        # Order matters: the quality and stats checks read what the sync wrote
+        return [
+            self.test_enhanced_aitools_scraper,
+            self.test_scraped_data_quality,
+            self.test_stats_with_enhanced_data,
+        ]
+    
+    def workflow_cases(self):
+        return [
+            self.test_workflow_generation_n8n,
+            self.test_workflow_generation_make,
+            self.test_workflow_missing_fields,
+            self.test_workflow_invalid_provider,
+            self.test_workflow_invalid_platform,
+            self.test_workflow_gemini_provider,
+            self.test_workflow_basic_template,
+        ]
+    
+    def validation_cases(self):
+        return [
+            self.test_validation_missing_fields,
+            self.test_invalid_agent_id,
+            self.test_malformed_json,
+        ]
+    
+    def test_groups(self):
+        """Group test cases for concurrent runs.
         
-        if passed:
-            self.passed_tests += 1
-        else:
-            self.failed_tests += 1
+        Cases inside a group run in order; groups are independent of each
+        other. The slow scraping group goes first so it starts right away.
+        """
+        groups = [self.scraping_cases()]
+        groups.extend([case] for case in self.agent_cases())
+        groups.extend([case] for case in self.workflow_cases())
+        groups.extend([case] for case in self.validation_cases())
+        return groups
     
     def test_new_professional_agents(self):
         """Test all 10 new professional AI agents"""
@@ -42,20 +179,41 @@ class BackendTester:
         print("TESTING NEW PROFESSIONAL AI AGENTS")
         print("="*80)
         
-        # Test 1: Introduction Email Generator
+        for case in self.agent_cases():
+            self.run_case(case)
+    
+    def test_enhanced_scraping(self):
+        """Test enhanced scraping functionality"""
+        print("\n" + "="*80)
+        print("TESTING ENHANCED SCRAPING FUNCTIONALITY")
+        print("="*80)
+        
+        for case in self.scraping_cases():
+            self.run_case(case)
+    
+    def test_workflow_builder(self):
+        """Test the new workflow builder functionality"""
+        print("\n" + "="*80)
+        print("TESTING WORKFLOW BUILDER FUNCTIONALITY")
+        print("="*80)
+        
+        for case in self.workflow_cases():
+            self.run_case(case)
+    
+    def test_input_validation(self):
+        """Test input validation for new agents"""
+        print("\n" + "="*80)
+        print("TESTING INPUT VALIDATION")
+        print("="*80)
+        
+        for case in self.validation_cases():
+            self.run_case(case)
+    
+    def test_intro_email(self):
+        """Test the Introduction Email Generator"""
         print("\n--- Testing Introduction Email Generator ---")
         try:
-            payload = {
-                "agentId": "intro-email",
-                "inputs": {
-                    "person1": "Sarah Johnson",
-                    "person2": "Michael Chen", 
-                    "purpose": "Sarah is a marketing expert who could help Michael with his startup's growth strategy",
-                    "context": "Both are passionate about sustainable technology and could benefit from collaborating"
-                }
-            }
-            
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=INTRO_EMAIL_PAYLOAD)
             
             if response.status_code == 200:
                 data = response.json()
@@ -72,8 +230,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Introduction Email Generator", False, f"Exception: {str(e)}")
-        
-        # Test 2: Follow-Up Writer (without API key)
+
+    def test_follow_up_writer_no_key(self):
+        """Test the Follow-Up Writer without an API key"""
         print("\n--- Testing Follow-Up Writer (No API Key) ---")
         try:
             payload = {
@@ -85,7 +244,7 @@ class BackendTester:
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -98,8 +257,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Follow-Up Writer (No API Key)", False, f"Exception: {str(e)}")
-        
-        # Test 3: Follow-Up Writer (with fake API key)
+
+    def test_follow_up_writer_fake_key(self):
+        """Test the Follow-Up Writer with a fake API key"""
         print("\n--- Testing Follow-Up Writer (With Fake API Key) ---")
         try:
             payload = {
@@ -112,7 +272,7 @@ class BackendTester:
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -125,8 +285,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Follow-Up Writer (Fake API Key)", False, f"Exception: {str(e)}")
-        
-        # Test 4: Stock Finder (without API key - should show demo data)
+
+    def test_stock_finder_demo(self):
+        """Test the Stock Finder demo data (no API key)"""
         print("\n--- Testing Stock Finder (Demo Mode) ---")
         try:
             payload = {
@@ -137,7 +298,7 @@ class BackendTester:
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -154,8 +315,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Stock Finder (Demo Mode)", False, f"Exception: {str(e)}")
-        
-        # Test 5: Crypto Market Pulse
+
+    def test_crypto_pulse(self):
+        """Test the Crypto Market Pulse"""
         print("\n--- Testing Crypto Market Pulse ---")
         try:
             payload = {
@@ -166,7 +328,7 @@ class BackendTester:
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -183,8 +345,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Crypto Market Pulse", False, f"Exception: {str(e)}")
-        
-        # Test 6: AI Detector (without API key)
+
+    def test_ai_detector_no_key(self):
+        """Test the AI Detector without an API key"""
         print("\n--- Testing AI Detector (No API Key) ---")
         try:
             payload = {
@@ -194,7 +357,7 @@ class BackendTester:
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -207,8 +370,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("AI Detector (No API Key)", False, f"Exception: {str(e)}")
-        
-        # Test 7: SEO Blog Writer (without API key)
+
+    def test_seo_writer_no_key(self):
+        """Test the SEO Blog Writer without an API key"""
         print("\n--- Testing SEO Blog Writer (No API Key) ---")
         try:
             payload = {
@@ -221,7 +385,7 @@ class BackendTester:
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -234,8 +398,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("SEO Blog Writer (No API Key)", False, f"Exception: {str(e)}")
-        
-        # Test 8: PDF Explainer (without API key)
+
+    def test_pdf_explainer_no_key(self):
+        """Test the PDF Explainer without an API key"""
         print("\n--- Testing PDF Explainer (No API Key) ---")
         try:
             payload = {
@@ -246,7 +411,7 @@ class BackendTester:
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -259,8 +424,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("PDF Explainer (No API Key)", False, f"Exception: {str(e)}")
-        
-        # Test 9: Fine Print Checker (without API key)
+
+    def test_fine_print_checker_no_key(self):
+        """Test the Fine Print Checker without an API key"""
         print("\n--- Testing Fine Print Checker (No API Key) ---")
         try:
             payload = {
@@ -271,7 +437,7 @@ class BackendTester:
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -284,8 +450,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Fine Print Checker (No API Key)", False, f"Exception: {str(e)}")
-        
-        # Test 10: Clara Coach (without API key)
+
+    def test_clara_coach_no_key(self):
+        """Test Clara Coach without an API key"""
         print("\n--- Testing Clara Coach (No API Key) ---")
         try:
             payload = {
@@ -297,7 +464,7 @@ class BackendTester:
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -310,20 +477,17 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Clara Coach (No API Key)", False, f"Exception: {str(e)}")
-    
-    def test_enhanced_scraping(self):
-        """Test enhanced scraping functionality"""
-        print("\n" + "="*80)
-        print("TESTING ENHANCED SCRAPING FUNCTIONALITY")
-        print("="*80)
-        
-        # Test 1: Enhanced AITools.fyi scraper
+
+    def test_enhanced_aitools_scraper(self):
+        """Test the enhanced AITools.fyi scraper"""
         print("\n--- Testing Enhanced AITools.fyi Scraper ---")
         try:
-            response = requests.post(f"{BASE_URL}/ai-tools/sync-aitools", headers=HEADERS, timeout=120)
+            # The sync runs as a background job
+            response = self.client.post("/ai-tools/sync-aitools")
+            job = self.client.wait_for_job(response, timeout=120)
             
-            if response.status_code == 200:
-                data = response.json()
+            if job['status'] == 'succeeded':
+                data = job['result']
                 if 'synced' in data and 'total_found' in data and 'categories_scraped' in data:
                     synced = data['synced']
                     total_found = data['total_found']
@@ -336,15 +500,16 @@ class BackendTester:
                 else:
                     self.log_test("Enhanced AITools.fyi Scraper", False, f"Invalid response format: {data}")
             else:
-                self.log_test("Enhanced AITools.fyi Scraper", False, f"HTTP {response.status_code}: {response.text}")
+                self.log_test("Enhanced AITools.fyi Scraper", False, f"Job {job['status']}: {job.get('error')}")
                 
         except Exception as e:
             self.log_test("Enhanced AITools.fyi Scraper", False, f"Exception: {str(e)}")
-        
-        # Test 2: Verify scraped data quality
+
+    def test_scraped_data_quality(self):
+        """Verify scraped data quality"""
         print("\n--- Testing Scraped Data Quality ---")
         try:
-            response = requests.get(f"{BASE_URL}/ai-tools?limit=50", headers=HEADERS)
+            response = self.client.get("/ai-tools?limit=50")
             
             if response.status_code == 200:
                 data = response.json()
@@ -367,11 +532,12 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Scraped Data Quality", False, f"Exception: {str(e)}")
-        
-        # Test 3: Test stats endpoint with enhanced data
+
+    def test_stats_with_enhanced_data(self):
+        """Test the stats endpoint with enhanced data"""
         print("\n--- Testing Stats with Enhanced Data ---")
         try:
-            response = requests.get(f"{BASE_URL}/ai-tools/stats", headers=HEADERS)
+            response = self.client.get("/ai-tools/stats")
             
             if response.status_code == 200:
                 data = response.json()
@@ -391,14 +557,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Stats with Enhanced Data", False, f"Exception: {str(e)}")
-    
-    def test_workflow_builder(self):
-        """Test the new workflow builder functionality"""
-        print("\n" + "="*80)
-        print("TESTING WORKFLOW BUILDER FUNCTIONALITY")
-        print("="*80)
-        
-        # Test 1: Valid workflow generation request (n8n)
+
+    def test_workflow_generation_n8n(self):
+        """Test a valid workflow generation request (n8n)"""
         print("\n--- Testing Valid Workflow Generation (n8n) ---")
         try:
             payload = {
@@ -410,7 +571,7 @@ class BackendTester:
                 "platform": "n8n"
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=60)
+            response = self.client.post("/workflow-builder/generate", json=payload, timeout=60)
             
             if response.status_code == 200:
                 data = response.json()
@@ -435,8 +596,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Valid Workflow Generation (n8n)", False, f"Exception: {str(e)}")
-        
-        # Test 2: Valid workflow generation request (Make.com)
+
+    def test_workflow_generation_make(self):
+        """Test a valid workflow generation request (Make.com)"""
         print("\n--- Testing Valid Workflow Generation (Make.com) ---")
         try:
             payload = {
@@ -448,7 +610,7 @@ class BackendTester:
                 "platform": "make"
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=60)
+            response = self.client.post("/workflow-builder/generate", json=payload, timeout=60)
             
             if response.status_code == 200:
                 data = response.json()
@@ -473,8 +635,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Valid Workflow Generation (Make.com)", False, f"Exception: {str(e)}")
-        
-        # Test 3: Missing required fields validation
+
+    def test_workflow_missing_fields(self):
+        """Test missing required fields validation"""
         print("\n--- Testing Missing Required Fields ---")
         try:
             payload = {
@@ -482,7 +645,7 @@ class BackendTester:
                 # Missing apiKey, automationDescription, provider, platform
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS)
+            response = self.client.post("/workflow-builder/generate", json=payload)
             
             if response.status_code == 400:
                 data = response.json()
@@ -495,8 +658,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Missing Required Fields", False, f"Exception: {str(e)}")
-        
-        # Test 4: Invalid provider validation
+
+    def test_workflow_invalid_provider(self):
+        """Test invalid provider validation"""
         print("\n--- Testing Invalid Provider Validation ---")
         try:
             payload = {
@@ -507,7 +671,7 @@ class BackendTester:
                 "platform": "n8n"
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS)
+            response = self.client.post("/workflow-builder/generate", json=payload)
             
             if response.status_code == 400:
                 data = response.json()
@@ -520,8 +684,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Invalid Provider Validation", False, f"Exception: {str(e)}")
-        
-        # Test 5: Invalid platform validation
+
+    def test_workflow_invalid_platform(self):
+        """Test invalid platform validation"""
         print("\n--- Testing Invalid Platform Validation ---")
         try:
             payload = {
@@ -532,7 +697,7 @@ class BackendTester:
                 "platform": "invalid-platform"
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS)
+            response = self.client.post("/workflow-builder/generate", json=payload)
             
             if response.status_code == 400:
                 data = response.json()
@@ -545,8 +710,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Invalid Platform Validation", False, f"Exception: {str(e)}")
-        
-        # Test 6: Test with Gemini provider
+
+    def test_workflow_gemini_provider(self):
+        """Test the Gemini provider"""
         print("\n--- Testing Gemini Provider ---")
         try:
             payload = {
@@ -558,7 +724,7 @@ class BackendTester:
                 "platform": "n8n"
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=60)
+            response = self.client.post("/workflow-builder/generate", json=payload, timeout=60)
             
             if response.status_code == 200:
                 data = response.json()
@@ -579,8 +745,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Gemini Provider", False, f"Exception: {str(e)}")
-        
-        # Test 7: Test helper functions (basic template generation)
+
+    def test_workflow_basic_template(self):
+        """Test helper functions (basic template generation)"""
         print("\n--- Testing Helper Functions (Basic Template) ---")
         try:
             # This test will trigger the fallback to basic template when API fails
@@ -592,7 +759,7 @@ class BackendTester:
                 "platform": "n8n"
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=30)
+            response = self.client.post("/workflow-builder/generate", json=payload, timeout=30)
             
             # Should either succeed with basic template or fail with API error
             if response.status_code == 200:
@@ -614,13 +781,8 @@ class BackendTester:
         except Exception as e:
             self.log_test("Helper Functions (Basic Template)", False, f"Exception: {str(e)}")
 
-    def test_input_validation(self):
-        """Test input validation for new agents"""
-        print("\n" + "="*80)
-        print("TESTING INPUT VALIDATION")
-        print("="*80)
-        
-        # Test 1: Missing required inputs for intro-email
+    def test_validation_missing_fields(self):
+        """Test missing required inputs for intro-email"""
         print("\n--- Testing Input Validation: Missing Required Fields ---")
         try:
             payload = {
@@ -631,7 +793,7 @@ class BackendTester:
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -644,8 +806,9 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Input Validation: Missing Fields", False, f"Exception: {str(e)}")
-        
-        # Test 2: Invalid agent ID
+
+    def test_invalid_agent_id(self):
+        """Test an invalid agent ID"""
         print("\n--- Testing Invalid Agent ID ---")
         try:
             payload = {
@@ -653,7 +816,7 @@ class BackendTester:
                 "inputs": {}
             }
             
-            response = requests.post(f"{BASE_URL}/agents/run", json=payload, headers=HEADERS)
+            response = self.client.post("/agents/run", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -666,12 +829,13 @@ class BackendTester:
                 
         except Exception as e:
             self.log_test("Invalid Agent ID", False, f"Exception: {str(e)}")
-        
-        # Test 3: Malformed JSON
+
+    def test_malformed_json(self):
+        """Test malformed JSON handling"""
         print("\n--- Testing Malformed JSON ---")
         try:
             malformed_json = '{"agentId": "intro-email", "inputs": {'
-            response = requests.post(f"{BASE_URL}/agents/run", data=malformed_json, headers=HEADERS)
+            response = self.client.post("/agents/run", data=malformed_json)
             
             if response.status_code == 500:
                 self.log_test("Malformed JSON", True, "Correctly handles malformed JSON with 500 error")
@@ -681,18 +845,92 @@ class BackendTester:
         except Exception as e:
             self.log_test("Malformed JSON", True, f"Exception correctly caught: {str(e)}")
     
-    def run_all_tests(self):
+    def benchmark_scraper_sync(self, runs=3, fixture_url=None):
+        """Benchmark /ai-tools/sync-aitools against the aitools fixture server.
+        
+        Start the app with AITOOLS_BASE_URL pointing at
+        tests/aitools_fixture_server.py so every run parses the same pages.
+        Runs use force=true, since the page cache would otherwise skip every
+        page after the first run, and wait=true so the request times the sync
+        itself rather than a background job.
+        """
+        print("\n" + "="*80)
+        print("SCRAPER SYNC BENCHMARK")
+        print("="*80)
+        
+        walls = []
+        for run in range(1, runs + 1):
+            pages_before = self._fixture_pages(fixture_url)
+            started = time.perf_counter()
+            response = self.client.post("/ai-tools/sync-aitools?force=true&wait=true", timeout=300)
+            wall = time.perf_counter() - started
+            
+            if response.status_code != 200:
+                self.log_test(f"Scraper Benchmark run {run}", False, f"HTTP {response.status_code}: {response.text}")
+                continue
+            
+            data = response.json()
+            timings = data.get('timings', {})
+            scrape_seconds = timings.get('scrape_ms', wall * 1000) / 1000
+            tools_per_second = data['total_found'] / scrape_seconds if scrape_seconds else 0
+            pages = self._fixture_pages(fixture_url)
+            pages_served = pages - pages_before if pages is not None and pages_before is not None else data.get('pages_scraped')
+            walls.append(wall)
+            
+            self.log_test(
+                f"Scraper Benchmark run {run}", data['total_found'] > 0,
+                f"{data['total_found']} tools from {pages_served} pages, {tools_per_second:.1f} tools/s parsed, "
+                f"sync wall {wall:.2f}s (scrape {scrape_seconds:.2f}s, ingest {timings.get('ingest_ms', 0) / 1000:.2f}s)"
+            )
+        
+        if walls:
+            walls.sort()
+            print(f"\n⏱️  Sync wall time over {len(walls)} runs: median {walls[len(walls) // 2]:.2f}s, "
+                  f"min {walls[0]:.2f}s, max {walls[-1]:.2f}s")
+        return self.failed_tests == 0
+    
+    def _fixture_pages(self, fixture_url):
+        if not fixture_url:
+            return None
+        try:
+            return requests.get(f"{fixture_url}/__stats", timeout=5).json()['pages']
+        except (requests.RequestException, ValueError, KeyError):
+            return None
+    
+    async def run_groups_concurrently(self, groups):
+        """Run test groups concurrently, at most self.concurrency at a time"""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        sys.stdout = CaseOutput(sys.stdout)
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                async def run_group(group):
+                    async with semaphore:
+                        for case in group:
+                            await loop.run_in_executor(executor, self.run_case, case)
+                
+                await asyncio.gather(*(run_group(group) for group in groups))
+        finally:
+            sys.stdout = sys.stdout.stream
+    
+    def run_all_tests(self, concurrent=False):
         """Run all test suites"""
         print("🚀 STARTING COMPREHENSIVE BACKEND TESTING")
         print("="*80)
         print(f"Testing Backend URL: {BASE_URL}")
         print(f"Test Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        started = time.perf_counter()
         
-        # Run all test suites
-        self.test_new_professional_agents()
-        self.test_enhanced_scraping()
-        self.test_workflow_builder()
-        self.test_input_validation()
+        if concurrent:
+            print(f"Concurrent mode: up to {self.concurrency} test cases in flight")
+            asyncio.run(self.run_groups_concurrently(self.test_groups()))
+        else:
+            # Run all test suites
+            self.test_new_professional_agents()
+            self.test_enhanced_scraping()
+            self.test_workflow_builder()
+            self.test_input_validation()
         
         # Print final summary
         print("\n" + "="*80)
@@ -701,6 +939,7 @@ class BackendTester:
         print(f"✅ Passed: {self.passed_tests}")
         print(f"❌ Failed: {self.failed_tests}")
         print(f"📊 Success Rate: {(self.passed_tests / (self.passed_tests + self.failed_tests) * 100):.1f}%")
+        print(f"⏱️  Duration: {time.perf_counter() - started:.1f}s")
         print(f"🕒 Test Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         if self.failed_tests == 0:
@@ -711,6 +950,29 @@ class BackendTester:
         return self.failed_tests == 0
 
 if __name__ == "__main__":
-    tester = BackendTester()
-    success = tester.run_all_tests()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="HappyTools backend tests")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="run independent test cases concurrently")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"max test cases in flight with --concurrent (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--scraper-benchmark", action="store_true",
+                        help="benchmark /ai-tools/sync-aitools (app started with AITOOLS_BASE_URL)")
+    parser.add_argument("--runs", type=int, default=3, help="benchmark runs (default 3)")
+    parser.add_argument("--fixture-url", help="aitools fixture server URL, to count pages served")
+    add_load_arguments(parser)
+    add_result_arguments(parser)
+    args = parser.parse_args()
+    
+    if args.load:
+        sys.exit(0 if run_load_from_args(args, BASE_URL, LOAD_TARGETS) else 1)
+    
+    results = ResultStream("backend", args.results_ndjson, args.junit)
+    tester = BackendTester(concurrency=args.concurrency, results=results)
+    try:
+        if args.scraper_benchmark:
+            success = tester.benchmark_scraper_sync(args.runs, args.fixture_url)
+        else:
+            success = tester.run_all_tests(concurrent=args.concurrent)
+    finally:
+        results.close()
+    sys.exit(0 if success else 1)
@@ -4,33 +4,78 @@ Comprehensive Backend Testing for NEW Chatbot Builder Platform
 Testing the newly implemented chatbot functionality that was not covered in previous tests.
 """
 
-import requests
+import argparse
 import json
+import sys
 import time
 import uuid
 from datetime import datetime
 
+from tests.http_client import API_BASE_URL, ApiClient
+from tests.load import LoadTarget, add_load_arguments, run_load_from_args
+from tests.results import ResultStream, add_result_arguments
+
 # Configuration
-BASE_URL = "https://f2884661-c20b-483f-ad47-0b43883bbdde.preview.emergentagent.com"
-API_BASE = f"{BASE_URL}/api"
+API_BASE = API_BASE_URL
+
+BASIC_CHATBOT_PAYLOAD = {
+    "name": "Customer Support Bot",
+    "description": "A helpful customer support chatbot",
+    "personality": "helpful",
+    "knowledge": {
+        "textContent": "Our company provides excellent customer service. We offer 24/7 support and have a 30-day money-back guarantee. Our products are high-quality and affordable.",
+        "documents": [],
+        "urls": []
+    }
+}
+
+def chat_load_targets(chatbot_id):
+    """Requests replayed by --load; every chat message gets its own session"""
+    return [
+        LoadTarget("POST /chatbot/chat", "POST", "/chatbot/chat", json=lambda: {
+            "chatbotId": chatbot_id,
+            "message": "Tell me about the money-back guarantee policy",
+            "sessionId": str(uuid.uuid4())
+        }),
+    ]
 
 class ChatbotBuilderTester:
-    def __init__(self):
+    def __init__(self, results=None):
         self.test_results = []
         self.created_chatbot_id = None
+        self.client = ApiClient(API_BASE)
+        self.results = results or ResultStream("chatbot")
+        self._case_name = None
+        self._case_started = None
+        
+    def run_case(self, case):
+        """Run one test case, marking its start in the result stream"""
+        self._case_name = case.__name__
+        self._case_started = time.time()
+        self.results.start(case.__name__, self._case_started)
+        case()
         
     def log_test(self, test_name, success, details="", error=""):
         """Log test results"""
+        timing = self.client.pop_last_timing()
+        started, now = self._case_started, time.time()
+        self._case_started = now
+        duration = now - started if started else None
+        self.results.record(test_name, success, error or details, case=self._case_name,
+                            started_at=started, duration=duration, timing=timing)
         result = {
             "test": test_name,
             "success": success,
             "details": details,
             "error": error,
+            "duration": duration,
+            "timing": timing.as_dict() if timing else None,
             "timestamp": datetime.now().isoformat()
         }
         self.test_results.append(result)
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} - {test_name}")
+        latency = f" [{timing.summary()}]" if timing else ""
+        print(f"{status} - {test_name}{latency}")
         if details:
             print(f"   Details: {details}")
         if error:
@@ -40,18 +85,7 @@ class ChatbotBuilderTester:
     def test_chatbot_create_basic(self):
         """Test POST /api/chatbot/create with basic knowledge base"""
         try:
-            payload = {
-                "name": "Customer Support Bot",
-                "description": "A helpful customer support chatbot",
-                "personality": "helpful",
-                "knowledge": {
-                    "textContent": "Our company provides excellent customer service. We offer 24/7 support and have a 30-day money-back guarantee. Our products are high-quality and affordable.",
-                    "documents": [],
-                    "urls": []
-                }
-            }
-            
-            response = requests.post(f"{API_BASE}/chatbot/create", json=payload, timeout=30)
+            response = self.client.post("/chatbot/create", json=BASIC_CHATBOT_PAYLOAD, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -95,7 +129,7 @@ class ChatbotBuilderTester:
                 }
             }
             
-            response = requests.post(f"{API_BASE}/chatbot/create", json=payload, timeout=30)
+            response = self.client.post("/chatbot/create", json=payload, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -122,7 +156,7 @@ class ChatbotBuilderTester:
                 "description": "Missing name and knowledge"
             }
             
-            response = requests.post(f"{API_BASE}/chatbot/create", json=payload, timeout=30)
+            response = self.client.post("/chatbot/create", json=payload, timeout=30)
             
             if response.status_code == 400:
                 error_data = response.json()
@@ -153,7 +187,7 @@ class ChatbotBuilderTester:
                 "sessionId": str(uuid.uuid4())
             }
             
-            response = requests.post(f"{API_BASE}/chatbot/chat", json=payload, timeout=30)
+            response = self.client.post("/chatbot/chat", json=payload, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -184,7 +218,7 @@ class ChatbotBuilderTester:
                 "sessionId": str(uuid.uuid4())
             }
             
-            response = requests.post(f"{API_BASE}/chatbot/chat", json=payload, timeout=30)
+            response = self.client.post("/chatbot/chat", json=payload, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -220,7 +254,7 @@ class ChatbotBuilderTester:
                 # Missing chatbotId
             }
             
-            response = requests.post(f"{API_BASE}/chatbot/chat", json=payload, timeout=30)
+            response = self.client.post("/chatbot/chat", json=payload, timeout=30)
             
             if response.status_code == 400:
                 error_data = response.json()
@@ -247,7 +281,7 @@ class ChatbotBuilderTester:
                 "sessionId": str(uuid.uuid4())
             }
             
-            response = requests.post(f"{API_BASE}/chatbot/chat", json=payload, timeout=30)
+            response = self.client.post("/chatbot/chat", json=payload, timeout=30)
             
             if response.status_code == 404:
                 error_data = response.json()
@@ -272,7 +306,7 @@ class ChatbotBuilderTester:
             return
             
         try:
-            response = requests.get(f"{API_BASE}/chatbot/info/{self.created_chatbot_id}", timeout=30)
+            response = self.client.get(f"/chatbot/info/{self.created_chatbot_id}", timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -300,7 +334,7 @@ class ChatbotBuilderTester:
     def test_chatbot_info_nonexistent(self):
         """Test GET /api/chatbot/info/{id} with non-existent ID"""
         try:
-            response = requests.get(f"{API_BASE}/chatbot/info/non-existent-id-12345", timeout=30)
+            response = self.client.get("/chatbot/info/non-existent-id-12345", timeout=30)
             
             if response.status_code == 404:
                 error_data = response.json()
@@ -322,10 +356,12 @@ class ChatbotBuilderTester:
         """Test POST /api/ai-tools/sync-aitools (Enhanced/Targeted Scraping)"""
         try:
             print("Testing enhanced targeted scraping (this may take 30-60 seconds)...")
-            response = requests.post(f"{API_BASE}/ai-tools/sync-aitools", json={}, timeout=90)
+            # The sync runs as a background job
+            response = self.client.post("/ai-tools/sync-aitools", json={})
+            job = self.client.wait_for_job(response, timeout=90)
             
-            if response.status_code == 200:
-                data = response.json()
+            if job['status'] == 'succeeded':
+                data = job['result']
                 if 'synced' in data and 'total_found' in data:
                     self.log_test(
                         "Enhanced Targeted Scraping",
@@ -335,7 +371,7 @@ class ChatbotBuilderTester:
                 else:
                     self.log_test("Enhanced Targeted Scraping", False, "", "Response missing expected fields")
             else:
-                self.log_test("Enhanced Targeted Scraping", False, "", f"HTTP {response.status_code}: {response.text}")
+                self.log_test("Enhanced Targeted Scraping", False, "", f"Job {job['status']}: {job.get('error')}")
                 
         except Exception as e:
             self.log_test("Enhanced Targeted Scraping", False, "", str(e))
@@ -344,7 +380,7 @@ class ChatbotBuilderTester:
         """Test that existing AI tools endpoints still work after chatbot implementation"""
         try:
             # Test basic AI tools endpoint
-            response = requests.get(f"{API_BASE}/ai-tools?limit=5", timeout=30)
+            response = self.client.get("/ai-tools?limit=5", timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -372,7 +408,7 @@ class ChatbotBuilderTester:
                 }
             }
             
-            response = requests.post(f"{API_BASE}/agents/run", json=payload, timeout=30)
+            response = self.client.post("/agents/run", json=payload, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -397,26 +433,26 @@ class ChatbotBuilderTester:
         print()
         
         # Test chatbot creation
-        self.test_chatbot_create_basic()
-        self.test_chatbot_create_with_documents()
-        self.test_chatbot_create_validation()
+        self.run_case(self.test_chatbot_create_basic)
+        self.run_case(self.test_chatbot_create_with_documents)
+        self.run_case(self.test_chatbot_create_validation)
         
         # Test chatbot chat functionality
-        self.test_chatbot_chat_basic()
-        self.test_chatbot_chat_knowledge_query()
-        self.test_chatbot_chat_validation()
-        self.test_chatbot_chat_nonexistent()
+        self.run_case(self.test_chatbot_chat_basic)
+        self.run_case(self.test_chatbot_chat_knowledge_query)
+        self.run_case(self.test_chatbot_chat_validation)
+        self.run_case(self.test_chatbot_chat_nonexistent)
         
         # Test chatbot info retrieval
-        self.test_chatbot_info()
-        self.test_chatbot_info_nonexistent()
+        self.run_case(self.test_chatbot_info)
+        self.run_case(self.test_chatbot_info_nonexistent)
         
         # Test enhanced scraping
-        self.test_targeted_scraping()
+        self.run_case(self.test_targeted_scraping)
         
         # Test system integration
-        self.test_system_integration()
-        self.test_agents_integration()
+        self.run_case(self.test_system_integration)
+        self.run_case(self.test_agents_integration)
         
         # Summary
         print("=" * 60)
@@ -442,5 +478,20 @@ class ChatbotBuilderTester:
         return self.test_results
 
 if __name__ == "__main__":
-    tester = ChatbotBuilderTester()
-    results = tester.run_all_tests()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Chatbot Builder backend tests")
+    add_load_arguments(parser)
+    add_result_arguments(parser)
+    args = parser.parse_args()
+    
+    if args.load:
+        response = ApiClient(API_BASE).post("/chatbot/create", json=BASIC_CHATBOT_PAYLOAD, timeout=30)
+        response.raise_for_status()
+        chatbot_id = response.json()['id']
+        sys.exit(0 if run_load_from_args(args, API_BASE, chat_load_targets(chatbot_id)) else 1)
+    
+    stream = ResultStream("chatbot", args.results_ndjson, args.junit)
+    tester = ChatbotBuilderTester(results=stream)
+    try:
+        results = tester.run_all_tests()
+    finally:
+        stream.close()
\ No newline at end of file
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Catalog size sweep for the /ai-tools routes.
+
+Grows a synthetic ai_tools collection (tests/catalog_generator.py) through
+each size in --sizes and measures every ai-tools read route at that size, so
+the report shows how latency scales with the catalog. The app must be
+running against the same database:
+
+    DB_NAME=happytools_bench API_SECRET=bench-secret yarn dev
+    HAPPYTOOLS_API_SECRET=bench-secret python catalog_scaling_benchmark.py --sizes 10000,100000,1000000
+
+Recounting stats and rebuilding indexes are admin operations, so the app's
+API_SECRET has to be passed in HAPPYTOOLS_API_SECRET.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from pymongo import MongoClient
+
+from tests.catalog_generator import DEFAULT_DB_NAME, DEFAULT_MONGO_URL, load_catalog
+from tests.http_client import API_BASE_URL, ApiClient
+from tests.load import LatencyHistogram
+
+BASE_URL = API_BASE_URL
+DEFAULT_SIZES = "10000,100000,1000000"
+DEFAULT_SAMPLES = 30
+WARMUP_REQUESTS = 3
+ADMIN_HEADERS = {"Authorization": f"Bearer {os.environ.get('HAPPYTOOLS_API_SECRET', '')}"}
+
+ROUTES = [
+    ("list (featured_at)", "/ai-tools?limit=12"),
+    ("list sort=votes", "/ai-tools?limit=12&sort=votes"),
+    ("list deep page", "/ai-tools?limit=12&page=200"),
+    ("search", "/ai-tools?search=writing&limit=12"),
+    ("category", "/ai-tools?category=Marketing&limit=12"),
+    ("source", "/ai-tools?source=Product%20Hunt&limit=12"),
+    ("trending", "/ai-tools/trending"),
+    ("categories", "/ai-tools/categories"),
+    ("stats", "/ai-tools/stats"),
+]
+
+
+def measure_route(client, path, samples):
+    """Sequential requests to ``path``; returns a LatencyHistogram in microseconds."""
+    for _ in range(WARMUP_REQUESTS):
+        client.get(path)
+    histogram = LatencyHistogram()
+    for _ in range(samples):
+        response = client.get(path)
+        response.raise_for_status()
+        histogram.record(response.timing.total * 1_000_000)
+    return histogram
+
+
+def print_sweep(results, sizes):
+    print("\n" + "="*80)
+    print("CATALOG SCALING REPORT - p50 / p95 latency in ms")
+    print("="*80)
+    header = f"{'route':<22}" + "".join(f"{f'{size:,} docs':>20}" for size in sizes) + f"{'p50 growth':>12}"
+    print(header)
+    for name, _ in ROUTES:
+        row = f"{name:<22}"
+        for size in sizes:
+            entry = results[size][name]
+            row += f"{entry['p50_ms']:>11.1f} /{entry['p95_ms']:>7.1f}"
+        first, last = results[sizes[0]][name]['p50_ms'], results[sizes[-1]][name]['p50_ms']
+        row += f"{(last / first if first else 0):>11.1f}x"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ai-tools route latency against catalog size")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated catalog sizes (default {DEFAULT_SIZES})")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES,
+                        help=f"requests per route and size (default {DEFAULT_SAMPLES})")
+    parser.add_argument("--mongo-url", default=DEFAULT_MONGO_URL, help="defaults to MONGO_URL")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help=f"database the app uses (default {DEFAULT_DB_NAME})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="grow the existing collection instead of dropping it first")
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    collection = MongoClient(args.mongo_url)[args.db]['ai_tools']
+    if not args.keep:
+        collection.drop()
+    client = ApiClient(BASE_URL)
+
+    results = {}
+    for size in sizes:
+        print(f"\n📦 Growing {args.db}.ai_tools to {size:,} documents")
+        started = time.perf_counter()
+        total = load_catalog(collection, size, seed=args.seed)
+        print(f"   Loaded in {time.perf_counter() - started:.1f}s")
+
+        # The catalog was written directly, so have the app recount its stats
+        response = client.post("/ai-tools/stats", headers=ADMIN_HEADERS)
+        if response.status_code == 401:
+            print("❌ Recounting stats needs the app's API_SECRET in HAPPYTOOLS_API_SECRET")
+            sys.exit(1)
+        reported = response.json().get('total')
+        if reported != total:
+            print(f"❌ The app reports {reported} tools but {args.db} holds {total}; "
+                  f"start it with DB_NAME={args.db}")
+            sys.exit(1)
+
+        # Dropping the collection drops its indexes too, so rebuild them and
+        # report any hot query that would still scan the collection
+        report = client.post("/indexes", headers=ADMIN_HEADERS).json()
+        for index in report['indexes']:
+            if not index['ok']:
+                print(f"⚠️  Index {index['collection']}.{index['name']} failed: {index.get('error')}")
+        for query in report['collscans']:
+            print(f"⚠️  COLLSCAN: {query}")
+
+        results[size] = {}
+        for name, path in ROUTES:
+            histogram = measure_route(client, path, args.samples)
+            results[size][name] = {
+                'path': path,
+                'p50_ms': histogram.value_at_percentile(50) / 1000,
+                'p95_ms': histogram.value_at_percentile(95) / 1000,
+                'max_ms': histogram.max_value / 1000,
+            }
+            print(f"   {name:<22} p50 {results[size][name]['p50_ms']:.1f}ms, "
+                  f"p95 {results[size][name]['p95_ms']:.1f}ms")
+
+    print_sweep(results, sizes)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'base_url': BASE_URL, 'samples': args.samples, 'results': results}, f, indent=2)
+        print(f"💾 Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Chatbot knowledge-base scaling and concurrent-session soak test.
+
+For each knowledge-base size, creates a chatbot through /api/chatbot/create
+and then drives many concurrent sessionIds through /api/chatbot/chat at a
+fixed arrival rate. /api/metrics is polled throughout, so the report shows
+chat latency against knowledge-base size next to server memory growth and
+how fast chat_interactions grows.
+
+    python chatbot_soak_test.py --kb-sizes 1KB,100KB,1MB,10MB,32MB --sessions 300 --rps 50 --duration 120
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+import uuid
+
+from tests.http_client import API_BASE_URL, ApiClient
+from tests.load import LatencyHistogram, LoadTarget, run_load
+
+BASE_URL = API_BASE_URL
+DEFAULT_KB_SIZES = "1KB,100KB,1MB,10MB,32MB"
+DEFAULT_SESSIONS = 200
+DEFAULT_RPS = 20
+DEFAULT_DURATION = 60
+DEFAULT_METRICS_INTERVAL = 2
+
+UNITS = {'KB': 1024, 'MB': 1024 ** 2, 'B': 1}
+FILLER = ("Our platform helps teams organise projects, share documents and track progress. "
+          "Support is available by email and chat during business hours. Plans can be "
+          "upgraded or downgraded at any time from the billing page. ")
+# Placed at the very end of the knowledge base, so answering it scans everything
+NEEDLE = "The warranty claim reference is zephyrquartz and claims close after ninety days."
+
+# A hit on the needle, a miss that scans the whole knowledge base for every
+# word, and a greeting that skips the scan. The first two must avoid the
+# words the chat handler answers with canned replies (hi, hello, help, what,
+# also inside words like "this"), or they never reach the knowledge base.
+MESSAGES = [
+    "Explain the zephyrquartz warranty claim process",
+    "Do you support kubernetes orchestration deployments?",
+    "Hello there",
+]
+
+
+def parse_size(text):
+    text = text.strip().upper()
+    for unit in ('KB', 'MB', 'B'):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * UNITS[unit])
+    return int(text)
+
+
+def format_size(size):
+    if size >= UNITS['MB']:
+        return f"{size / UNITS['MB']:g}MB"
+    if size >= UNITS['KB']:
+        return f"{size / UNITS['KB']:g}KB"
+    return f"{size}B"
+
+
+def knowledge_text(size):
+    body_size = max(0, size - len(NEEDLE) - 1)
+    body = (FILLER * (body_size // len(FILLER) + 1))[:body_size]
+    return f"{body} {NEEDLE}"
+
+
+class MetricsSampler:
+    """Polls /api/metrics in the background while a load phase runs."""
+
+    def __init__(self, client, interval):
+        self.client = client
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        try:
+            data = self.client.get("/metrics", timeout=10).json()
+            self.samples.append((time.time(), data))
+        except Exception:
+            pass
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self.sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+    def summary(self):
+        if len(self.samples) < 2:
+            return None
+        (t0, first), (t1, last) = self.samples[0], self.samples[-1]
+        rss = [data['memory']['rss'] for _, data in self.samples]
+        interactions = last['collections']['chat_interactions'] - first['collections']['chat_interactions']
+        return {
+            'rss_start': first['memory']['rss'],
+            'rss_peak': max(rss),
+            'rss_end': last['memory']['rss'],
+            'heap_used_end': last['memory']['heap_used'],
+            'interactions': interactions,
+            'interactions_per_s': interactions / (t1 - t0) if t1 > t0 else 0,
+            'interactions_total': last['collections']['chat_interactions'],
+        }
+
+
+class ChatbotSoakTester:
+    def __init__(self, sessions=DEFAULT_SESSIONS, rps=DEFAULT_RPS, duration=DEFAULT_DURATION,
+                 metrics_interval=DEFAULT_METRICS_INTERVAL):
+        self.client = ApiClient(BASE_URL, timeout=300)
+        self.session_ids = [str(uuid.uuid4()) for _ in range(sessions)]
+        self.rps = rps
+        self.duration = duration
+        self.metrics_interval = metrics_interval
+        self.results = []
+
+    def create_chatbot(self, kb_size):
+        payload = {
+            "name": f"Soak Bot {format_size(kb_size)}",
+            "description": "Knowledge-base scaling soak test",
+            "personality": "helpful",
+            "knowledge": {"textContent": knowledge_text(kb_size), "documents": [], "urls": []}
+        }
+        response = self.client.post("/chatbot/create", json=payload)
+        return response, response.timing
+
+    def check_answer(self, chatbot_id):
+        """Asks the needle question once; True if the answer came from the knowledge base"""
+        response = self.client.post("/chatbot/chat", json={
+            "chatbotId": chatbot_id,
+            "message": MESSAGES[0],
+            "sessionId": self.session_ids[0]
+        })
+        answer = response.json().get('response', '') if response.status_code == 200 else ''
+        if answer.startswith("Based on my knowledge:") and NEEDLE in answer:
+            print(f"✅ Needle found in {response.timing.summary()}")
+            return True
+        print(f"❌ Needle not answered from the knowledge base (HTTP {response.status_code}): {answer[:200]}")
+        return False
+
+    def chat_targets(self, chatbot_id):
+        rng = random.Random(chatbot_id)
+        return [
+            LoadTarget(f"chat #{i + 1}", "POST", "/chatbot/chat", timeout=60, json=lambda message=message: {
+                "chatbotId": chatbot_id,
+                "message": message,
+                "sessionId": rng.choice(self.session_ids)
+            })
+            for i, message in enumerate(MESSAGES)
+        ]
+
+    def soak(self, kb_size):
+        label = format_size(kb_size)
+        print(f"\n--- Knowledge base {label} ---")
+        response, timing = self.create_chatbot(kb_size)
+        if response.status_code != 200:
+            print(f"❌ Create failed with HTTP {response.status_code} in {timing.summary()}: {response.text[:200]}")
+            self.results.append({'kb_size': kb_size, 'create_status': response.status_code})
+            return
+        chatbot_id = response.json()['id']
+        print(f"✅ Created {chatbot_id} in {timing.summary()}")
+        answered = self.check_answer(chatbot_id)
+
+        sampler = MetricsSampler(self.client, self.metrics_interval)
+        sampler.start()
+        result = run_load(BASE_URL, self.chat_targets(chatbot_id), rps=self.rps, duration=self.duration)
+        sampler.stop()
+
+        merged = LatencyHistogram()
+        requests_total = errors = 0
+        for route in result.stats.values():
+            merged.merge(route.histogram)
+            requests_total += route.requests
+            errors += route.errors
+        entry = {
+            'kb_size': kb_size,
+            'create_status': 200,
+            'create_ms': timing.total * 1000,
+            'answered': answered,
+            'requests': requests_total,
+            'error_rate': errors / requests_total if requests_total else 0,
+            'p50_ms': merged.value_at_percentile(50) / 1000,
+            'p95_ms': merged.value_at_percentile(95) / 1000,
+            'p99_ms': merged.value_at_percentile(99) / 1000,
+            'per_message_p95_ms': {name: route.histogram.value_at_percentile(95) / 1000
+                                   for name, route in result.stats.items()},
+            'metrics': sampler.summary(),
+        }
+        self.results.append(entry)
+        print(f"   {requests_total} chats, p50 {entry['p50_ms']:.1f}ms, p95 {entry['p95_ms']:.1f}ms, "
+              f"errors {entry['error_rate'] * 100:.1f}%")
+        for message, (name, p95) in zip(MESSAGES, entry['per_message_p95_ms'].items()):
+            print(f"   {name} p95 {p95:.1f}ms - {message}")
+
+    def print_report(self):
+        mb = lambda value: f"{value / UNITS['MB']:.0f}"
+        print("\n" + "="*80)
+        print(f"CHATBOT SOAK REPORT - {len(self.session_ids)} sessions, {self.rps} req/s for {self.duration}s per size")
+        print("="*80)
+        print(f"{'KB':>7}{'create':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'err%':>7}"
+              f"{'rss MB start/peak/end':>24}{'rows/s':>9}")
+        for entry in self.results:
+            if entry['create_status'] != 200:
+                print(f"{format_size(entry['kb_size']):>7}  create failed (HTTP {entry['create_status']})")
+                continue
+            metrics = entry['metrics']
+            memory = (f"{mb(metrics['rss_start'])}/{mb(metrics['rss_peak'])}/{mb(metrics['rss_end'])}"
+                      if metrics else "n/a")
+            rows = f"{metrics['interactions_per_s']:.1f}" if metrics else "n/a"
+            print(f"{format_size(entry['kb_size']):>7}{entry['create_ms']:>9.0f}{entry['p50_ms']:>9.1f}"
+                  f"{entry['p95_ms']:>9.1f}{entry['p99_ms']:>9.1f}{entry['error_rate'] * 100:>7.1f}"
+                  f"{memory:>24}{rows:>9}")
+        print("Latencies in ms (chat latency measured from the scheduled send time). "
+              "rows/s is chat_interactions growth.")
+
+    def run(self, kb_sizes):
+        print(f"🚀 Chatbot soak test against {BASE_URL}")
+        for kb_size in kb_sizes:
+            self.soak(kb_size)
+        self.print_report()
+        return all(entry['create_status'] == 200 and entry['answered'] and entry['error_rate'] == 0
+                   for entry in self.results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chatbot knowledge-base scaling and session soak test")
+    parser.add_argument("--kb-sizes", default=DEFAULT_KB_SIZES,
+                        help=f"comma-separated knowledge-base sizes (default {DEFAULT_KB_SIZES})")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS,
+                        help=f"distinct sessionIds to spread chats over (default {DEFAULT_SESSIONS})")
+    parser.add_argument("--rps", type=float, default=DEFAULT_RPS, help=f"chat messages per second (default {DEFAULT_RPS})")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help=f"seconds of chat per knowledge-base size (default {DEFAULT_DURATION})")
+    parser.add_argument("--metrics-interval", type=float, default=DEFAULT_METRICS_INTERVAL,
+                        help=f"seconds between /api/metrics samples (default {DEFAULT_METRICS_INTERVAL})")
+    args = parser.parse_args()
+
+    tester = ChatbotSoakTester(sessions=args.sessions, rps=args.rps, duration=args.duration,
+                               metrics_interval=args.metrics_interval)
+    ok = tester.run([parse_size(size) for size in args.kb_sizes.split(",")])
+    sys.exit(0 if ok else 1)
@@ -5,6 +5,7 @@ import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle }
 import { Button } from '@/components/ui/button'
 import { Badge } from '@/components/ui/badge'
 import { ExternalLink, ThumbsUp, Calendar, Users, Loader2 } from 'lucide-react'
+import { waitForJob } from '@/lib/job-client'
 
 export default function AIToolsGrid({ searchQuery = '', onLoadMoreClick }) {
   const [tools, setTools] = useState([])
@@ -72,12 +73,11 @@ export default function AIToolsGrid({ searchQuery = '', onLoadMoreClick }) {
         method: 'POST'
       })
       
-      if (response.ok) {
-        const data = await response.json()
-        console.log('Sync successful:', data)
-        // Reload tools after sync
-        loadTools(1, searchQuery, false)
-      }
+      // The sync runs as a background job; wait for it before reloading
+      const data = await waitForJob(response)
+      console.log('Sync successful:', data)
+      // Reload tools after sync
+      loadTools(1, searchQuery, false)
     } catch (err) {
       console.error('Sync error:', err)
     }
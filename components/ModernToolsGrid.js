@@ -5,6 +5,7 @@ import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle }
 import { Button } from '@/components/ui/button'
 import { Badge } from '@/components/ui/badge'
 import { ExternalLink, ThumbsUp, Calendar, Users, Loader2, Heart, Star, Sparkles, Filter, Grid3X3, List } from 'lucide-react'
+import { waitForJob } from '@/lib/job-client'
 
 export default function ModernToolsGrid({ searchQuery = '', categoryFilter = 'all' }) {
   const [tools, setTools] = useState([])
@@ -16,7 +17,7 @@ export default function ModernToolsGrid({ searchQuery = '', categoryFilter = 'al
   const [sortBy, setSortBy] = useState('featured_at')
 
   // Load tools from API
-  const loadTools = async (page = 1, search = '', category = 'all', append = false) => {
+  const loadTools = async (page = 1, search = '', category = 'all', append = false, cursor = null) => {
     const loadingState = page === 1 ? setLoading : setLoadingMore
     loadingState(true)
     setError(null)
@@ -36,6 +37,16 @@ export default function ModernToolsGrid({ searchQuery = '', categoryFilter = 'al
         params.set('category', category)
       }
 
+      // The unfiltered total comes from collection metadata instead of a count
+      if (!search && (!category || category === 'all')) {
+        params.set('estimate', 'true')
+      }
+
+      // Continue from the previous page's last tool instead of counting pages
+      if (cursor) {
+        params.set('cursor', cursor)
+      }
+
       const response = await fetch(`/api/ai-tools?${params}`)
       
       if (!response.ok) {
@@ -50,7 +61,8 @@ export default function ModernToolsGrid({ searchQuery = '', categoryFilter = 'al
         setTools(data.tools)
       }
       
-      setPagination(data.pagination)
+      // Cursor pages don't recount the catalog, so keep the first page's total
+      setPagination(prev => ({ ...data.pagination, page, total: data.pagination.total ?? prev.total }))
     } catch (err) {
       setError(err.message)
       console.error('Error loading tools:', err)
@@ -62,7 +74,7 @@ export default function ModernToolsGrid({ searchQuery = '', categoryFilter = 'al
   // Load more tools
   const handleLoadMore = () => {
     if (!loadingMore && pagination.hasMore) {
-      loadTools(pagination.page + 1, searchQuery, categoryFilter, true)
+      loadTools(pagination.page + 1, searchQuery, categoryFilter, true, pagination.nextCursor)
     }
   }
 
@@ -80,7 +92,9 @@ export default function ModernToolsGrid({ searchQuery = '', categoryFilter = 'al
         method: 'POST'
       })
       
-      if (phResponse.ok || aitoolsResponse.ok) {
+      // Both syncs run as background jobs; reload once they finish
+      const results = await Promise.allSettled([waitForJob(phResponse), waitForJob(aitoolsResponse)])
+      if (results.some(result => result.status === 'fulfilled')) {
         console.log('Sync successful')
         loadTools(1, searchQuery, categoryFilter, false)
       }
@@ -243,6 +257,7 @@ export default function ModernToolsGrid({ searchQuery = '', categoryFilter = 'al
               <option value="featured_at" className="bg-gray-800 text-white">Latest</option>
               <option value="votes" className="bg-gray-800 text-white">Most Popular</option>
               <option value="name" className="bg-gray-800 text-white">Name</option>
+              <option value="relevance" className="bg-gray-800 text-white">Best Match</option>
             </select>
             
             <Button 
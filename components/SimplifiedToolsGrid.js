@@ -4,6 +4,7 @@ import { useState, useEffect } from 'react'
 import { Button } from '@/components/ui/button'
 import { Badge } from '@/components/ui/badge'
 import { ExternalLink, Loader2, Heart, Sparkles, TrendingUp } from 'lucide-react'
+import { waitForJob } from '@/lib/job-client'
 
 export default function SimplifiedToolsGrid({ searchQuery = '', categoryFilter = 'all' }) {
   const [tools, setTools] = useState([])
@@ -14,7 +15,7 @@ export default function SimplifiedToolsGrid({ searchQuery = '', categoryFilter =
   const [sortBy, setSortBy] = useState('featured_at')
 
   // Load tools from API
-  const loadTools = async (page = 1, search = '', category = 'all', append = false) => {
+  const loadTools = async (page = 1, search = '', category = 'all', append = false, cursor = null) => {
     const loadingState = page === 1 ? setLoading : setLoadingMore
     loadingState(true)
     setError(null)
@@ -34,6 +35,16 @@ export default function SimplifiedToolsGrid({ searchQuery = '', categoryFilter =
         params.set('category', category)
       }
 
+      // The unfiltered total comes from collection metadata instead of a count
+      if (!search && (!category || category === 'all')) {
+        params.set('estimate', 'true')
+      }
+
+      // Continue from the previous page's last tool instead of counting pages
+      if (cursor) {
+        params.set('cursor', cursor)
+      }
+
       const response = await fetch(`/api/ai-tools?${params}`)
       
       if (!response.ok) {
@@ -48,7 +59,8 @@ export default function SimplifiedToolsGrid({ searchQuery = '', categoryFilter =
         setTools(data.tools)
       }
       
-      setPagination(data.pagination)
+      // Cursor pages don't recount the catalog, so keep the first page's total
+      setPagination(prev => ({ ...data.pagination, page, total: data.pagination.total ?? prev.total }))
     } catch (err) {
       setError(err.message)
       console.error('Error loading tools:', err)
@@ -60,7 +72,7 @@ export default function SimplifiedToolsGrid({ searchQuery = '', categoryFilter =
   // Load more tools
   const handleLoadMore = () => {
     if (!loadingMore && pagination.hasMore) {
-      loadTools(pagination.page + 1, searchQuery, categoryFilter, true)
+      loadTools(pagination.page + 1, searchQuery, categoryFilter, true, pagination.nextCursor)
     }
   }
 
@@ -72,10 +84,10 @@ export default function SimplifiedToolsGrid({ searchQuery = '', categoryFilter =
         method: 'POST'
       })
       
-      if (response.ok) {
-        console.log('Sync successful')
-        loadTools(1, searchQuery, categoryFilter, false)
-      }
+      // The sync runs as a background job; wait for it before reloading
+      const result = await waitForJob(response)
+      console.log('Sync successful:', result)
+      loadTools(1, searchQuery, categoryFilter, false)
     } catch (err) {
       console.error('Sync error:', err)
     }
@@ -1,17 +1,17 @@
 #!/usr/bin/env python3
 
-import requests
 import json
 import time
 import sys
 from datetime import datetime
 
+from tests.http_client import API_BASE_URL, ApiClient
+
 # Configuration
-BASE_URL = "https://f2884661-c20b-483f-ad47-0b43883bbdde.preview.emergentagent.com/api"
-HEADERS = {
-    'Content-Type': 'application/json',
-    'Accept': 'application/json'
-}
+BASE_URL = API_BASE_URL
+
+# Prints the latency of every call, since these checks report through print()
+client = ApiClient(BASE_URL, verbose=True)
 
 def test_workflow_database_storage():
     """Test that workflows are properly saved to MongoDB"""
@@ -30,7 +30,7 @@ def test_workflow_database_storage():
             "platform": "n8n"
         }
         
-        response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=30)
+        response = client.post("/workflow-builder/generate", json=payload, timeout=30)
         
         if response.status_code == 200:
             data = response.json()
@@ -85,7 +85,7 @@ def test_workflow_helper_functions():
             "platform": "make"
         }
         
-        response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=30)
+        response = client.post("/workflow-builder/generate", json=payload, timeout=30)
         
         if response.status_code == 200:
             data = response.json()
@@ -166,9 +166,8 @@ def test_workflow_validation_edge_cases():
     for test_case in test_cases:
         print(f"\n--- {test_case['name']} ---")
         try:
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", 
+            response = client.post("/workflow-builder/generate", 
                                    json=test_case['payload'], 
-                                   headers=HEADERS, 
                                    timeout=30)
             
             if response.status_code == test_case['expected_status']:
@@ -1,17 +1,17 @@
 #!/usr/bin/env python3
 
-import requests
 import json
 import time
 import sys
 from datetime import datetime
 
+from tests.http_client import API_BASE_URL, ApiClient
+
 # Configuration
-BASE_URL = "https://f2884661-c20b-483f-ad47-0b43883bbdde.preview.emergentagent.com/api"
-HEADERS = {
-    'Content-Type': 'application/json',
-    'Accept': 'application/json'
-}
+BASE_URL = API_BASE_URL
+
+# Prints the latency of every call, since these checks report through print()
+client = ApiClient(BASE_URL, verbose=True)
 
 def test_workflow_functionality():
     """Test the workflow builder functionality comprehensively"""
@@ -26,7 +26,7 @@ def test_workflow_functionality():
     tests_total += 1
     try:
         payload = {"name": "Test"}  # Missing required fields
-        response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS)
+        response = client.post("/workflow-builder/generate", json=payload)
         
         if response.status_code == 400:
             data = response.json()
@@ -51,7 +51,7 @@ def test_workflow_functionality():
             "automationDescription": "test",
             "platform": "n8n"
         }
-        response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS)
+        response = client.post("/workflow-builder/generate", json=payload)
         
         if response.status_code == 400:
             data = response.json()
@@ -76,7 +76,7 @@ def test_workflow_functionality():
             "automationDescription": "test",
             "platform": "invalid-platform"
         }
-        response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS)
+        response = client.post("/workflow-builder/generate", json=payload)
         
         if response.status_code == 400:
             data = response.json()
@@ -102,7 +102,7 @@ def test_workflow_functionality():
             "automationDescription": "Send email when form is submitted",
             "platform": "n8n"
         }
-        response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=30)
+        response = client.post("/workflow-builder/generate", json=payload, timeout=30)
         
         if response.status_code == 500:
             data = response.json()
@@ -131,7 +131,7 @@ def test_workflow_functionality():
             "automationDescription": "Post to social media",
             "platform": "make"
         }
-        response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=30)
+        response = client.post("/workflow-builder/generate", json=payload, timeout=30)
         
         if response.status_code == 500:
             data = response.json()
@@ -159,7 +159,7 @@ def test_workflow_functionality():
             "automationDescription": "Process data from APIs",
             "platform": "n8n"
         }
-        response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=30)
+        response = client.post("/workflow-builder/generate", json=payload, timeout=30)
         
         if response.status_code == 500:
             data = response.json()
@@ -182,7 +182,7 @@ def test_workflow_functionality():
     try:
         # Test that the endpoint exists and responds
         payload = {}
-        response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS)
+        response = client.post("/workflow-builder/generate", json=payload)
         
         if response.status_code in [400, 500]:  # Any response means endpoint exists
             print("✅ PASSED: Workflow builder endpoint is available and responding")
@@ -203,7 +203,7 @@ def test_workflow_functionality():
             "automationDescription": "test",
             "platform": "n8n"
         }
-        response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS)
+        response = client.post("/workflow-builder/generate", json=payload)
         
         # Should get a JSON response regardless of success/failure
         try:
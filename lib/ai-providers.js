@@ -1,5 +1,7 @@
 // AI Provider Integrations for Website Builder
 
+import { OPENAI_BASE_URL, ANTHROPIC_BASE_URL, GEMINI_BASE_URL } from './llm-endpoints';
+
 export async function generateWebsiteCode(provider, apiKey, prompt) {
   const systemPrompt = `You are an expert web developer and designer. Generate a complete, modern, responsive website based on the user's description. 
 
@@ -37,7 +39,7 @@ The website should be complete and ready to use immediately.`;
 }
 
 async function generateWithOpenAI(apiKey, systemPrompt, userPrompt) {
-  const response = await fetch('https://api.openai.com/v1/chat/completions', {
+  const response = await fetch(`${OPENAI_BASE_URL}/v1/chat/completions`, {
     method: 'POST',
     headers: {
       'Authorization': `Bearer ${apiKey}`,
@@ -64,7 +66,7 @@ async function generateWithOpenAI(apiKey, systemPrompt, userPrompt) {
 }
 
 async function generateWithClaude(apiKey, systemPrompt, userPrompt) {
-  const response = await fetch('https://api.anthropic.com/v1/messages', {
+  const response = await fetch(`${ANTHROPIC_BASE_URL}/v1/messages`, {
     method: 'POST',
     headers: {
       'x-api-key': apiKey,
@@ -91,7 +93,7 @@ async function generateWithClaude(apiKey, systemPrompt, userPrompt) {
 }
 
 async function generateWithGemini(apiKey, systemPrompt, userPrompt) {
-  const response = await fetch(`https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key=${apiKey}`, {
+  const response = await fetch(`${GEMINI_BASE_URL}/v1beta/models/gemini-pro:generateContent?key=${apiKey}`, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
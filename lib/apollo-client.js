@@ -1,14 +1,27 @@
 import { ApolloClient, HttpLink, InMemoryCache } from '@apollo/client';
 
+// PRODUCT_HUNT_API_URL points the sync at a stub for offline runs
+export const PRODUCT_HUNT_API_URL = process.env.PRODUCT_HUNT_API_URL || "https://api.producthunt.com/v2/api/graphql";
+
+let client = null;
+
+// One client per process. Syncs page through fresh data every time, so
+// queries skip the cache instead of piling every page into it.
 export const getClient = () => {
-  return new ApolloClient({
-    cache: new InMemoryCache(),
-    link: new HttpLink({
-      uri: "https://api.producthunt.com/v2/api/graphql",
-      headers: {
-        Authorization: `Bearer ${process.env.PRODUCT_HUNT_API_KEY}`,
-        "Content-Type": "application/json"
+  if (!client) {
+    client = new ApolloClient({
+      cache: new InMemoryCache(),
+      link: new HttpLink({
+        uri: PRODUCT_HUNT_API_URL,
+        headers: {
+          Authorization: `Bearer ${process.env.PRODUCT_HUNT_API_KEY}`,
+          "Content-Type": "application/json"
+        }
+      }),
+      defaultOptions: {
+        query: { fetchPolicy: 'no-cache', errorPolicy: 'none' }
       }
-    })
-  });
-};
\ No newline at end of file
+    });
+  }
+  return client;
+};
@@ -0,0 +1,62 @@
+import { createHash } from 'crypto';
+
+// Materialized catalog statistics for /ai-tools/stats and /ai-tools/categories.
+//
+// Totals, per-category and per-source counts only change when a sync writes
+// to ai_tools, so they are computed once after each sync (one aggregation
+// over the collection) and stored as a single catalog_stats document. The
+// endpoints then read that document by _id instead of scanning the catalog,
+// and its ETag lets clients revalidate without downloading it again.
+
+const STATS_ID = 'ai_tools';
+
+function statsCollection(db) {
+  return db.collection('catalog_stats');
+}
+
+function byCount(a, b) {
+  return b.count - a.count || String(a._id).localeCompare(String(b._id));
+}
+
+// Recounts the catalog and stores the result; returns the stats document
+export async function refreshCatalogStats(db) {
+  const [facets] = await db.collection('ai_tools').aggregate([
+    {
+      $facet: {
+        total: [{ $count: 'count' }],
+        categories: [{ $group: { _id: '$category', count: { $sum: 1 } } }],
+        sources: [{ $group: { _id: '$source', count: { $sum: 1 } } }]
+      }
+    }
+  ]).toArray();
+
+  const stats = {
+    total: facets.total[0]?.count || 0,
+    categories: facets.categories.sort(byCount),
+    sources: facets.sources.sort(byCount)
+  };
+  stats.category_names = stats.categories
+    .map(category => category._id)
+    .filter(name => name && name !== 'General')
+    .sort();
+  stats.etag = `"${createHash('sha1').update(JSON.stringify(stats)).digest('hex')}"`;
+  stats.computed_at = new Date();
+
+  await statsCollection(db).replaceOne({ _id: STATS_ID }, stats, { upsert: true });
+  return stats;
+}
+
+// Like refreshCatalogStats, but a failure is logged instead of failing the sync
+export async function refreshCatalogStatsSafely(db) {
+  try {
+    await refreshCatalogStats(db);
+  } catch (error) {
+    console.error('Failed to refresh catalog stats:', error.message);
+  }
+}
+
+// The stored stats, computed on first use
+export async function getCatalogStats(db) {
+  const stats = await statsCollection(db).findOne({ _id: STATS_ID });
+  return stats || refreshCatalogStats(db);
+}
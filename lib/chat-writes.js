@@ -0,0 +1,206 @@
+import { constants } from 'os';
+import { MongoBulkWriteError } from 'mongodb';
+
+// Write-behind buffer for the writes each chat message makes.
+//
+// Instead of an insertOne into chat_interactions and a $inc of the chatbot's
+// chat_count per message, interactions are buffered and written with one
+// insertMany, and the increments are summed per chatbot into one bulkWrite.
+// The buffer is flushed when it reaches CHAT_WRITE_BATCH messages, every
+// CHAT_WRITE_FLUSH_MS, and on shutdown: when the event loop empties
+// (beforeExit) and on SIGTERM/SIGINT. A signal waits up to
+// CHAT_WRITE_SHUTDOWN_MS for the flush. Then, if no other handler is
+// listening for the signal, the process exits as the signal would have;
+// otherwise exiting is left to those handlers. `next start` exits on these
+// signals by itself unless NEXT_MANUAL_SIG_HANDLE=true is set, so set it to
+// give the flush its time.
+//
+// CHAT_WRITE_DURABILITY picks what a chat response waits for:
+//   buffered (default)  nothing; the reply goes out as soon as it is computed,
+//                       and buffered messages are lost if the process crashes,
+//                       is killed with SIGKILL or the shutdown flush fails
+//   flush               the flush that includes its message. An idle buffer
+//                       flushes at once; messages arriving during a flush
+//                       share the next one (group commit)
+
+const BATCH_SIZE = parseInt(process.env.CHAT_WRITE_BATCH || '500');
+const FLUSH_MS = parseInt(process.env.CHAT_WRITE_FLUSH_MS || '1000');
+const DURABILITY = process.env.CHAT_WRITE_DURABILITY === 'flush' ? 'flush' : 'buffered';
+const SHUTDOWN_MS = parseInt(process.env.CHAT_WRITE_SHUTDOWN_MS || '5000');
+// Failed flushes are retried, but never hold more than this many messages
+const MAX_BUFFERED = BATCH_SIZE * 20;
+const DUPLICATE_KEY = 11000;
+
+let database = null;
+let interactions = [];
+let counts = new Map();
+let waiters = [];
+let timer = null;
+let flushing = null;
+let shutdownHooked = false;
+let shuttingDown = false;
+
+const stats = { buffered: 0, written: 0, failed: 0, dropped: 0, flushes: 0, last_flush_ms: null };
+
+// Failures are logged and retried by writeBatch; nobody awaits these flushes
+function flushInBackground() {
+  flushChatWrites().catch(() => {});
+}
+
+function scheduleFlush() {
+  if (interactions.length >= BATCH_SIZE || (DURABILITY === 'flush' && !flushing)) {
+    flushInBackground();
+  } else if (!timer) {
+    timer = setTimeout(flushInBackground, FLUSH_MS);
+    timer.unref?.();
+  }
+}
+
+// Flushes within SHUTDOWN_MS, then exits unless another handler owns the
+// signal. A second signal exits at once.
+async function flushOnSignal(signal) {
+  const owned = process.listenerCount(signal) === 1;
+  if (shuttingDown) {
+    if (owned) process.exit(128 + constants.signals[signal]);
+    return;
+  }
+  shuttingDown = true;
+  let deadline;
+  await Promise.race([
+    flushChatWrites().catch(() => {}),
+    new Promise(resolve => { deadline = setTimeout(resolve, SHUTDOWN_MS); })
+  ]);
+  clearTimeout(deadline);
+  if (flushing || interactions.length || counts.size) {
+    console.error(`Chat write-behind: ${signal} before the shutdown flush finished; unwritten interactions are lost`);
+  }
+  if (owned) process.exit(128 + constants.signals[signal]);
+}
+
+// Gives buffered messages a last flush on shutdown. Flushing schedules more
+// work, so beforeExit fires again once it is done.
+function hookShutdown() {
+  if (shutdownHooked) return;
+  shutdownHooked = true;
+  process.on('beforeExit', flushInBackground);
+  for (const signal of ['SIGTERM', 'SIGINT']) {
+    process.on(signal, flushOnSignal);
+  }
+}
+
+// Puts a failed batch back at the front of the buffer, as far as it fits
+function requeue(batch, batchCounts) {
+  const room = Math.max(0, MAX_BUFFERED - interactions.length);
+  stats.dropped += Math.max(0, batch.length - room);
+  interactions = [...batch.slice(0, room), ...interactions];
+  for (const [chatbotId, count] of batchCounts) {
+    counts.set(chatbotId, (counts.get(chatbotId) || 0) + count);
+  }
+}
+
+async function writeBatch(batch, batchCounts) {
+  const started = Date.now();
+  const increments = [...batchCounts].map(([chatbotId, count]) => ({
+    updateOne: { filter: { id: chatbotId }, update: { $inc: { chat_count: count } } }
+  }));
+  const results = await Promise.allSettled([
+    batch.length ? database.collection('chat_interactions').insertMany(batch, { ordered: false }) : null,
+    increments.length ? database.collection('chatbots').bulkWrite(increments, { ordered: false }) : null
+  ]);
+  stats.flushes++;
+  stats.last_flush_ms = Date.now() - started;
+
+  const [inserted, incremented] = results;
+  let error = null;
+  if (inserted.status === 'fulfilled') {
+    stats.written += batch.length;
+  } else if (inserted.reason instanceof MongoBulkWriteError) {
+    // Unordered: everything but the failed documents was written. A retried
+    // batch may have been partly written before the error that requeued it;
+    // those interactions fail on the unique id index and count as written.
+    const failed = [].concat(inserted.reason.writeErrors).filter(error => error.code !== DUPLICATE_KEY).length;
+    stats.written += batch.length - failed;
+    stats.failed += failed;
+    if (failed) {
+      console.error(`Chat write-behind: ${failed} of ${batch.length} interactions failed:`, inserted.reason.message);
+    }
+  } else {
+    error = inserted.reason;
+    requeue(batch, new Map());
+  }
+  if (incremented.status === 'rejected') {
+    error = error || incremented.reason;
+    requeue([], batchCounts);
+  }
+  if (error) {
+    console.error('Chat write-behind flush failed, will retry:', error.message);
+    throw error;
+  }
+}
+
+// Writes everything buffered so far; resolves once it is written
+export function flushChatWrites() {
+  clearTimeout(timer);
+  timer = null;
+  if (flushing) {
+    // One flush at a time; anything buffered meanwhile goes in the next one
+    return flushing.then(() => (interactions.length || counts.size ? flushChatWrites() : undefined));
+  }
+  if (!interactions.length && !counts.size) {
+    return Promise.resolve();
+  }
+
+  const batch = interactions;
+  const batchCounts = counts;
+  const batchWaiters = waiters;
+  interactions = [];
+  counts = new Map();
+  waiters = [];
+
+  flushing = writeBatch(batch, batchCounts)
+    .then(
+      () => batchWaiters.forEach(({ resolve }) => resolve()),
+      (error) => {
+        batchWaiters.forEach(({ reject }) => reject(error));
+        if (interactions.length || counts.size) scheduleFlush();
+        throw error;
+      }
+    )
+    .finally(() => {
+      flushing = null;
+      // Messages that queued up behind this flush are waiting on the next
+      if (DURABILITY === 'flush' && waiters.length) flushInBackground();
+    });
+  return flushing;
+}
+
+// Records a chat message: its interaction and one chat_count increment.
+// Resolves straight away, or once written under flush durability.
+export function recordChatInteraction(db, interaction) {
+  database = db;
+  hookShutdown();
+  if (interactions.length >= MAX_BUFFERED) {
+    stats.dropped++;
+    console.error('Chat write-behind buffer full, dropping interaction', interaction.id);
+    return DURABILITY === 'flush' ? Promise.reject(new Error('Chat write buffer is full')) : Promise.resolve();
+  }
+  interactions.push(interaction);
+  counts.set(interaction.chatbot_id, (counts.get(interaction.chatbot_id) || 0) + 1);
+  stats.buffered++;
+
+  const written = DURABILITY === 'flush'
+    ? new Promise((resolve, reject) => waiters.push({ resolve, reject }))
+    : Promise.resolve();
+  scheduleFlush();
+  return written;
+}
+
+export function chatWriteStats() {
+  return {
+    ...stats,
+    pending: interactions.length,
+    durability: DURABILITY,
+    batch_size: BATCH_SIZE,
+    flush_ms: FLUSH_MS
+  };
+}
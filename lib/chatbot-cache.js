@@ -0,0 +1,132 @@
+// In-process cache of chatbot configuration for the chat hot path.
+//
+// /chatbot/chat needs a chatbot's name, description, personality and index
+// summary on every message, and these only change when the chatbot itself
+// is edited. They are cached per process in an LRU with a TTL, so repeat
+// chats don't read the chatbot document at all. Writers in this process
+// call invalidateChatbot(); writes from other instances arrive through a
+// change stream on chatbots. Change streams need a replica set: on a
+// standalone server the watch fails, is retried now and then, and the TTL
+// alone bounds staleness.
+
+const TTL_MS = parseInt(process.env.CHATBOT_CACHE_TTL_MS || '60000');
+const MAX_ENTRIES = parseInt(process.env.CHATBOT_CACHE_MAX || '1000');
+const WATCH_RETRY_MS = 60000;
+
+// What the chat handler reads; never the knowledge itself
+export const CHATBOT_CONFIG_PROJECTION = {
+  id: 1, name: 1, description: 1, personality: 1, system_prompt: 1, embedding_active: 1, knowledge_index: 1
+};
+
+// Updates that touch only these don't change the configuration
+const COUNTER_FIELDS = new Set(['chat_count', 'updated_at', 'last_chat_at']);
+
+const entries = new Map();
+const idsByObjectId = new Map();
+const stats = { hits: 0, misses: 0, evictions: 0, expirations: 0, invalidations: 0 };
+
+let watcher = null;
+let watchRetryAt = 0;
+let watchWarned = false;
+
+function remove(id) {
+  const entry = entries.get(id);
+  if (!entry) return false;
+  entries.delete(id);
+  if (entry.objectId) idsByObjectId.delete(entry.objectId);
+  return true;
+}
+
+function store(id, entry) {
+  remove(id);
+  entries.set(id, entry);
+  if (entry.objectId) idsByObjectId.set(entry.objectId, id);
+  while (entries.size > MAX_ENTRIES) {
+    remove(entries.keys().next().value);
+    stats.evictions++;
+  }
+}
+
+function watchChatbots(db) {
+  if (watcher || Date.now() < watchRetryAt) return;
+  try {
+    watcher = db.collection('chatbots').watch([
+      { $match: { operationType: { $in: ['update', 'replace', 'delete'] } } }
+    ]);
+  } catch (error) {
+    watchRetryAt = Date.now() + WATCH_RETRY_MS;
+    return;
+  }
+  watcher.on('change', (change) => {
+    const update = change.updateDescription;
+    if (update) {
+      const fields = [...Object.keys(update.updatedFields || {}), ...(update.removedFields || [])];
+      if (fields.every(field => COUNTER_FIELDS.has(field))) return;
+    }
+    const id = idsByObjectId.get(String(change.documentKey._id));
+    if (id && remove(id)) stats.invalidations++;
+  });
+  watcher.on('error', (error) => {
+    if (!watchWarned) {
+      console.error('Chatbot change stream unavailable, relying on the cache TTL:', error.message);
+      watchWarned = true;
+    }
+    watcher.close().catch(() => {});
+    watcher = null;
+    watchRetryAt = Date.now() + WATCH_RETRY_MS;
+  });
+}
+
+// The chatbot's configuration, or null if it doesn't exist. Concurrent
+// misses for the same chatbot share one read.
+export function getChatbotConfig(db, id) {
+  watchChatbots(db);
+  const entry = entries.get(id);
+  if (entry && (entry.pending || entry.expires > Date.now())) {
+    stats.hits++;
+    // Refresh its place in the LRU order
+    entries.delete(id);
+    entries.set(id, entry);
+    return entry.pending || Promise.resolve(entry.config);
+  }
+  if (entry) {
+    remove(id);
+    stats.expirations++;
+  }
+  stats.misses++;
+
+  const placeholder = { pending: null };
+  placeholder.pending = db.collection('chatbots')
+    .findOne({ id }, { projection: CHATBOT_CONFIG_PROJECTION })
+    .then((document) => {
+      if (entries.get(id) !== placeholder) {
+        return document && stripId(document);
+      }
+      if (!document) {
+        remove(id);
+        return null;
+      }
+      const config = stripId(document);
+      store(id, { config, objectId: String(document._id), expires: Date.now() + TTL_MS });
+      return config;
+    })
+    .catch((error) => {
+      if (entries.get(id) === placeholder) remove(id);
+      throw error;
+    });
+  store(id, placeholder);
+  return placeholder.pending;
+}
+
+function stripId({ _id, ...config }) {
+  return config;
+}
+
+// Call after writing anything in CHATBOT_CONFIG_PROJECTION
+export function invalidateChatbot(id) {
+  if (remove(id)) stats.invalidations++;
+}
+
+export function chatbotCacheStats() {
+  return { ...stats, size: entries.size, max_entries: MAX_ENTRIES, ttl_ms: TTL_MS, change_stream: !!watcher };
+}
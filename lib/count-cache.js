@@ -0,0 +1,69 @@
+// Cached totals for GET /api/ai-tools.
+//
+// countDocuments() runs the listing filter over the collection a second time
+// just to report `pagination.total`. Totals only change when the catalog is
+// synced, so they are cached per filter and dropped whenever a sync endpoint
+// writes. The TTL bounds how stale a total can get from writes made by other
+// server processes or directly against the database.
+
+const TTL_MS = parseInt(process.env.TOOL_COUNT_CACHE_TTL_MS || '30000');
+const MAX_ENTRIES = 500;
+
+const counts = new Map();
+
+// Same filter, same key: search is matched case-insensitively either way, and
+// category matching is a case-insensitive regex
+export function countCacheKey({ search = '', match = 'text', category = '', source = 'all' }) {
+  return JSON.stringify([
+    search.trim().toLowerCase(),
+    search.trim() ? match : '',
+    category === 'all' ? '' : category.toLowerCase(),
+    source
+  ]);
+}
+
+export function cachedToolCount(key) {
+  const entry = counts.get(key);
+  if (!entry || entry.expires <= Date.now()) {
+    return null;
+  }
+  return entry.total;
+}
+
+// Concurrent misses for the same filter share one countDocuments call
+export function countTools(db, query, key) {
+  const entry = counts.get(key);
+  if (entry && entry.expires > Date.now()) {
+    return Promise.resolve(entry.total);
+  }
+  if (entry && entry.pending) {
+    return entry.pending;
+  }
+
+  const placeholder = { total: null, expires: 0, pending: null };
+  placeholder.pending = db.collection('ai_tools').countDocuments(query)
+    .then((total) => {
+      if (counts.get(key) === placeholder) {
+        counts.set(key, { total, expires: Date.now() + TTL_MS });
+      }
+      return total;
+    })
+    .catch((error) => {
+      if (counts.get(key) === placeholder) {
+        counts.delete(key);
+      }
+      throw error;
+    });
+
+  counts.delete(key);
+  counts.set(key, placeholder);
+  if (counts.size > MAX_ENTRIES) {
+    counts.delete(counts.keys().next().value);
+  }
+  return placeholder.pending;
+}
+
+// Call after anything that inserts, updates or removes tools
+export function invalidateToolCounts() {
+  counts.clear();
+}
@@ -0,0 +1,168 @@
+import { sortSpec, SORT_MODES } from './tool-pagination';
+import { ensureTextIndex } from './tool-search';
+import { backfillNameKeys } from './tool-ingest';
+
+// Index bootstrap for the collections the API queries.
+//
+// Each index is matched to a query or sort the route handlers run: the sync
+// endpoints' upsert keys, the /ai-tools listing for every sort mode
+// (including the _id tiebreaker used by cursors), trending, and the chatbot
+// lookups. createIndexes() is a no-op for indexes that already exist, so this
+// runs once per process on startup and is safe to repeat.
+
+export const INDEXES = {
+  ai_tools: [
+    // Upsert keys (see lib/tool-ingest.js): ph_id for Product Hunt tools,
+    // normalized name plus source for everything else
+    { key: { ph_id: 1 }, name: 'ph_id_unique', unique: true, partialFilterExpression: { ph_id: { $exists: true } } },
+    { key: { name_key: 1, source: 1 }, name: 'name_key_source_unique', unique: true, partialFilterExpression: { name_key: { $exists: true } } },
+    ...Object.keys(SORT_MODES).map((mode) => ({ key: sortSpec(mode), name: `sort_${mode}` })),
+    // source=... listings in the default order
+    { key: { source: 1, ...sortSpec('featured_at') }, name: 'source_featured_at' },
+    { key: { category: 1 }, name: 'category' },
+    // /ai-tools/trending
+    { key: { votes: -1, featured_at: -1 }, name: 'trending' }
+  ],
+  chatbots: [
+    { key: { id: 1 }, name: 'id_unique', unique: true }
+  ],
+  // Chatbot knowledge chunks and their inverted index (lib/knowledge-index.js)
+  chatbot_chunks: [
+    { key: { chatbot_id: 1, ord: 1 }, name: 'chatbot_ord_unique', unique: true }
+  ],
+  chatbot_postings: [
+    { key: { chatbot_id: 1, term: 1, block: 1 }, name: 'chatbot_term_block_unique', unique: true }
+  ],
+  // Knowledge vectors (lib/knowledge-vectors.js)
+  chatbot_vectors: [
+    { key: { chatbot_id: 1, kind: 1, block: 1 }, name: 'chatbot_kind_block_unique', unique: true }
+  ],
+  chat_interactions: [
+    { key: { chatbot_id: 1, timestamp: -1 }, name: 'chatbot_timestamp' },
+    // Lets the chat write-behind retry a batch without duplicating interactions
+    { key: { id: 1 }, name: 'id_unique', unique: true }
+  ],
+  // Background jobs (lib/jobs.js); finished jobs expire after a week
+  jobs: [
+    { key: { id: 1 }, name: 'id_unique', unique: true },
+    { key: { active_key: 1 }, name: 'active_key_unique', unique: true, partialFilterExpression: { active_key: { $exists: true } } },
+    { key: { finished_at: 1 }, name: 'finished_at_ttl', expireAfterSeconds: 7 * 24 * 60 * 60 }
+  ],
+  // Scraper page cache (lib/scrapers/page-cache.js)
+  scrape_pages: [
+    { key: { url: 1 }, name: 'url_unique', unique: true }
+  ]
+};
+
+// Representative shapes of the hot queries, checked with explain()
+const HOT_QUERIES = [
+  { collection: 'ai_tools', name: 'sync: ph_id upsert', filter: { ph_id: '0' } },
+  { collection: 'ai_tools', name: 'sync: name_key + source upsert', filter: { name_key: 'x', source: 'AITools.fyi' } },
+  ...Object.keys(SORT_MODES).map((mode) => ({
+    collection: 'ai_tools', name: `listing: sort=${mode}`, filter: {}, sort: sortSpec(mode), limit: 13
+  })),
+  { collection: 'ai_tools', name: 'listing: source filter', filter: { source: 'Product Hunt' }, sort: sortSpec('featured_at'), limit: 13 },
+  { collection: 'ai_tools', name: 'listing: text search', filter: { $text: { $search: 'writing' } }, limit: 13 },
+  { collection: 'ai_tools', name: 'trending', filter: {}, sort: { votes: -1, featured_at: -1 }, limit: 10 },
+  { collection: 'chatbots', name: 'chat: chatbot by id', filter: { id: 'x' } },
+  { collection: 'chatbot_postings', name: 'chat: postings for message terms', filter: { chatbot_id: 'x', term: { $in: ['pricing', 'plan'] } } },
+  { collection: 'chatbot_chunks', name: 'chat: top chunks', filter: { chatbot_id: 'x', ord: { $in: [0, 1, 2] } } },
+  { collection: 'chat_interactions', name: 'chat history by chatbot', filter: { chatbot_id: 'x' }, sort: { timestamp: -1 }, limit: 50 }
+];
+
+const DUPLICATE_KEY = 11000;
+
+let bootstrap = null;
+
+async function createIndex(collection, { key, ...options }) {
+  try {
+    // An earlier bootstrap may have fallen back to the plain index below. It
+    // has the same key, so it must go before the unique index can be built;
+    // if the duplicates are still there it is recreated. (Listing the indexes
+    // of a collection that doesn't exist yet fails, hence the catch.)
+    if (options.unique && await collection.indexExists(`${options.name}_dups`).catch(() => false)) {
+      await collection.dropIndex(`${options.name}_dups`);
+    }
+    await collection.createIndex(key, options);
+    return { collection: collection.collectionName, name: options.name, ok: true };
+  } catch (error) {
+    if (options.unique && error.code === DUPLICATE_KEY) {
+      // Existing duplicates block a unique index; index the lookup anyway so
+      // it stops scanning, and report the duplicates
+      await collection.createIndex(key, { name: `${options.name}_dups` });
+      return {
+        collection: collection.collectionName, name: `${options.name}_dups`, ok: true,
+        warning: `not unique: ${error.message}`
+      };
+    }
+    return { collection: collection.collectionName, name: options.name, ok: false, error: error.message };
+  }
+}
+
+export async function createIndexes(db) {
+  // Keys must exist before the unique index over them is built
+  await backfillNameKeys(db.collection('ai_tools'));
+  const results = await Promise.all(Object.entries(INDEXES).flatMap(([name, specs]) => {
+    const collection = db.collection(name);
+    return specs.map((spec) => createIndex(collection, spec).catch((error) => ({
+      collection: name, name: spec.name, ok: false, error: error.message
+    })));
+  }));
+  const textIndex = await ensureTextIndex(db);
+  results.push({ collection: 'ai_tools', name: 'ai_tools_text', ok: textIndex });
+  return results;
+}
+
+function planStages(plan, stages = []) {
+  if (!plan || typeof plan !== 'object') {
+    return stages;
+  }
+  if (plan.stage) {
+    stages.push(plan.stage);
+  }
+  // Classic plans nest through inputStage(s); SBE explain wraps them in queryPlan
+  planStages(plan.queryPlan, stages);
+  planStages(plan.inputStage, stages);
+  (plan.inputStages || []).forEach((input) => planStages(input, stages));
+  return stages;
+}
+
+// Explains every hot query and flags the ones whose winning plan scans the
+// whole collection
+export async function explainHotQueries(db) {
+  return Promise.all(HOT_QUERIES.map(async ({ collection, name, filter, sort, limit }) => {
+    try {
+      let cursor = db.collection(collection).find(filter);
+      if (sort) cursor = cursor.sort(sort);
+      if (limit) cursor = cursor.limit(limit);
+      const explain = await cursor.explain('queryPlanner');
+      const stages = planStages(explain.queryPlanner.winningPlan);
+      return { collection, query: name, stages, collscan: stages.includes('COLLSCAN') };
+    } catch (error) {
+      return { collection, query: name, error: error.message };
+    }
+  }));
+}
+
+// Once per process: builds the indexes, then logs any hot query that still
+// scans the collection
+export function ensureIndexes(db) {
+  if (!bootstrap) {
+    bootstrap = (async () => {
+      const indexes = await createIndexes(db);
+      indexes.filter((index) => !index.ok || index.warning).forEach((index) => {
+        console.error(`Index ${index.collection}.${index.name}: ${index.error || index.warning || 'unavailable'}`);
+      });
+      const queries = await explainHotQueries(db);
+      queries.filter((query) => query.collscan).forEach((query) => {
+        console.warn(`COLLSCAN: ${query.collection} ${query.query} (${query.stages.join(' <- ')})`);
+      });
+      return { indexes, queries, completed_at: new Date() };
+    })().catch((error) => {
+      console.error('Index bootstrap failed:', error);
+      bootstrap = null;
+      return { indexes: [], queries: [], error: error.message };
+    });
+  }
+  return bootstrap;
+}
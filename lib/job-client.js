@@ -0,0 +1,19 @@
+// Browser helper for endpoints that answer 202 with a background job (see
+// lib/jobs.js): polls the job until it finishes and returns its result.
+// Responses that aren't jobs are returned as they are.
+export async function waitForJob(response, { interval = 2000, timeout = 10 * 60 * 1000 } = {}) {
+  const data = await response.json();
+  if (response.status !== 202) {
+    if (!response.ok) throw new Error(data.error || `HTTP ${response.status}`);
+    return data;
+  }
+
+  const deadline = Date.now() + timeout;
+  while (Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, interval));
+    const job = await (await fetch(data.status_url)).json();
+    if (job.status === 'succeeded') return job.result;
+    if (job.status === 'failed') throw new Error(job.error || 'Job failed');
+  }
+  throw new Error('Timed out waiting for job');
+}
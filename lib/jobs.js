@@ -0,0 +1,151 @@
+import { v4 as uuidv4 } from 'uuid';
+
+// Background jobs for long-running requests.
+//
+// A job runs in a bounded in-process worker pool while its state lives in the
+// `jobs` collection, so GET /api/jobs/{id} can report progress and results
+// from any server process. Jobs with a dedupe key hold it in `active_key`
+// (unique) while queued or running: a second trigger of the same sync finds
+// the running job instead of starting another. Runners heartbeat their jobs;
+// one whose heartbeat stops (the process died) is marked failed and no
+// longer blocks its key.
+//
+// A job's run function is called with a progress callback, which it passes
+// on (as onProgress) to the code doing the work; libraries never import the
+// job runner, so they work the same outside a job.
+
+const CONCURRENCY = parseInt(process.env.JOB_CONCURRENCY || '2');
+const HEARTBEAT_MS = 10000;
+const STALE_MS = 60000;
+const PROGRESS_WRITE_MS = 1000;
+const DUPLICATE_KEY = 11000;
+
+const queue = [];
+const active = new Map();
+let running = 0;
+let heartbeat = null;
+
+function jobs(db) {
+  return db.collection('jobs');
+}
+
+// The public view of a job document
+export function jobView(job) {
+  if (!job) return null;
+  const { _id, active_key, ...rest } = job;
+  return rest;
+}
+
+function startHeartbeat(db) {
+  if (heartbeat) return;
+  heartbeat = setInterval(() => {
+    if (!active.size) return;
+    jobs(db).updateMany({ id: { $in: [...active.keys()] } }, { $set: { heartbeat_at: new Date() } })
+      .catch(error => console.error('Job heartbeat failed:', error.message));
+  }, HEARTBEAT_MS);
+  heartbeat.unref?.();
+}
+
+async function finish(db, job, update) {
+  active.delete(job.id);
+  await jobs(db).updateOne(
+    { id: job.id },
+    { $set: { ...update, progress: job.progress, finished_at: new Date(), updated_at: new Date() }, $unset: { active_key: '' } }
+  );
+}
+
+async function execute(db, job, run) {
+  running++;
+  const startedAt = new Date();
+  try {
+    await jobs(db).updateOne({ id: job.id }, { $set: { status: 'running', started_at: startedAt, updated_at: startedAt } });
+    const result = await run(progress => reportProgress(db, job, progress));
+    await finish(db, job, { status: 'succeeded', result, duration_ms: Date.now() - startedAt });
+  } catch (error) {
+    console.error(`Job ${job.type} ${job.id} failed:`, error);
+    await finish(db, job, {
+      status: 'failed',
+      error: error.message,
+      ...(error.result && { result: error.result }),
+      duration_ms: Date.now() - startedAt
+    }).catch(writeError => console.error('Failed to record job failure:', writeError.message));
+  } finally {
+    running--;
+    drain();
+  }
+}
+
+function drain() {
+  while (running < CONCURRENCY && queue.length) {
+    const { db, job, run } = queue.shift();
+    execute(db, job, run);
+  }
+}
+
+// Marks a job whose runner stopped heartbeating as failed, freeing its key
+async function reclaimIfStale(db, job) {
+  const lastSeen = job.heartbeat_at || job.created_at;
+  if (Date.now() - lastSeen.getTime() < STALE_MS) {
+    return false;
+  }
+  const { modifiedCount } = await jobs(db).updateOne(
+    { id: job.id, active_key: { $exists: true } },
+    { $set: { status: 'failed', error: 'Job abandoned: its server process stopped', finished_at: new Date() }, $unset: { active_key: '' } }
+  );
+  return modifiedCount > 0;
+}
+
+// Queues `run` as a job and returns { job, created }; `run` is called with a
+// progress callback. With a dedupeKey, an already queued or running job with
+// the same key is returned instead.
+export async function enqueueJob(db, { type, dedupeKey = null, run }) {
+  startHeartbeat(db);
+  const now = new Date();
+  const job = {
+    id: uuidv4(),
+    type,
+    status: 'queued',
+    progress: null,
+    created_at: now,
+    updated_at: now,
+    heartbeat_at: now,
+    ...(dedupeKey && { dedupe_key: dedupeKey, active_key: dedupeKey })
+  };
+
+  for (let attempt = 0; ; attempt++) {
+    try {
+      await jobs(db).insertOne({ ...job });
+      break;
+    } catch (error) {
+      if (error.code !== DUPLICATE_KEY || !dedupeKey || attempt > 0) {
+        throw error;
+      }
+      const existing = await jobs(db).findOne({ active_key: dedupeKey });
+      if (existing && !(await reclaimIfStale(db, existing))) {
+        return { job: existing, created: false };
+      }
+    }
+  }
+
+  active.set(job.id, job);
+  queue.push({ db, job, run });
+  drain();
+  return { job, created: true };
+}
+
+export async function getJob(db, id) {
+  return jobs(db).findOne({ id });
+}
+
+// Records progress for a running job. Writes are throttled; the final
+// progress is always saved when the job finishes.
+function reportProgress(db, job, progress) {
+  job.progress = { ...job.progress, ...progress };
+  const now = Date.now();
+  if (job.progressWrittenAt && now - job.progressWrittenAt < PROGRESS_WRITE_MS) {
+    return;
+  }
+  job.progressWrittenAt = now;
+  jobs(db).updateOne({ id: job.id, status: 'running' }, { $set: { progress: job.progress, updated_at: new Date() } })
+    .catch(error => console.error('Job progress write failed:', error.message));
+}
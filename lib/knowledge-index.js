@@ -0,0 +1,301 @@
+// Chunked BM25 retrieval over chatbot knowledge bases.
+//
+// At /chatbot/create the knowledge text is split into paragraph-sized chunks
+// (chatbot_chunks), which are the only stored copy of it: the chatbot
+// document keeps just metadata, so it stays small however large the
+// knowledge base is. An inverted index is written alongside the chunks
+// (chatbot_postings: one document per term, listing the chunks that contain
+// it with their term frequency and length). A chat message then reads only
+// the posting lists of its own terms, scores chunks with BM25 and loads the
+// top k, so the work per message depends on the question rather than on the
+// size of the knowledge base. Very common words are dropped at both ends so
+// their posting lists, which grow with the corpus, are never read.
+//
+// Chatbots with embedding_active also get a vector index over the same chunks
+// (lib/knowledge-vectors.js). Its cosine matches fill in when BM25 finds
+// fewer than k chunks, so a chunk that shares no exact word with the question
+// ("refunds" for "refund") can still be found without displacing exact hits.
+
+import { buildVectorIndex, vectorRank, VECTOR_FORMAT } from './knowledge-vectors';
+import { invalidateChatbot } from './chatbot-cache';
+
+const CHUNK_CHARS = 800;
+// Posting lists are split into blocks to stay well under the 16MB document limit
+const POSTINGS_PER_BLOCK = 5000;
+const WRITE_BATCH = 1000;
+const DUPLICATE_KEY = 11000;
+const K1 = 1.2;
+const B = 0.75;
+// Below this cosine a vector match is mostly hash-collision noise
+const MIN_SIMILARITY = 0.05;
+
+const STOPWORDS = new Set(`
+  a about after all also an and any are as at be been but by can could did do does
+  for from had has have he her his how i if in into is it its just me more most my
+  no not of on or our out over she so some such than that the their them then there
+  these they this those through to too up us very was we were what when where which
+  while who why will with would you your
+`.trim().split(/\s+/));
+
+export function tokenize(text) {
+  const words = text.normalize('NFKC').toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+  return words.filter(word => word.length > 1 && !STOPWORDS.has(word));
+}
+
+// Splits on hard boundaries when a paragraph alone is longer than a chunk:
+// sentence ends first, then whitespace
+function splitLong(paragraph) {
+  const pieces = [];
+  let rest = paragraph;
+  while (rest.length > CHUNK_CHARS) {
+    const window = rest.slice(0, CHUNK_CHARS);
+    let cut = Math.max(window.lastIndexOf('. '), window.lastIndexOf('! '), window.lastIndexOf('? '));
+    if (cut < CHUNK_CHARS / 2) {
+      cut = window.lastIndexOf(' ');
+    }
+    if (cut < CHUNK_CHARS / 2) {
+      cut = CHUNK_CHARS - 1;
+    }
+    pieces.push(rest.slice(0, cut + 1).trim());
+    rest = rest.slice(cut + 1);
+  }
+  if (rest.trim()) {
+    pieces.push(rest.trim());
+  }
+  return pieces;
+}
+
+// Packs paragraphs into chunks of up to CHUNK_CHARS characters
+export function chunkText(text) {
+  const chunks = [];
+  let current = '';
+  for (const paragraph of text.split(/\n\s*\n/)) {
+    for (const piece of splitLong(paragraph.trim())) {
+      if (current && current.length + piece.length + 2 > CHUNK_CHARS) {
+        chunks.push(current);
+        current = '';
+      }
+      current = current ? `${current}\n\n${piece}` : piece;
+    }
+  }
+  if (current) {
+    chunks.push(current);
+  }
+  return chunks;
+}
+
+// True when every document that failed to insert was already there
+function onlyDuplicates(error) {
+  const errors = error.writeErrors ? [].concat(error.writeErrors) : [error];
+  return errors.length > 0 && errors.every(writeError => writeError.code === DUPLICATE_KEY);
+}
+
+// Two processes can lazily rebuild the same chatbot at once. Chunking and
+// indexing are deterministic, so both write identical documents: a duplicate
+// key means the other process already wrote that one, and the rest of the
+// (unordered) batch is still inserted.
+async function insertBatched(collection, documents) {
+  for (let start = 0; start < documents.length; start += WRITE_BATCH) {
+    try {
+      await collection.insertMany(documents.slice(start, start + WRITE_BATCH), { ordered: false });
+    } catch (error) {
+      if (!onlyDuplicates(error)) throw error;
+    }
+  }
+}
+
+// Writes the inverted index (and vectors) of the tokenized chunks, which are
+// in ord order, replacing any previous index. Returns the summary stored as
+// the chatbot's knowledge_index.
+async function indexChunks(db, chatbotId, tokenized, { embeddings }) {
+  const postings = new Map();
+  let totalLength = 0;
+
+  tokenized.forEach((terms, ord) => {
+    const frequencies = new Map();
+    for (const term of terms) {
+      frequencies.set(term, (frequencies.get(term) || 0) + 1);
+    }
+    for (const [term, tf] of frequencies) {
+      if (!postings.has(term)) postings.set(term, []);
+      postings.get(term).push([ord, tf, terms.length]);
+    }
+    totalLength += terms.length;
+  });
+
+  const postingDocuments = [];
+  for (const [term, list] of postings) {
+    for (let block = 0; block * POSTINGS_PER_BLOCK < list.length; block++) {
+      postingDocuments.push({
+        chatbot_id: chatbotId,
+        term,
+        block,
+        df: list.length,
+        postings: list.slice(block * POSTINGS_PER_BLOCK, (block + 1) * POSTINGS_PER_BLOCK)
+      });
+    }
+  }
+
+  await db.collection('chatbot_postings').deleteMany({ chatbot_id: chatbotId });
+  await insertBatched(db.collection('chatbot_postings'), postingDocuments);
+  const vectors = embeddings ? await buildVectorIndex(db, chatbotId, tokenized) : null;
+
+  return {
+    chunks: tokenized.length,
+    terms: postings.size,
+    avg_chunk_length: tokenized.length ? totalLength / tokenized.length : 0,
+    vectors,
+    built_at: new Date()
+  };
+}
+
+// Chunks and indexes a knowledge base. `text` must be the source copy of
+// the knowledge: any chunks already stored for the chatbot (left by an
+// interrupted build) are replaced. Returns the summary stored as the
+// chatbot's knowledge_index.
+export async function buildKnowledgeIndex(db, chatbotId, text, { embeddings = true } = {}) {
+  const texts = chunkText(text);
+  const tokenized = texts.map(tokenize);
+  const chunks = texts.map((content, ord) => ({ chatbot_id: chatbotId, ord, text: content, length: tokenized[ord].length }));
+  await db.collection('chatbot_chunks').deleteMany({ chatbot_id: chatbotId });
+  await insertBatched(db.collection('chatbot_chunks'), chunks);
+  return indexChunks(db, chatbotId, tokenized, { embeddings });
+}
+
+// Removes everything buildKnowledgeIndex wrote for the chatbot
+export async function deleteKnowledgeIndex(db, chatbotId) {
+  await Promise.all(['chatbot_chunks', 'chatbot_postings', 'chatbot_vectors'].map(name =>
+    db.collection(name).deleteMany({ chatbot_id: chatbotId })
+  ));
+}
+
+async function loadChunkTexts(db, chatbotId) {
+  const chunks = await db.collection('chatbot_chunks')
+    .find({ chatbot_id: chatbotId }, { projection: { _id: 0, text: 1 } })
+    .sort({ ord: 1 })
+    .toArray();
+  return chunks.map(chunk => chunk.text);
+}
+
+function isCurrent(index, embeddings) {
+  return !!index && (index.vectors?.format === VECTOR_FORMAT || !embeddings);
+}
+
+// Brings the chatbot's index up to date and returns it with the update to
+// store. Stored chunks are the only copy of the knowledge, so they are only
+// read here; chunks are written only from a legacy knowledge_base field,
+// which is removed once they are.
+async function rebuildKnowledgeIndex(db, chatbot, embeddings) {
+  const stored = await db.collection('chatbots')
+    .findOne({ id: chatbot.id }, { projection: { _id: 0, knowledge_base: 1, knowledge_index: 1 } });
+  if (isCurrent(stored?.knowledge_index, embeddings)) {
+    // Another process built it since `chatbot` was read
+    return [stored.knowledge_index, null];
+  }
+  if (typeof stored?.knowledge_base === 'string') {
+    const index = await buildKnowledgeIndex(db, chatbot.id, stored.knowledge_base, { embeddings });
+    return [index, {
+      $set: { knowledge_index: index, knowledge_length: stored.knowledge_base.length },
+      $unset: { knowledge_base: '' }
+    }];
+  }
+
+  const tokenized = (await loadChunkTexts(db, chatbot.id)).map(tokenize);
+  if (stored?.knowledge_index) {
+    // Only the vectors are missing or outdated
+    const vectors = await buildVectorIndex(db, chatbot.id, tokenized);
+    return [{ ...stored.knowledge_index, vectors }, { $set: { 'knowledge_index.vectors': vectors } }];
+  }
+  const index = await indexChunks(db, chatbot.id, tokenized, { embeddings });
+  return [index, { $set: { knowledge_index: index } }];
+}
+
+const building = new Map();
+
+// The chatbot's knowledge_index, building it first for chatbots created
+// before knowledge bases were indexed (or embedded, or stored in the current
+// vector format). Older chatbots also have their knowledge_base field moved
+// out into chunks on the way.
+export function ensureKnowledgeIndex(db, chatbot) {
+  if (isCurrent(chatbot.knowledge_index, chatbot.embedding_active)) {
+    return Promise.resolve(chatbot.knowledge_index);
+  }
+  if (!building.has(chatbot.id)) {
+    const build = rebuildKnowledgeIndex(db, chatbot, !!chatbot.embedding_active)
+      .then(async ([index, update]) => {
+        if (update) {
+          await db.collection('chatbots').updateOne({ id: chatbot.id }, update);
+        }
+        invalidateChatbot(chatbot.id);
+        return index;
+      })
+      .finally(() => building.delete(chatbot.id));
+    building.set(chatbot.id, build);
+  }
+  return building.get(chatbot.id);
+}
+
+// Up to maxChars of the chunk, starting at the sentence with the first
+// query term so the match isn't cut off the end of a long chunk
+export function snippet(text, query, maxChars = 300) {
+  const lower = text.normalize('NFKC').toLowerCase();
+  let first = -1;
+  for (const term of new Set(tokenize(query))) {
+    const found = lower.search(new RegExp(`(?<![\\p{L}\\p{N}])${term}(?![\\p{L}\\p{N}])`, 'u'));
+    if (found >= 0 && (first < 0 || found < first)) first = found;
+  }
+  if (first <= 0) {
+    return text.slice(0, maxChars);
+  }
+  const before = text.slice(Math.max(0, first - 100), first);
+  const boundary = Math.max(before.lastIndexOf('. '), before.lastIndexOf('\n'));
+  const start = boundary >= 0 ? first - before.length + boundary + 1 : Math.max(0, first - 100);
+  return text.slice(start, start + maxChars).trim();
+}
+
+// BM25 scores of the chunks matching any of the terms as [[ord, score]], best first
+async function bm25Rank(db, chatbotId, index, terms, k) {
+  const blocks = await db.collection('chatbot_postings')
+    .find({ chatbot_id: chatbotId, term: { $in: terms } }, { projection: { _id: 0, df: 1, postings: 1 } })
+    .toArray();
+
+  const scores = new Map();
+  const avgLength = index.avg_chunk_length || 1;
+  for (const { df, postings } of blocks) {
+    const idf = Math.log(1 + (index.chunks - df + 0.5) / (df + 0.5));
+    for (const [ord, tf, length] of postings) {
+      const score = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avgLength));
+      scores.set(ord, (scores.get(ord) || 0) + score);
+    }
+  }
+  return [...scores].sort((a, b) => b[1] - a[1] || a[0] - b[0]).slice(0, k);
+}
+
+// Top k chunks for the query as [{ ord, text, score }], best first. Scores
+// are BM25 for exact matches and cosine similarity for the vector fill-ins.
+// `index` is the chatbot's knowledge_index.
+export async function searchKnowledge(db, chatbotId, index, query, { k = 3 } = {}) {
+  const terms = [...new Set(tokenize(query))];
+  if (!terms.length || !index?.chunks) {
+    return [];
+  }
+
+  const [lexical, semantic] = await Promise.all([
+    bm25Rank(db, chatbotId, index, terms, k),
+    index.vectors ? vectorRank(db, chatbotId, index.vectors, terms, { k, minSimilarity: MIN_SIMILARITY }) : []
+  ]);
+  const found = new Set(lexical.map(([ord]) => ord));
+  const top = [...lexical, ...semantic.filter(([ord]) => !found.has(ord))].slice(0, k);
+  if (!top.length) {
+    return [];
+  }
+
+  const chunks = await db.collection('chatbot_chunks')
+    .find({ chatbot_id: chatbotId, ord: { $in: top.map(([ord]) => ord) } }, { projection: { _id: 0, ord: 1, text: 1 } })
+    .toArray();
+  const textByOrd = new Map(chunks.map(chunk => [chunk.ord, chunk.text]));
+
+  return top
+    .filter(([ord]) => textByOrd.has(ord))
+    .map(([ord, score]) => ({ ord, text: textByOrd.get(ord), score }));
+}
@@ -0,0 +1,417 @@
+// Local vector index over chatbot knowledge chunks.
+//
+// Chunks are embedded offline with hashed TF-IDF: each word and its light
+// stem are hashed into a fixed number of dimensions (signed, so collisions
+// cancel out on average), weighted by sublinear tf and IDF, and L2
+// normalized. No model or network call is needed, and stemming lets
+// "refunds" find "refund". A chunk only has nonzero weights in the few
+// hundred dimensions its words hash to, so the vectors of one chatbot are
+// stored sparse, in CSR form (per chunk: the offsets of its nonzeros, their
+// dimensions and weights), in chatbot_vectors, and kept decoded in a
+// size-bounded per-process cache. Cosine top-k is a pass over the nonzeros
+// of the chunks scanned.
+//
+// Knowledge bases with at least KNOWLEDGE_IVF_MIN_CHUNKS chunks also get an
+// IVF index: chunks are clustered with spherical k-means and stored grouped
+// by cluster, and a query only scans the KNOWLEDGE_IVF_PROBES clusters
+// nearest to it.
+//
+// Building is CPU work proportional to the knowledge base, so it pauses every
+// BUILD_SLICE chunks to let other requests on the event loop run.
+
+// Dimensions are stored as 16-bit indexes
+const DIMENSIONS = Math.min(65536, parseInt(process.env.KNOWLEDGE_VECTOR_DIM || '1024'));
+const IVF_MIN_CHUNKS = parseInt(process.env.KNOWLEDGE_IVF_MIN_CHUNKS || '1000');
+const IVF_PROBES = parseInt(process.env.KNOWLEDGE_IVF_PROBES || '8');
+const CACHE_BYTES = parseInt(process.env.KNOWLEDGE_VECTOR_CACHE_MB || '256') * 1024 * 1024;
+// 6 bytes each, so a stored block stays around 3MB
+const BLOCK_NONZEROS = 512 * 1024;
+const BUILD_SLICE = 64;
+const STEM_WEIGHT = 0.5;
+const KMEANS_ITERATIONS = 5;
+const KMEANS_SAMPLE_PER_LIST = 20;
+const DUPLICATE_KEY = 11000;
+
+export const VECTOR_FORMAT = 'csr';
+
+const SUFFIXES = ['ations', 'ation', 'ings', 'ing', 'ies', 'ied', 'ers', 'er', 'es', 'ed', 'ly', 's'];
+
+function stem(term) {
+  for (const suffix of SUFFIXES) {
+    if (term.endsWith(suffix) && term.length - suffix.length >= 3) {
+      return term.slice(0, -suffix.length);
+    }
+  }
+  return term;
+}
+
+function fnv1a(text) {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+// Hashed features of a token list as Map<dimension, signed weight>
+function hashFeatures(terms, dim) {
+  const features = new Map();
+  const add = (feature, weight) => {
+    const hash = fnv1a(feature);
+    const index = hash % dim;
+    const sign = hash & 0x80000000 ? -1 : 1;
+    features.set(index, (features.get(index) || 0) + sign * weight);
+  };
+  for (const term of terms) {
+    // Numbers are mostly unique, high-IDF noise that collides with real words
+    if (/^\d+$/.test(term)) continue;
+    add(term, 1);
+    add(`~${stem(term)}`, STEM_WEIGHT);
+  }
+  return features;
+}
+
+// Sublinear tf * idf, L2 normalized, as parallel index/value arrays
+function weigh(features, idf) {
+  const indexes = new Uint16Array(features.size);
+  const values = new Float32Array(features.size);
+  let count = 0;
+  let norm = 0;
+  for (const [index, raw] of features) {
+    const magnitude = Math.abs(raw);
+    const value = Math.sign(raw) * (magnitude < 1 ? magnitude : 1 + Math.log(magnitude)) * idf[index];
+    if (!value) continue;
+    indexes[count] = index;
+    values[count++] = value;
+    norm += value * value;
+  }
+  norm = Math.sqrt(norm) || 1;
+  for (let i = 0; i < count; i++) values[i] /= norm;
+  return { indexes: indexes.subarray(0, count), values: values.subarray(0, count) };
+}
+
+function pause() {
+  return new Promise(resolve => setImmediate(resolve));
+}
+
+// mulberry32: deterministic, so rebuilding the same knowledge base gives the
+// same clusters
+function seededRandom(seed) {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = Math.imul(state ^ (state >>> 15), state | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 0x100000000;
+  };
+}
+
+function nearestCentroid({ indexes, values }, centroids, lists, dim) {
+  let best = 0;
+  let bestScore = -Infinity;
+  for (let list = 0; list < lists; list++) {
+    let score = 0;
+    for (let i = 0; i < indexes.length; i++) {
+      score += values[i] * centroids[list * dim + indexes[i]];
+    }
+    if (score > bestScore) {
+      bestScore = score;
+      best = list;
+    }
+  }
+  return best;
+}
+
+// Spherical k-means over a sample of the (sparse) vectors, then every vector
+// is assigned to its nearest centroid. Chunks are returned grouped by list:
+// the chunks of list i are order[offsets[i]..offsets[i + 1]).
+async function buildIvf(vectors, dim) {
+  const rows = vectors.length;
+  const lists = Math.ceil(Math.sqrt(rows));
+  const random = seededRandom(rows);
+  const sample = [];
+  for (let i = 0; i < Math.min(rows, lists * KMEANS_SAMPLE_PER_LIST); i++) {
+    sample.push(vectors[Math.floor(random() * rows)]);
+  }
+
+  const centroids = new Float32Array(lists * dim);
+  for (let list = 0; list < lists; list++) {
+    const { indexes, values } = sample[list % sample.length];
+    indexes.forEach((index, i) => { centroids[list * dim + index] = values[i]; });
+  }
+  for (let iteration = 0; iteration < KMEANS_ITERATIONS; iteration++) {
+    const sums = new Float32Array(lists * dim);
+    for (let i = 0; i < sample.length; i++) {
+      if (i % BUILD_SLICE === 0) await pause();
+      const vector = sample[i];
+      const list = nearestCentroid(vector, centroids, lists, dim);
+      vector.indexes.forEach((index, j) => { sums[list * dim + index] += vector.values[j]; });
+    }
+    for (let list = 0; list < lists; list++) {
+      let norm = 0;
+      for (let d = 0; d < dim; d++) norm += sums[list * dim + d] ** 2;
+      // An empty cluster keeps its previous centroid
+      if (!norm) continue;
+      norm = Math.sqrt(norm);
+      for (let d = 0; d < dim; d++) centroids[list * dim + d] = sums[list * dim + d] / norm;
+    }
+  }
+
+  const assignment = new Int32Array(rows);
+  const sizes = new Int32Array(lists);
+  for (let row = 0; row < rows; row++) {
+    if (row % BUILD_SLICE === 0) await pause();
+    assignment[row] = nearestCentroid(vectors[row], centroids, lists, dim);
+    sizes[assignment[row]]++;
+  }
+  const offsets = new Int32Array(lists + 1);
+  for (let list = 0; list < lists; list++) offsets[list + 1] = offsets[list] + sizes[list];
+  const next = offsets.slice(0, lists);
+  const order = new Int32Array(rows);
+  for (let row = 0; row < rows; row++) order[next[assignment[row]]++] = row;
+
+  return { lists, centroids, order, offsets };
+}
+
+function toBuffer(typedArray) {
+  return Buffer.from(typedArray.buffer, typedArray.byteOffset, typedArray.byteLength);
+}
+
+// Binary fields come back as bson Binary; copy out so the view is aligned
+function fromBinary(value, Type) {
+  const bytes = value instanceof Uint8Array ? value : value.buffer;
+  return new Type(bytes.buffer.slice(bytes.byteOffset, bytes.byteOffset + bytes.byteLength));
+}
+
+// Packs the vectors, in the given order, into CSR arrays: the nonzeros of
+// the chunk at position p are indices/weights[offsets[p]..offsets[p + 1])
+function toCsr(vectors, order) {
+  const offsets = new Uint32Array(vectors.length + 1);
+  for (let position = 0; position < vectors.length; position++) {
+    const row = order ? order[position] : position;
+    offsets[position + 1] = offsets[position] + vectors[row].indexes.length;
+  }
+  const indices = new Uint16Array(offsets[vectors.length]);
+  const weights = new Float32Array(offsets[vectors.length]);
+  for (let position = 0; position < vectors.length; position++) {
+    const { indexes, values } = vectors[order ? order[position] : position];
+    indices.set(indexes, offsets[position]);
+    weights.set(values, offsets[position]);
+  }
+  return { offsets, indices, weights };
+}
+
+// Splits the CSR arrays into documents of whole chunks, each holding up to
+// BLOCK_NONZEROS nonzeros (or one larger chunk)
+function csrDocuments(chatbotId, { offsets, indices, weights }) {
+  const documents = [];
+  const rows = offsets.length - 1;
+  let start = 0;
+  while (start < rows) {
+    let end = start + 1;
+    while (end < rows && offsets[end + 1] - offsets[start] <= BLOCK_NONZEROS) end++;
+    documents.push({
+      chatbot_id: chatbotId,
+      kind: 'rows',
+      block: documents.length,
+      start,
+      offsets: toBuffer(offsets.slice(start, end + 1).map(offset => offset - offsets[start])),
+      indices: toBuffer(indices.subarray(offsets[start], offsets[end])),
+      weights: toBuffer(weights.subarray(offsets[start], offsets[end]))
+    });
+    start = end;
+  }
+  return documents;
+}
+
+// Embeds the tokenized chunks (in chunk order) and stores the vectors,
+// replacing any previous ones. Returns the summary kept in the chatbot's
+// knowledge_index.vectors.
+export async function buildVectorIndex(db, chatbotId, tokenizedChunks) {
+  const dim = DIMENSIONS;
+  const rows = tokenizedChunks.length;
+  const features = [];
+  const df = new Float32Array(dim);
+  for (let row = 0; row < rows; row++) {
+    if (row % BUILD_SLICE === 0) await pause();
+    const chunkFeatures = hashFeatures(tokenizedChunks[row], dim);
+    for (const index of chunkFeatures.keys()) df[index]++;
+    features.push(chunkFeatures);
+  }
+  // Dimensions no chunk uses get no weight, so query words the knowledge base
+  // doesn't contain don't dilute the query vector
+  const idf = df.map(count => count ? Math.log((1 + rows) / (1 + count)) + 1 : 0);
+  const vectors = [];
+  for (let row = 0; row < rows; row++) {
+    if (row % BUILD_SLICE === 0) await pause();
+    vectors.push(weigh(features[row], idf));
+    features[row] = null;
+  }
+
+  // Chunks in IVF list order when there is an index
+  const ivf = rows >= IVF_MIN_CHUNKS ? await buildIvf(vectors, dim) : null;
+  const csr = toCsr(vectors, ivf?.order);
+
+  const documents = csrDocuments(chatbotId, csr);
+  documents.push({ chatbot_id: chatbotId, kind: 'idf', block: 0, data: toBuffer(idf) });
+  if (ivf) {
+    documents.push({
+      chatbot_id: chatbotId,
+      kind: 'ivf',
+      block: 0,
+      lists: ivf.lists,
+      centroids: toBuffer(ivf.centroids),
+      order: toBuffer(ivf.order),
+      offsets: toBuffer(ivf.offsets)
+    });
+  }
+
+  const collection = db.collection('chatbot_vectors');
+  await collection.deleteMany({ chatbot_id: chatbotId });
+  if (rows) {
+    try {
+      await collection.insertMany(documents, { ordered: false });
+    } catch (error) {
+      // Another process rebuilding the same chatbot wrote these (identical)
+      // documents first; anything else is a real failure
+      const errors = error.writeErrors ? [].concat(error.writeErrors) : [error];
+      if (!errors.length || errors.some(writeError => writeError.code !== DUPLICATE_KEY)) throw error;
+    }
+  }
+
+  const builtAt = new Date();
+  remember(`${chatbotId}:${builtAt.getTime()}`, { dim, rows, ...csr, idf, ivf });
+  return {
+    model: 'hashed-tfidf',
+    format: VECTOR_FORMAT,
+    dim,
+    rows,
+    nonzeros: csr.indices.length,
+    ivf_lists: ivf ? ivf.lists : 0,
+    built_at: builtAt
+  };
+}
+
+// Decoded vectors by chatbot and build, least recently used first
+const cache = new Map();
+let cachedBytes = 0;
+
+function entryBytes(entry) {
+  return entry.offsets.byteLength + entry.indices.byteLength + entry.weights.byteLength + entry.idf.byteLength +
+    (entry.ivf ? entry.ivf.centroids.byteLength + entry.ivf.order.byteLength : 0);
+}
+
+function remember(key, entry) {
+  if (cache.has(key)) {
+    cachedBytes -= entryBytes(cache.get(key));
+    cache.delete(key);
+  }
+  cache.set(key, entry);
+  cachedBytes += entryBytes(entry);
+  while (cachedBytes > CACHE_BYTES && cache.size > 1) {
+    const [oldest, evicted] = cache.entries().next().value;
+    cache.delete(oldest);
+    cachedBytes -= entryBytes(evicted);
+  }
+}
+
+const loading = new Map();
+
+async function loadVectors(db, chatbotId, summary) {
+  const key = `${chatbotId}:${new Date(summary.built_at).getTime()}`;
+  if (cache.has(key)) {
+    const entry = cache.get(key);
+    cache.delete(key);
+    cache.set(key, entry);
+    return entry;
+  }
+  if (!loading.has(key)) {
+    const load = (async () => {
+      const documents = await db.collection('chatbot_vectors')
+        .find({ chatbot_id: chatbotId }, { projection: { _id: 0 } })
+        .sort({ kind: 1, block: 1 })
+        .toArray();
+      const { dim, rows, nonzeros } = summary;
+      const offsets = new Uint32Array(rows + 1);
+      const indices = new Uint16Array(nonzeros);
+      const weights = new Float32Array(nonzeros);
+      let idf = null;
+      let ivf = null;
+      for (const document of documents) {
+        if (document.kind === 'rows') {
+          // Block offsets count from the block's first nonzero; the chunks
+          // before it are in earlier blocks, which come first
+          const blockOffsets = fromBinary(document.offsets, Uint32Array);
+          const base = offsets[document.start];
+          for (let i = 1; i < blockOffsets.length; i++) {
+            offsets[document.start + i] = base + blockOffsets[i];
+          }
+          indices.set(fromBinary(document.indices, Uint16Array), base);
+          weights.set(fromBinary(document.weights, Float32Array), base);
+        } else if (document.kind === 'idf') {
+          idf = fromBinary(document.data, Float32Array);
+        } else if (document.kind === 'ivf') {
+          ivf = {
+            lists: document.lists,
+            centroids: fromBinary(document.centroids, Float32Array),
+            order: fromBinary(document.order, Int32Array),
+            offsets: fromBinary(document.offsets, Int32Array)
+          };
+        }
+      }
+      if (!idf) {
+        throw new Error(`No vectors stored for chatbot ${chatbotId}`);
+      }
+      const entry = { dim, rows, offsets, indices, weights, idf, ivf };
+      remember(key, entry);
+      return entry;
+    })().finally(() => loading.delete(key));
+    loading.set(key, load);
+  }
+  return loading.get(key);
+}
+
+// Top k chunks by cosine similarity as [[ord, similarity]], best first.
+// `summary` is knowledge_index.vectors.
+export async function vectorRank(db, chatbotId, summary, queryTerms, { k = 3, minSimilarity = 0 } = {}) {
+  if (!summary?.rows || summary.format !== VECTOR_FORMAT || !queryTerms.length) {
+    return [];
+  }
+  const { dim, rows, offsets, indices, weights, idf, ivf } = await loadVectors(db, chatbotId, summary);
+  const query = weigh(hashFeatures(queryTerms, dim), idf);
+  if (!query.indexes.length) {
+    return [];
+  }
+  const queryWeights = new Float32Array(dim);
+  query.indexes.forEach((index, i) => { queryWeights[index] = query.values[i]; });
+
+  // Position ranges to scan: everything, or the lists nearest to the query
+  let ranges = [[0, rows]];
+  if (ivf) {
+    const centroidScores = [];
+    for (let list = 0; list < ivf.lists; list++) {
+      let score = 0;
+      query.indexes.forEach((index, i) => { score += ivf.centroids[list * dim + index] * query.values[i]; });
+      centroidScores.push([list, score]);
+    }
+    centroidScores.sort((a, b) => b[1] - a[1]);
+    ranges = centroidScores.slice(0, IVF_PROBES).map(([list]) => [ivf.offsets[list], ivf.offsets[list + 1]]);
+  }
+
+  const top = [];
+  for (const [start, end] of ranges) {
+    for (let position = start; position < end; position++) {
+      let score = 0;
+      for (let i = offsets[position]; i < offsets[position + 1]; i++) {
+        score += weights[i] * queryWeights[indices[i]];
+      }
+      if (score <= minSimilarity || (top.length === k && score <= top[k - 1][1])) continue;
+      let at = top.length;
+      while (at > 0 && top[at - 1][1] < score) at--;
+      top.splice(at, 0, [position, score]);
+      if (top.length > k) top.pop();
+    }
+  }
+  return top.map(([position, score]) => [ivf ? ivf.order[position] : position, score]);
+}
@@ -0,0 +1,5 @@
+// Base URLs for the LLM provider APIs. Override them to point the agents and
+// builders at a local stub (see tests/llm_stub_server.py) for offline runs.
+export const OPENAI_BASE_URL = process.env.OPENAI_BASE_URL || 'https://api.openai.com';
+export const ANTHROPIC_BASE_URL = process.env.ANTHROPIC_BASE_URL || 'https://api.anthropic.com';
+export const GEMINI_BASE_URL = process.env.GEMINI_BASE_URL || 'https://generativelanguage.googleapis.com';
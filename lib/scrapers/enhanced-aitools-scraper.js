@@ -1,10 +1,14 @@
-import axios from 'axios';
 import * as cheerio from 'cheerio';
 import { v4 as uuidv4 } from 'uuid';
+import FetchPool from './fetch-pool';
 
 export class EnhancedAiToolsScraper {
-  constructor() {
-    this.baseUrl = 'https://aitools.fyi';
+  constructor(options = {}) {
+    this.baseUrl = options.baseUrl || process.env.AITOOLS_BASE_URL || 'https://aitools.fyi';
+    // Concurrency, per-host rate limit, retries and timeouts for page fetches
+    this.pool = options.pool || new FetchPool(options.fetch);
+    // Optional PageCache: pages unchanged since the last sync are skipped
+    this.pageCache = options.pageCache || null;
     this.categories = [
       'image-generation', 'web-apps', 'marketing', 'analytics', 'education',
       'social-media-assistant', 'shopify-apps', 'sales', 'chat-bot', 'audio-generation',
@@ -111,16 +115,22 @@ export class EnhancedAiToolsScraper {
       console.log(`Scraping category: ${category}`);
       
       const url = `${this.baseUrl}/${category}`;
-      const response = await axios.get(url, {
+      const request = {
         headers: {
           'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
           'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
           'Accept-Language': 'en-US,en;q=0.5',
           'Accept-Encoding': 'gzip, deflate',
           'Connection': 'keep-alive',
-        },
-        timeout: 15000
-      });
+        }
+      };
+      const response = this.pageCache
+        ? await this.pageCache.fetch(this.pool, url, request)
+        : await this.pool.get(url, request);
+      if (!response) {
+        console.log(`Unchanged since last sync: ${url}`);
+        return tools;
+      }
 
       const $ = cheerio.load(response.data);
       
@@ -277,33 +287,20 @@ export class EnhancedAiToolsScraper {
     const trendingTools = await this.scrapeGoogleTrendingAI();
     allTools.push(...trendingTools);
     
-    // Process categories in batches to avoid overwhelming the server
-    const batchSize = 5;
-    for (let i = 0; i < this.categories.length; i += batchSize) {
-      const batch = this.categories.slice(i, i + batchSize);
-      
-      const batchPromises = batch.map(async (category) => {
-        try {
-          const categoryTools = await this.scrapeCategory(category, maxToolsPerCategory);
-          return categoryTools;
-        } catch (error) {
-          console.error(`Failed to scrape category ${category}:`, error.message);
-          return [];
-        }
-      });
-      
-      const batchResults = await Promise.all(batchPromises);
-      batchResults.forEach(categoryTools => {
-        allTools.push(...categoryTools);
-      });
-      
-      // Add delay between batches to be respectful
-      if (i + batchSize < this.categories.length) {
-        await new Promise(resolve => setTimeout(resolve, 2000));
+    await this.pageCache?.load(this.categories.map(category => `${this.baseUrl}/${category}`));
+    
+    // All categories are queued at once; the fetch pool paces them per host
+    const categoryResults = await Promise.all(this.categories.map(async (category) => {
+      try {
+        return await this.scrapeCategory(category, maxToolsPerCategory);
+      } catch (error) {
+        console.error(`Failed to scrape category ${category}:`, error.message);
+        return [];
       }
-      
-      console.log(`Completed batch ${Math.floor(i / batchSize) + 1}/${Math.ceil(this.categories.length / batchSize)}`);
-    }
+    }));
+    categoryResults.forEach(categoryTools => {
+      allTools.push(...categoryTools);
+    });
     
     // Remove duplicates based on name similarity
     const uniqueTools = [];
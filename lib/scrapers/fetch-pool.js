@@ -0,0 +1,151 @@
+import axios from 'axios';
+
+// Shared page fetcher for the scrapers.
+//
+// Pages are fetched concurrently up to a fixed number of requests in flight,
+// while a token bucket per host caps how fast any one site is hit. This
+// replaces the fixed sleeps between pages: a scrape takes about as long as the
+// rate limit allows instead of the sum of every page's latency plus delays.
+// 429 and 5xx responses, timeouts and connection errors are retried with
+// jittered exponential backoff, honouring Retry-After when the server sends it.
+
+const DEFAULTS = {
+  concurrency: parseInt(process.env.SCRAPER_CONCURRENCY || '4'),
+  ratePerHost: parseFloat(process.env.SCRAPER_RATE_PER_HOST || '2'),
+  burst: parseInt(process.env.SCRAPER_BURST || '2'),
+  retries: 3,
+  backoffBaseMs: 500,
+  backoffMaxMs: 10000,
+  timeoutMs: 20000
+};
+
+const RETRYABLE_CODES = new Set(['ECONNRESET', 'ECONNREFUSED', 'ETIMEDOUT', 'ECONNABORTED', 'EAI_AGAIN', 'ERR_CANCELED']);
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+class TokenBucket {
+  constructor(ratePerSecond, burst) {
+    this.rate = ratePerSecond;
+    this.capacity = Math.max(1, burst);
+    this.tokens = this.capacity;
+    this.updated = Date.now();
+    this.queue = Promise.resolve();
+  }
+
+  refill() {
+    const now = Date.now();
+    this.tokens = Math.min(this.capacity, this.tokens + (now - this.updated) / 1000 * this.rate);
+    this.updated = now;
+  }
+
+  // Resolves with the time spent waiting once a token is available; callers
+  // are served in arrival order
+  take() {
+    const started = Date.now();
+    const turn = this.queue.then(async () => {
+      this.refill();
+      while (this.tokens < 1) {
+        await sleep((1 - this.tokens) / this.rate * 1000);
+        this.refill();
+      }
+      this.tokens -= 1;
+      return Date.now() - started;
+    });
+    this.queue = turn;
+    return turn;
+  }
+}
+
+function isRetryable(error) {
+  const status = error.response?.status;
+  if (status) {
+    return status === 429 || status >= 500;
+  }
+  return RETRYABLE_CODES.has(error.code);
+}
+
+function retryAfterMs(error) {
+  const header = error.response?.headers?.['retry-after'];
+  if (!header) return null;
+  const seconds = Number(header);
+  if (!Number.isNaN(seconds)) return seconds * 1000;
+  const date = Date.parse(header);
+  return Number.isNaN(date) ? null : Math.max(0, date - Date.now());
+}
+
+export class FetchPool {
+  constructor(options = {}) {
+    this.options = { ...DEFAULTS, ...options };
+    this.buckets = new Map();
+    this.active = 0;
+    this.waiting = [];
+    this.stats = { requests: 0, retries: 0, failures: 0, rate_wait_ms: 0 };
+  }
+
+  bucketFor(url) {
+    const host = new URL(url).host;
+    if (!this.buckets.has(host)) {
+      this.buckets.set(host, new TokenBucket(this.options.ratePerHost, this.options.burst));
+    }
+    return this.buckets.get(host);
+  }
+
+  async acquire() {
+    if (this.active < this.options.concurrency) {
+      this.active++;
+      return;
+    }
+    // release() hands its slot straight to the next waiter
+    await new Promise(resolve => this.waiting.push(resolve));
+  }
+
+  release() {
+    const next = this.waiting.shift();
+    if (next) {
+      next();
+    } else {
+      this.active--;
+    }
+  }
+
+  backoffMs(attempt, error) {
+    const ceiling = Math.min(this.options.backoffMaxMs, this.options.backoffBaseMs * 2 ** attempt);
+    const jittered = Math.random() * ceiling;
+    const requested = retryAfterMs(error);
+    return requested === null ? jittered : Math.min(this.options.backoffMaxMs, Math.max(requested, jittered));
+  }
+
+  // axios.get with pooling, rate limiting, a hard per-page deadline and retries
+  async get(url, config = {}) {
+    const bucket = this.bucketFor(url);
+    for (let attempt = 0; ; attempt++) {
+      // Wait for the host's rate limit before taking a slot, so pages for
+      // other hosts can use the slot meanwhile
+      this.stats.rate_wait_ms += await bucket.take();
+      await this.acquire();
+      let error;
+      try {
+        this.stats.requests++;
+        return await axios.get(url, {
+          ...config,
+          timeout: this.options.timeoutMs,
+          signal: AbortSignal.timeout(this.options.timeoutMs)
+        });
+      } catch (caught) {
+        error = caught;
+      } finally {
+        this.release();
+      }
+
+      if (attempt >= this.options.retries || !isRetryable(error)) {
+        this.stats.failures++;
+        throw error;
+      }
+      this.stats.retries++;
+      // Back off without holding a slot, so other hosts' pages keep moving
+      await sleep(this.backoffMs(attempt, error));
+    }
+  }
+}
+
+export default FetchPool;
@@ -0,0 +1,95 @@
+import { createHash } from 'crypto';
+
+// Remembers what each scraped page looked like on the last successful sync.
+//
+// Requests carry If-None-Match / If-Modified-Since from the stored ETag and
+// Last-Modified, and a 200 whose body hashes the same as last time counts as
+// unchanged too. Either way fetch() returns null and the scraper skips
+// parsing the page, so its tools never reach the database. New validators
+// and hashes are only staged by fetch(); commit() persists them once the
+// sync has written the page's tools, so a failed sync refetches everything.
+
+// Used when no collection is given: kept for the life of the process
+const memoryEntries = new Map();
+
+function contentHash(data) {
+  const body = typeof data === 'string' ? data : JSON.stringify(data);
+  return createHash('sha256').update(body).digest('hex');
+}
+
+export class PageCache {
+  constructor(collection = null) {
+    this.collection = collection;
+    this.entries = collection ? new Map() : memoryEntries;
+    this.staged = new Map();
+    this.stats = { changed: 0, not_modified: 0, unchanged: 0 };
+  }
+
+  // Loads the entries for a whole scrape in one query
+  async load(urls) {
+    if (!this.collection) return;
+    const pages = await this.collection.find({ url: { $in: urls } }).toArray();
+    for (const url of urls) {
+      this.entries.set(url, null);
+    }
+    for (const page of pages) {
+      this.entries.set(page.url, page);
+    }
+  }
+
+  async lookup(url) {
+    if (!this.entries.has(url) && this.collection) {
+      this.entries.set(url, await this.collection.findOne({ url }));
+    }
+    return this.entries.get(url) || null;
+  }
+
+  // pool.get() with validators; returns the response, or null when the page
+  // is the same as on the last sync
+  async fetch(pool, url, config = {}) {
+    const entry = await this.lookup(url);
+    const headers = { ...config.headers };
+    if (entry?.etag) headers['If-None-Match'] = entry.etag;
+    if (entry?.last_modified) headers['If-Modified-Since'] = entry.last_modified;
+
+    const response = await pool.get(url, {
+      ...config,
+      headers,
+      validateStatus: status => (status >= 200 && status < 300) || status === 304
+    });
+    if (response.status === 304) {
+      this.stats.not_modified++;
+      return null;
+    }
+
+    const hash = contentHash(response.data);
+    this.staged.set(url, {
+      url,
+      etag: response.headers.etag || null,
+      last_modified: response.headers['last-modified'] || null,
+      content_hash: hash,
+      fetched_at: new Date()
+    });
+    if (entry && entry.content_hash === hash) {
+      this.stats.unchanged++;
+      return null;
+    }
+    this.stats.changed++;
+    return response;
+  }
+
+  async commit() {
+    const pages = [...this.staged.values()];
+    this.staged.clear();
+    for (const page of pages) {
+      this.entries.set(page.url, page);
+    }
+    if (this.collection && pages.length) {
+      await this.collection.bulkWrite(pages.map(page => ({
+        updateOne: { filter: { url: page.url }, update: { $set: page }, upsert: true }
+      })), { ordered: false });
+    }
+  }
+}
+
+export default PageCache;
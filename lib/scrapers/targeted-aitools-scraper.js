@@ -1,36 +1,43 @@
-import axios from 'axios';
 import * as cheerio from 'cheerio';
 import { v4 as uuidv4 } from 'uuid';
+import FetchPool from './fetch-pool';
 
 export class TargetedAiToolsScraper {
-  constructor() {
-    this.baseUrl = 'https://aitools.fyi';
+  constructor(options = {}) {
+    // AITOOLS_BASE_URL points the scraper at a recorded corpus (tests/aitools_fixture_server.py)
+    this.baseUrl = options.baseUrl || process.env.AITOOLS_BASE_URL || 'https://aitools.fyi';
+    // Concurrency, per-host rate limit, retries and timeouts for page fetches
+    this.pool = options.pool || new FetchPool(options.fetch);
+    // Optional PageCache: pages unchanged since the last sync are skipped
+    this.pageCache = options.pageCache || null;
+    // Called with { pages_done, pages_total } as pages finish
+    this.onProgress = options.onProgress || (() => {});
     this.targetUrls = [
-      'https://aitools.fyi/category/ai-image-generation',
-      'https://aitools.fyi/category/ai-web-apps',
-      'https://aitools.fyi/category/ai-marketing',
-      'https://aitools.fyi/category/ai-analytics',
-      'https://aitools.fyi/',
-      'https://aitools.fyi/category/ai-content-creation',
-      'https://aitools.fyi/category/ai-productivity',
-      'https://aitools.fyi/category/ai-writing',
-      'https://aitools.fyi/category/ai-video',
-      'https://aitools.fyi/category/ai-audio',
-      'https://aitools.fyi/category/ai-code',
-      'https://aitools.fyi/category/ai-design',
-      'https://aitools.fyi/category/ai-automation',
-      'https://aitools.fyi/category/ai-sales',
-      'https://aitools.fyi/category/ai-email',
-      'https://aitools.fyi/category/ai-social-media',
-      'https://aitools.fyi/category/ai-seo',
-      'https://aitools.fyi/category/ai-customer-support',
-      'https://aitools.fyi/category/ai-finance',
-      'https://aitools.fyi/category/ai-health'
-    ];
+      '/category/ai-image-generation',
+      '/category/ai-web-apps',
+      '/category/ai-marketing',
+      '/category/ai-analytics',
+      '/',
+      '/category/ai-content-creation',
+      '/category/ai-productivity',
+      '/category/ai-writing',
+      '/category/ai-video',
+      '/category/ai-audio',
+      '/category/ai-code',
+      '/category/ai-design',
+      '/category/ai-automation',
+      '/category/ai-sales',
+      '/category/ai-email',
+      '/category/ai-social-media',
+      '/category/ai-seo',
+      '/category/ai-customer-support',
+      '/category/ai-finance',
+      '/category/ai-health'
+    ].map(path => `${this.baseUrl}${path}`);
   }
 
   extractCategoryFromUrl(url) {
-    if (url === 'https://aitools.fyi/') return 'Featured';
+    if (url === `${this.baseUrl}/`) return 'Featured';
     
     const match = url.match(/\/category\/ai-(.+)$/);
     if (match) {
@@ -48,7 +55,7 @@ export class TargetedAiToolsScraper {
     try {
       console.log(`Scraping: ${url} for ${category} tools`);
       
-      const response = await axios.get(url, {
+      const request = {
         headers: {
           'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
           'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -61,9 +68,15 @@ export class TargetedAiToolsScraper {
           'Sec-Fetch-Site': 'none',
           'Cache-Control': 'max-age=0',
         },
-        timeout: 30000,
         maxRedirects: 5
-      });
+      };
+      const response = this.pageCache
+        ? await this.pageCache.fetch(this.pool, url, request)
+        : await this.pool.get(url, request);
+      if (!response) {
+        console.log(`Unchanged since last sync: ${url}`);
+        return tools;
+      }
 
       const $ = cheerio.load(response.data);
       
@@ -230,26 +243,23 @@ export class TargetedAiToolsScraper {
   }
 
   async scrapeAllTargetPages() {
-    const allTools = [];
     console.log(`Starting targeted scraping of ${this.targetUrls.length} specific pages...`);
+    await this.pageCache?.load(this.targetUrls);
     
-    for (let i = 0; i < this.targetUrls.length; i++) {
-      const url = this.targetUrls[i];
-      
+    // All pages are queued at once; the fetch pool paces them per host
+    let completed = 0;
+    const pageResults = await Promise.all(this.targetUrls.map(async (url) => {
       try {
         const tools = await this.scrapeSpecificPage(url, 25); // 25 tools per page
-        allTools.push(...tools);
-        
-        console.log(`Completed ${i + 1}/${this.targetUrls.length}: ${url} - ${tools.length} tools`);
-        
-        // Add delay between requests
-        if (i < this.targetUrls.length - 1) {
-          await new Promise(resolve => setTimeout(resolve, 2000));
-        }
+        console.log(`Completed ${++completed}/${this.targetUrls.length}: ${url} - ${tools.length} tools`);
+        this.onProgress({ pages_done: completed, pages_total: this.targetUrls.length });
+        return tools;
       } catch (error) {
         console.error(`Failed to scrape ${url}:`, error.message);
+        return [];
       }
-    }
+    }));
+    const allTools = pageResults.flat();
     
     // Remove duplicates based on name similarity
     const uniqueTools = [];
@@ -270,18 +280,13 @@ export class TargetedAiToolsScraper {
   async getQuickSample() {
     // Quick sample from main pages for testing
     const quickUrls = [
-      'https://aitools.fyi/',
-      'https://aitools.fyi/category/ai-image-generation',
-      'https://aitools.fyi/category/ai-marketing'
-    ];
-    
-    const allTools = [];
-    for (const url of quickUrls) {
-      const tools = await this.scrapeSpecificPage(url, 10);
-      allTools.push(...tools);
-    }
+      '/',
+      '/category/ai-image-generation',
+      '/category/ai-marketing'
+    ].map(path => `${this.baseUrl}${path}`);
     
-    return allTools;
+    const pageResults = await Promise.all(quickUrls.map(url => this.scrapeSpecificPage(url, 10)));
+    return pageResults.flat();
   }
 }
 
@@ -0,0 +1,122 @@
+import { MongoBulkWriteError } from 'mongodb';
+
+// Bulk ingestion for the ai-tools sync endpoints.
+//
+// A scrape batch becomes one unordered bulkWrite of upserts, keyed on the
+// tool's natural key: ph_id for Product Hunt launches, otherwise the
+// normalized name plus source. Each upsert is an update pipeline that only
+// rewrites tracked fields and only bumps updated_at when one of them actually
+// differs, so the bulk result gives exact inserted/updated/unchanged counts.
+
+// Set when a tool is first inserted and left alone afterwards
+const INSERT_ONLY = ['id', 'created_at'];
+
+// Fields the scrapers make up on every run rather than read from the page
+export const SCRAPED_INSERT_ONLY = ['featured_at', 'rating', 'votes'];
+// transformPHToolToDBFormat picks a random rating
+export const PRODUCT_HUNT_INSERT_ONLY = ['rating'];
+
+export function normalizeName(name) {
+  return name.normalize('NFKC').trim().replace(/\s+/g, ' ').toLowerCase();
+}
+
+export function naturalKey(tool) {
+  if (tool.ph_id) {
+    return { ph_id: tool.ph_id };
+  }
+  return { name_key: normalizeName(tool.name), source: tool.source };
+}
+
+function upsertOperation(tool, insertOnly, now) {
+  const filter = naturalKey(tool);
+  const document = { ...tool, ...filter };
+  delete document._id;
+  delete document.updated_at;
+
+  const tracked = {};
+  const firstSeen = {};
+  for (const [field, value] of Object.entries(document)) {
+    if (value === undefined) continue;
+    if (insertOnly.includes(field)) {
+      firstSeen[field] = { $ifNull: [`$${field}`, { $literal: value }] };
+    } else {
+      tracked[field] = { $literal: value };
+    }
+  }
+  // Every expression in a $set stage sees the stored document, so this
+  // compares against the values from before the write
+  const changed = { $or: Object.entries(tracked).map(([field, value]) => ({ $ne: [`$${field}`, value] })) };
+
+  return {
+    updateOne: {
+      filter,
+      update: [{
+        $set: {
+          ...tracked,
+          ...firstSeen,
+          updated_at: { $cond: [changed, { $literal: now }, { $ifNull: ['$updated_at', { $literal: now }] }] }
+        }
+      }],
+      upsert: true
+    }
+  };
+}
+
+// Upserts a batch of tools; returns { inserted, updated, unchanged, failed }
+export async function ingestTools(collection, tools, { insertOnly = [] } = {}) {
+  const counts = { inserted: 0, updated: 0, unchanged: 0, failed: 0 };
+  if (!tools.length) {
+    return counts;
+  }
+
+  // Two upserts for the same key in one unordered batch would race each
+  // other into a duplicate key error, so the last copy of a tool wins
+  const byKey = new Map();
+  for (const tool of tools) {
+    byKey.set(JSON.stringify(naturalKey(tool)), tool);
+  }
+
+  const now = new Date();
+  const fields = [...INSERT_ONLY, ...insertOnly];
+  const operations = [...byKey.values()].map((tool) => upsertOperation(tool, fields, now));
+
+  let result;
+  try {
+    result = await collection.bulkWrite(operations, { ordered: false });
+  } catch (error) {
+    if (!(error instanceof MongoBulkWriteError)) {
+      throw error;
+    }
+    // Unordered: everything but the failed operations was applied
+    console.error(`Bulk ingest: ${error.writeErrors.length} of ${operations.length} writes failed:`, error.message);
+    result = error.result;
+    counts.failed = error.writeErrors.length;
+  }
+
+  counts.inserted = result.upsertedCount;
+  counts.updated = result.modifiedCount;
+  counts.unchanged = result.matchedCount - result.modifiedCount;
+  return counts;
+}
+
+// Gives tools stored before name_key existed their key, so upserts find them
+// instead of inserting duplicates. Product Hunt tools are keyed on ph_id.
+export async function backfillNameKeys(collection, batchSize = 1000) {
+  const cursor = collection.find(
+    { name_key: { $exists: false }, ph_id: { $exists: false }, name: { $type: 'string' } },
+    { projection: { name: 1 } }
+  );
+  let updated = 0;
+  let batch = [];
+  for await (const tool of cursor) {
+    batch.push({ updateOne: { filter: { _id: tool._id }, update: { $set: { name_key: normalizeName(tool.name) } } } });
+    if (batch.length === batchSize) {
+      updated += (await collection.bulkWrite(batch, { ordered: false })).modifiedCount;
+      batch = [];
+    }
+  }
+  if (batch.length) {
+    updated += (await collection.bulkWrite(batch, { ordered: false })).modifiedCount;
+  }
+  return updated;
+}
@@ -0,0 +1,108 @@
+import { ObjectId } from 'mongodb';
+
+// Keyset pagination for GET /api/ai-tools.
+//
+// A cursor records the sort value and _id of the last tool on a page; the
+// next page continues strictly after that position, so it costs the same at
+// page 1000 as at page 2. _id breaks ties, giving every tool a unique
+// position even when many share a vote count or date. Relevance order comes
+// from the text score, which cannot be filtered on, so its cursor holds an
+// offset instead.
+
+export const SORT_MODES = {
+  featured_at: { field: 'featured_at', direction: -1, type: 'date' },
+  votes: { field: 'votes', direction: -1, type: 'number' },
+  name: { field: 'name', direction: 1, type: 'string' },
+  rating: { field: 'rating', direction: -1, type: 'number' }
+};
+
+export const DEFAULT_SORT = 'featured_at';
+
+// Text-score order, only available with a search query
+export const RELEVANCE = 'relevance';
+
+export function sortSpec(mode) {
+  const { field, direction } = SORT_MODES[mode] || SORT_MODES[DEFAULT_SORT];
+  return { [field]: direction, _id: direction };
+}
+
+function encode(payload) {
+  return Buffer.from(JSON.stringify(payload)).toString('base64url');
+}
+
+export function encodeCursor(mode, lastTool) {
+  const { field } = SORT_MODES[mode];
+  const value = lastTool[field];
+  return encode({
+    m: mode,
+    v: value instanceof Date ? { $date: value.toISOString() } : (value ?? null),
+    id: lastTool._id.toHexString()
+  });
+}
+
+export function encodeOffsetCursor(mode, offset) {
+  return encode({ m: mode, o: offset });
+}
+
+// Throws on anything that is not a cursor produced above
+export function decodeCursor(text) {
+  let payload;
+  try {
+    payload = JSON.parse(Buffer.from(text, 'base64url').toString('utf8'));
+  } catch (error) {
+    throw new Error('Invalid cursor');
+  }
+  if (!payload || (payload.m !== RELEVANCE && !Object.hasOwn(SORT_MODES, payload.m))) {
+    throw new Error('Invalid cursor');
+  }
+  // Only relevance order pages by offset
+  if (payload.m === RELEVANCE) {
+    if (!Number.isInteger(payload.o) || payload.o < 0) throw new Error('Invalid cursor');
+    return { mode: payload.m, offset: payload.o };
+  }
+  if (!ObjectId.isValid(payload.id) || !('v' in payload)) {
+    throw new Error('Invalid cursor');
+  }
+  return { mode: payload.m, value: decodeValue(SORT_MODES[payload.m].type, payload.v), id: new ObjectId(payload.id) };
+}
+
+// The cursor's sort value, checked against the field's type: it goes into
+// the listing query, so anything else (an operator object, say) is rejected
+function decodeValue(type, value) {
+  if (value === null) {
+    return null;
+  }
+  if (type === 'date') {
+    const date = value && typeof value === 'object' && typeof value.$date === 'string' && Object.keys(value).length === 1
+      ? new Date(value.$date)
+      : null;
+    if (!date || Number.isNaN(date.getTime())) throw new Error('Invalid cursor');
+    return date;
+  }
+  if (type === 'number' ? !Number.isFinite(value) : typeof value !== type) {
+    throw new Error('Invalid cursor');
+  }
+  return value;
+}
+
+// Filter matching the tools that sort after the cursor position. Missing
+// values sort lowest in MongoDB: last in descending order, first in
+// ascending order.
+export function keysetFilter(cursor) {
+  const { field, direction } = SORT_MODES[cursor.mode];
+  const after = direction === 1 ? '$gt' : '$lt';
+  const sameValue = { [field]: cursor.value, _id: { [after]: cursor.id } };
+
+  if (cursor.value === null) {
+    const sameMissing = { [field]: null, _id: { [after]: cursor.id } };
+    return direction === 1
+      ? { $or: [sameMissing, { [field]: { $ne: null } }] }
+      : sameMissing;
+  }
+
+  const clauses = [{ [field]: { [after]: cursor.value } }, sameValue];
+  if (direction === -1) {
+    clauses.push({ [field]: null });
+  }
+  return { $or: clauses };
+}
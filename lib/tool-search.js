@@ -0,0 +1,57 @@
+// Search over the ai_tools catalog.
+//
+// `text` mode (the default) uses a weighted text index on name, tagline and
+// description, so matching is an index lookup instead of a scan and results
+// can be ranked by relevance. `substring` mode keeps the old behaviour of
+// matching anywhere inside a word, with the user's input escaped so it is
+// matched literally rather than interpreted as a regex.
+
+export const TEXT_INDEX_NAME = 'ai_tools_text';
+
+const TEXT_INDEX_KEYS = { name: 'text', tagline: 'text', description: 'text' };
+const TEXT_INDEX_WEIGHTS = { name: 10, tagline: 5, description: 1 };
+
+let textIndexReady = null;
+
+export function escapeRegex(text) {
+  return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
+// Creates the text index once per process. Resolves to false when it cannot
+// be created (e.g. another text index already exists), in which case search
+// falls back to substring matching.
+export function ensureTextIndex(db) {
+  if (!textIndexReady) {
+    textIndexReady = db.collection('ai_tools')
+      .createIndex(TEXT_INDEX_KEYS, {
+        name: TEXT_INDEX_NAME,
+        weights: TEXT_INDEX_WEIGHTS,
+        default_language: 'english'
+      })
+      .then(() => true)
+      .catch((error) => {
+        console.error('Text index unavailable, using substring search:', error.message);
+        return false;
+      });
+  }
+  return textIndexReady;
+}
+
+// Returns { filter, textSearch } for the search term; textSearch tells the
+// caller whether relevance sorting is available.
+export async function buildSearchFilter(db, search, mode = 'text') {
+  const term = search.trim();
+  if (!term) {
+    return { filter: {}, textSearch: false };
+  }
+
+  if (mode !== 'substring' && await ensureTextIndex(db)) {
+    return { filter: { $text: { $search: term } }, textSearch: true };
+  }
+
+  const pattern = { $regex: escapeRegex(term), $options: 'i' };
+  return {
+    filter: { $or: [{ name: pattern }, { tagline: pattern }, { description: pattern }] },
+    textSearch: false
+  };
+}
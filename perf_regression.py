@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Performance regression gate for the HappyTools API.
+
+Replays the functional test payloads at a fixed arrival rate for a few trials,
+then checks every route against the per-route budgets and the recorded
+baseline in perf_baseline.json. Exits 1 when a budget is exceeded or a route
+got significantly slower, so a release can be gated on it.
+
+    python perf_regression.py                 # compare against perf_baseline.json
+    python perf_regression.py --record        # store this run as the new baseline
+"""
+
+import argparse
+import sys
+
+from backend_test import INTRO_EMAIL_PAYLOAD
+from backend_test_chatbot import BASIC_CHATBOT_PAYLOAD, chat_load_targets
+from tests.http_client import API_BASE_URL, ApiClient
+from tests.load import LoadTarget
+from tests.perf import (DEFAULT_RUNS, DEFAULT_TOLERANCE, DEFAULT_Z, compare, load_baseline_file,
+                        print_findings, record_baseline, run_benchmark)
+from workflow_builder_test import MISSING_FIELDS_PAYLOAD
+
+BASE_URL = API_BASE_URL
+BASELINE_PATH = "perf_baseline.json"
+DEFAULT_RPS = 20
+DEFAULT_DURATION = 10
+DEFAULT_WARMUP = 5
+
+# Routes that answer without calling an external LLM or site, so their
+# latency is the app's own
+STATIC_TARGETS = [
+    LoadTarget("GET /ai-tools?limit=50", "GET", "/ai-tools?limit=50"),
+    LoadTarget("GET /ai-tools/stats", "GET", "/ai-tools/stats"),
+    LoadTarget("POST /agents/run intro-email", "POST", "/agents/run", json=INTRO_EMAIL_PAYLOAD),
+    LoadTarget("POST /workflow-builder missing", "POST", "/workflow-builder/generate",
+               json=MISSING_FIELDS_PAYLOAD, expected_status=400),
+]
+
+
+def benchmark_targets(client):
+    """Static targets plus chat against a chatbot created for this run"""
+    response = client.post("/chatbot/create", json=BASIC_CHATBOT_PAYLOAD, timeout=30)
+    response.raise_for_status()
+    return STATIC_TARGETS + chat_load_targets(response.json()['id'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HappyTools performance regression gate")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help=f"baseline file (default {BASELINE_PATH})")
+    parser.add_argument("--record", action="store_true",
+                        help="store this run as the baseline instead of comparing against it")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"trials per run (default {DEFAULT_RUNS})")
+    parser.add_argument("--rps", type=float, default=DEFAULT_RPS,
+                        help=f"requests per second across all routes (default {DEFAULT_RPS})")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help=f"seconds per trial (default {DEFAULT_DURATION})")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP,
+                        help=f"discarded warmup seconds before the first trial (default {DEFAULT_WARMUP})")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"smallest relative change that counts as a regression (default {DEFAULT_TOLERANCE})")
+    parser.add_argument("--z", type=float, default=DEFAULT_Z,
+                        help=f"standard errors a change must exceed to be significant (default {DEFAULT_Z})")
+    args = parser.parse_args()
+
+    baseline_file = load_baseline_file(args.baseline)
+    baseline = baseline_file.get('baseline')
+    if baseline and not args.record and (baseline['rps'], baseline['duration']) != (args.rps, args.duration):
+        print(f"⚠️  Baseline was recorded at {baseline['rps']} req/s for {baseline['duration']}s trials; "
+              f"this run uses {args.rps} req/s for {args.duration}s")
+
+    print(f"🚀 Benchmarking {BASE_URL}: {args.runs} trials of {args.duration}s at {args.rps} req/s")
+    targets = benchmark_targets(ApiClient(BASE_URL))
+    samples = run_benchmark(BASE_URL, targets, args.rps, args.duration, runs=args.runs, warmup=args.warmup)
+
+    if args.record:
+        record_baseline(args.baseline, baseline_file, samples, BASE_URL, args.rps, args.duration, args.runs)
+        print(f"💾 Baseline written to {args.baseline}")
+        findings = compare(samples, {'budgets': baseline_file.get('budgets', {})})
+    else:
+        if not baseline:
+            print(f"ℹ️  No baseline recorded in {args.baseline}; checking budgets only")
+        findings = compare(samples, baseline_file, tolerance=args.tolerance, z=args.z)
+
+    print_findings(findings)
+    sys.exit(0 if all(finding.passed for finding in findings) else 1)
+
+
+if __name__ == "__main__":
+    main()
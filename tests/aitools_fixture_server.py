@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Fixture server replaying aitools.fyi category pages for scraper benchmarks.
+
+Serves either a recorded corpus (``record`` saves the live pages the scrapers
+visit) or, when no corpus is given, a deterministic generated one with the
+same card markup the scrapers look for. Per-page latency and HTTP errors are
+configurable so retries and slow pages can be reproduced. Pages carry an
+ETag and Last-Modified and answer conditional requests with 304, unless
+``--no-validators`` is given. Point the Next.js
+server at it with ``AITOOLS_BASE_URL``:
+
+    python -m tests.aitools_fixture_server serve --port 8091 --latency uniform:50:250
+    AITOOLS_BASE_URL=http://localhost:8091 yarn dev
+"""
+
+import argparse
+import email.utils
+import hashlib
+import html
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from tests.llm_stub_server import LatencyDistribution
+
+LIVE_BASE_URL = "https://aitools.fyi"
+
+# Pages visited by TargetedAiToolsScraper
+TARGETED_PATHS = ["/"] + [f"/category/ai-{slug}" for slug in (
+    "image-generation", "web-apps", "marketing", "analytics", "content-creation",
+    "productivity", "writing", "video", "audio", "code", "design", "automation",
+    "sales", "email", "social-media", "seo", "customer-support", "finance", "health",
+)]
+
+# Pages visited by EnhancedAiToolsScraper
+ENHANCED_PATHS = [f"/{slug}" for slug in (
+    "image-generation web-apps marketing analytics education social-media-assistant "
+    "shopify-apps sales chat-bot audio-generation branding fun large-language-model-llm "
+    "project-management companion web3 healthcare photo-editing homework "
+    "image-generation-model gaming summarizer avatar-generation writing-assistant nudity "
+    "data-science assistant image-editing model-generation meeting-assistant presentation "
+    "content-creation web-scraping research email-assistant search-engine sql "
+    "noise-cancellation human-resource news e-commerce legal video-editing all-in-one "
+    "automation 3d-generation hosting finance productivity pdf resume travel translation "
+    "developer excel astrology text-to-speech-tts stock-market real-estate medical-assistant "
+    "ai-detection dating anime-generator ai-girlfriend agents directories kids "
+    "customer-support physical-products nsfw paraphraser text-generation fashion "
+    "code-assistant video-generation design copywriting"
+).split()]
+
+NAME_PARTS = ("Nova Pixel Echo Quill Flux Lumen Vertex Sage Orbit Prism Spark Atlas "
+              "Muse Cobalt Drift Ember Glyph Helix Ion Kite").split()
+NAME_SUFFIXES = "AI Studio Labs GPT Pilot Forge Mind Flow Bot Genie".split()
+PRICING = ("Free", "Freemium", "Paid", "Free Trial")
+
+
+def corpus_filename(path):
+    slug = path.strip("/").replace("/", "__") or "index"
+    return f"{slug}.html"
+
+
+def generate_page(path, tools_per_page=40):
+    """Deterministic category page whose cards match the scrapers' selectors."""
+    rng = random.Random(hashlib.sha1(path.encode()).hexdigest())
+    topic = path.strip("/").split("/")[-1].replace("ai-", "").replace("-", " ") or "featured"
+    cards = []
+    for i in range(tools_per_page):
+        name = f"{rng.choice(NAME_PARTS)} {rng.choice(NAME_SUFFIXES)} {rng.randint(1, 999)}"
+        description = (f"{name} helps teams with {topic} using AI. "
+                       + " ".join(rng.choice(NAME_PARTS).lower() for _ in range(rng.randint(8, 30))))
+        slug = name.lower().replace(" ", "-")
+        cards.append(
+            f'<div class="tool-card"><a href="/tool/{slug}"><h3>{html.escape(name)}</h3></a>'
+            f'<p class="description">{html.escape(description)}</p>'
+            f'<span class="pricing">{rng.choice(PRICING)}</span></div>'
+        )
+    return (f"<!DOCTYPE html><html><head><title>AI {html.escape(topic)} tools</title></head>"
+            f"<body><main class=\"grid\">{''.join(cards)}</main></body></html>")
+
+
+class FixtureConfig:
+    def __init__(self, corpus_dir=None, latency="fixed:0", errors=None, error_rate=0.0,
+                 tools_per_page=40, seed=None, validators=True):
+        self.corpus_dir = corpus_dir
+        self.validators = validators
+        self.last_modified = email.utils.formatdate(usegmt=True)
+        self.latency = LatencyDistribution(latency)
+        self.errors = errors or {}
+        self.error_rate = error_rate
+        self.tools_per_page = tools_per_page
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"pages": 0, "not_modified": 0, "errors": 0, "not_found": 0, "bytes": 0}
+        self._generated = {}
+
+    def page(self, path):
+        if self.corpus_dir:
+            file_path = os.path.join(self.corpus_dir, corpus_filename(path))
+            if not os.path.exists(file_path):
+                return None
+            with open(file_path, "rb") as f:
+                return f.read()
+        with self.lock:
+            if path not in self._generated:
+                self._generated[path] = generate_page(path, self.tools_per_page).encode()
+            return self._generated[path]
+
+    def draw(self, path):
+        """Return (delay_seconds, error_status_or_None) for one request."""
+        with self.lock:
+            delay = self.latency.sample_ms(self.rng) / 1000
+            if path in self.errors:
+                return delay, self.errors[path]
+            if self.rng.random() < self.error_rate:
+                return delay, 503
+        return delay, None
+
+    def count(self, key, size=0):
+        with self.lock:
+            self.stats[key] += 1
+            self.stats["bytes"] += size
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    config = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/__stats":
+            with self.config.lock:
+                return self._send(200, json.dumps(self.config.stats).encode(), "application/json")
+
+        delay, error_status = self.config.draw(path)
+        time.sleep(delay)
+        if error_status:
+            self.config.count("errors")
+            return self._send(error_status, b"fixture error")
+
+        body = self.config.page(path)
+        if body is None:
+            self.config.count("not_found")
+            return self._send(404, b"not found")
+        if not self.config.validators:
+            self.config.count("pages", len(body))
+            return self._send(200, body)
+
+        validators = {"ETag": f'"{hashlib.sha1(body).hexdigest()[:16]}"',
+                      "Last-Modified": self.config.last_modified}
+        if self.headers.get("If-None-Match") == validators["ETag"]:
+            self.config.count("not_modified")
+            self.send_response(304)
+            for name, value in validators.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self.config.count("pages", len(body))
+        self._send(200, body, headers=validators)
+
+
+def create_fixture_server(config, host="127.0.0.1", port=0):
+    handler = type("ConfiguredFixtureHandler", (FixtureHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_fixture_server(config, host="127.0.0.1", port=0):
+    """Start the fixture server in a background thread; returns the server."""
+    server = create_fixture_server(config, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def record_corpus(out_dir, paths, base_url=LIVE_BASE_URL):
+    """Download the live pages the scrapers visit into ``out_dir``."""
+    os.makedirs(out_dir, exist_ok=True)
+    session = requests.Session()
+    session.headers["User-Agent"] = "Mozilla/5.0 (compatible; happytools-fixture-recorder)"
+    for path in paths:
+        try:
+            response = session.get(f"{base_url}{path}", timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"❌ {path}: {e}")
+            continue
+        with open(os.path.join(out_dir, corpus_filename(path)), "wb") as f:
+            f.write(response.content)
+        print(f"✅ {path}: {len(response.content)} bytes")
+        time.sleep(1)
+
+
+def parse_errors(values):
+    errors = {}
+    for value in values or []:
+        path, _, status = value.rpartition("=")
+        errors[path] = int(status)
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="aitools.fyi fixture server for scraper benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="serve a recorded or generated corpus")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8091)
+    serve.add_argument("--corpus", help="directory written by 'record' (default: generated pages)")
+    serve.add_argument("--latency", default="fixed:0",
+                       help="fixed:MS | uniform:MIN_MS:MAX_MS | lognormal:MEDIAN_MS:SIGMA (default fixed:0)")
+    serve.add_argument("--error", action="append", metavar="PATH=STATUS",
+                       help="always answer PATH with STATUS, e.g. /category/ai-seo=503 (repeatable)")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    serve.add_argument("--tools-per-page", type=int, default=40, help="cards per generated page")
+    serve.add_argument("--seed", type=int, default=None)
+    serve.add_argument("--no-validators", action="store_true",
+                       help="send no ETag/Last-Modified and never answer 304 (exercises the content-hash check)")
+
+    record = commands.add_parser("record", help="save the live pages the scrapers visit")
+    record.add_argument("--out", required=True, help="corpus directory")
+    record.add_argument("--enhanced", action="store_true", help="also record the enhanced scraper's categories")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record_corpus(args.out, TARGETED_PATHS + (ENHANCED_PATHS if args.enhanced else []))
+        return
+
+    config = FixtureConfig(corpus_dir=args.corpus, latency=args.latency, errors=parse_errors(args.error),
+                           error_rate=args.error_rate, tools_per_page=args.tools_per_page, seed=args.seed,
+                           validators=not args.no_validators)
+    server = create_fixture_server(config, args.host, args.port)
+    corpus = args.corpus or "generated corpus"
+    print(f"📚 aitools fixture server on http://{args.host}:{args.port} ({corpus}, latency {config.latency.spec})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
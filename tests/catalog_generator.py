@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Synthetic ``ai_tools`` catalog for scaling tests.
+
+Documents have the shape ``transformPHToolToDBFormat`` and the aitools.fyi
+scrapers produce. Sources, categories and votes are skewed the way the real
+catalog is: most tools come from the scrapers, a few categories hold most of
+the tools, and a handful of tools get most of the votes. Generation is
+deterministic per batch, so growing a collection from 10k to 100k documents
+gives the same first 10k as generating 10k directly.
+
+Use a dedicated database and start the app against it:
+
+    python -m tests.catalog_generator --size 100000 --db happytools_bench
+    DB_NAME=happytools_bench yarn dev
+
+Requires ``pymongo`` (``pip install pymongo``).
+"""
+
+import argparse
+import math
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from pymongo import MongoClient
+
+DEFAULT_MONGO_URL = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+DEFAULT_DB_NAME = "happytools_bench"
+BATCH_SIZE = 1000
+
+# (source, share of the catalog)
+SOURCES = [("AITools.fyi", 0.62), ("Product Hunt", 0.33), ("Google Trending", 0.05)]
+
+# Categories the scrapers emit, most common first; shares follow a Zipf curve
+CATEGORIES = [
+    "Featured", "Productivity", "Writing", "Image Generation", "Marketing", "Chat Bot",
+    "Content Creation", "Code", "Video Generation", "Design", "Automation", "Analytics",
+    "Audio", "Sales", "Email", "Social Media", "Seo", "Customer Support", "Education",
+    "Finance", "Health", "Web Apps", "Search Engine", "Research", "Video", "Legal",
+    "Real Estate", "Travel", "Gaming", "Fashion",
+]
+CATEGORY_WEIGHTS = [1 / (rank + 1) ** 1.1 for rank in range(len(CATEGORIES))]
+PRICING = (["Free", "Freemium", "Paid", "Free Trial", "Unknown"], [18, 38, 22, 7, 15])
+
+PREFIXES = ("Nova Pixel Echo Quill Flux Lumen Vertex Sage Orbit Prism Spark Atlas Muse Cobalt "
+            "Drift Ember Glyph Helix Ion Kite Zen Bright Swift Deep Smart Neo Hyper Auto Meta "
+            "Open Clear Rapid Magic Vivid Cloud Data Text Voice Vision").split()
+STEMS = ("Write Draw Mind Flow Code Chat Scribe Lens Craft Sense Form Note Sketch Sync Spark "
+         "Brief Pitch Deck Mail Post Clip Tune Cast Frame Shot Mark Lead Desk Path Wave").split()
+SUFFIXES = ["AI", "Studio", "Labs", "GPT", "Pilot", "Forge", "Bot", "Genie", "HQ", "io", "App", "Hub", ""]
+NAME_SPACE = len(PREFIXES) * len(STEMS) * len(SUFFIXES)
+# Coprime with NAME_SPACE, so consecutive indexes map to unrelated names
+NAME_STRIDE = 7919
+
+VOCABULARY = ("ai powered tool helps teams create generate automate content images videos "
+              "workflows marketing sales customers data insights reports code apps websites "
+              "emails posts faster better smarter easily instantly using advanced models "
+              "designed for creators businesses developers students writers marketers "
+              "with templates integrations analytics collaboration real-time").split()
+
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def tool_name(index):
+    combo = (index * NAME_STRIDE) % NAME_SPACE
+    prefix = PREFIXES[combo % len(PREFIXES)]
+    stem = STEMS[(combo // len(PREFIXES)) % len(STEMS)]
+    suffix = SUFFIXES[combo // (len(PREFIXES) * len(STEMS))]
+    name = f"{prefix}{stem.lower()} {suffix}".strip()
+    # Names stay unique past NAME_SPACE by numbering later rounds
+    return name if index < NAME_SPACE else f"{name} {index // NAME_SPACE + 1}"
+
+
+def sentence(rng, words):
+    text = " ".join(rng.choice(VOCABULARY) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def text_of_length(rng, median_chars, sigma=0.6):
+    """Sentences totalling a lognormal number of characters around ``median_chars``."""
+    target = max(20, int(rng.lognormvariate(math.log(median_chars), sigma)))
+    parts, length = [], 0
+    while length < target:
+        parts.append(sentence(rng, rng.randint(6, 16)))
+        length += len(parts[-1]) + 1
+    return " ".join(parts)
+
+
+def product_hunt_tool(rng, index, name, featured_at):
+    """Shape of transformPHToolToDBFormat"""
+    slug = name.lower().replace(" ", "-")
+    return {
+        'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        'ph_id': str(100000 + index),
+        'name': name,
+        'tagline': sentence(rng, rng.randint(4, 9))[:60],
+        'description': text_of_length(rng, 260),
+        # Votes are heavy-tailed: most launches get a few dozen, a few get thousands
+        'votes': int(rng.paretovariate(1.2) * 20),
+        'url': f"https://www.producthunt.com/posts/{slug}",
+        'website': f"https://{slug.replace('-', '')}.com",
+        'makers': [],
+        'topics': [],
+        'category': 'General',
+        'pricing': 'Unknown',
+        'rating': rng.random() * 2 + 3,
+        'featured_at': featured_at,
+        'source': 'Product Hunt',
+        'created_at': featured_at,
+        'updated_at': featured_at,
+    }
+
+
+def scraped_tool(rng, name, source, featured_at):
+    """Shape of the targeted/enhanced aitools.fyi scrapers' output"""
+    category = rng.choices(CATEGORIES, CATEGORY_WEIGHTS)[0]
+    slug = name.lower().replace(" ", "-")
+    description = text_of_length(rng, 140)
+    return {
+        'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        'name': name,
+        # Upsert key set by lib/tool-ingest.js (generated names are ASCII)
+        'name_key': " ".join(name.split()).lower(),
+        'tagline': description[:120],
+        'description': description,
+        'url': f"https://aitools.fyi/{slug}",
+        'website': f"https://aitools.fyi/{slug}",
+        'category': category,
+        'pricing': rng.choices(*PRICING)[0],
+        'rating': rng.random() * 1.5 + 3.5,
+        'votes': rng.randint(100, 900),
+        'makers': [],
+        'topics': [category],
+        'featured_at': featured_at,
+        'source': source,
+        'created_at': featured_at,
+        'updated_at': featured_at,
+    }
+
+
+def generate_batch(batch_index, seed=0, batch_size=BATCH_SIZE):
+    """Documents ``batch_index * batch_size`` up to the next batch, always the same for a given seed."""
+    rng = random.Random(f"{seed}:{batch_index}")
+    sources, weights = zip(*SOURCES)
+    docs = []
+    for index in range(batch_index * batch_size, (batch_index + 1) * batch_size):
+        name = tool_name(index)
+        # Spread over ~3 years, denser towards the present
+        featured_at = EPOCH - timedelta(days=1100 * rng.random() ** 2, seconds=rng.randint(0, 86400))
+        source = rng.choices(sources, weights)[0]
+        if source == 'Product Hunt':
+            docs.append(product_hunt_tool(rng, index, name, featured_at))
+        else:
+            docs.append(scraped_tool(rng, name, source, featured_at))
+    return docs
+
+
+def load_catalog(collection, size, seed=0, batch_size=BATCH_SIZE, progress=True):
+    """Grow ``collection`` to ``size`` synthetic documents (rounded up to whole batches).
+
+    Assumes the collection holds only documents from this generator, loaded
+    with the same seed and batch size.
+    """
+    existing = collection.estimated_document_count()
+    if existing % batch_size:
+        raise ValueError(f"Collection has {existing} documents, not a multiple of the batch size {batch_size}; "
+                         f"drop it and reload")
+    started = time.perf_counter()
+    for batch_index in range(existing // batch_size, math.ceil(size / batch_size)):
+        collection.insert_many(generate_batch(batch_index, seed, batch_size), ordered=False)
+        loaded = (batch_index + 1) * batch_size
+        if progress and loaded % (50 * batch_size) == 0:
+            rate = (loaded - existing) / (time.perf_counter() - started)
+            print(f"   {loaded:,} documents ({rate:,.0f} docs/s)")
+    return collection.estimated_document_count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a synthetic ai_tools catalog into MongoDB")
+    parser.add_argument("--size", type=int, required=True, help="target number of documents (e.g. 10000, 1000000)")
+    parser.add_argument("--mongo-url", default=DEFAULT_MONGO_URL, help="defaults to MONGO_URL")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help=f"database name (default {DEFAULT_DB_NAME})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--drop", action="store_true", help="drop ai_tools before loading")
+    args = parser.parse_args()
+
+    collection = MongoClient(args.mongo_url)[args.db]['ai_tools']
+    if args.drop:
+        collection.drop()
+    started = time.perf_counter()
+    total = load_catalog(collection, args.size, seed=args.seed)
+    print(f"✅ {args.db}.ai_tools holds {total:,} documents ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Shared HTTP client for the Python test drivers.
+
+A keep-alive, pooled ``requests`` session with a configurable base URL and
+default timeout that records DNS, TCP connect, TLS, time-to-first-byte and
+total time for every call. Requests that reuse a pooled connection report
+zero DNS/connect/TLS, so the numbers show what the API costs rather than
+what a fresh TLS handshake to the preview deployment costs.
+
+The base URL and timeout default to ``HAPPYTOOLS_API_URL`` and
+``HAPPYTOOLS_TIMEOUT`` when set.
+"""
+
+import os
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+API_BASE_URL = os.environ.get(
+    "HAPPYTOOLS_API_URL",
+    "https://f2884661-c20b-483f-ad47-0b43883bbdde.preview.emergentagent.com/api",
+)
+DEFAULT_TIMEOUT = float(os.environ.get("HAPPYTOOLS_TIMEOUT", "60"))
+DEFAULT_HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json'
+}
+
+# Timing record of the request in flight on this thread, filled in by the
+# connection classes below while urllib3 opens a new connection.
+_in_flight = threading.local()
+
+
+class RequestTiming:
+    """Phase timings of one request, in seconds."""
+
+    def __init__(self, method, url):
+        self.method = method
+        self.url = url
+        self.started_at = time.time()
+        self.dns = 0.0
+        self.connect = 0.0
+        self.tls = 0.0
+        self.ttfb = None
+        self.total = None
+        self.status = None
+        self.size = None
+        self.server_timing = {}
+
+    @property
+    def reused_connection(self):
+        return self.dns == 0 and self.connect == 0
+
+    def as_dict(self):
+        ms = lambda value: None if value is None else round(value * 1000, 1)
+        return {
+            'method': self.method,
+            'url': self.url,
+            'started_at': self.started_at,
+            'dns_ms': ms(self.dns),
+            'connect_ms': ms(self.connect),
+            'tls_ms': ms(self.tls),
+            'ttfb_ms': ms(self.ttfb),
+            'total_ms': ms(self.total),
+            'status': self.status,
+            'size': self.size,
+            'reused_connection': self.reused_connection,
+            'server_timing_ms': self.server_timing,
+        }
+
+    def summary(self):
+        if self.total is None:
+            return "no response"
+        parts = [f"{self.total * 1000:.0f}ms"]
+        if self.ttfb is not None:
+            parts.append(f"ttfb {self.ttfb * 1000:.0f}ms")
+        if self.server_timing.get('total') is not None:
+            parts.append(f"server {self.server_timing['total']:.0f}ms")
+        if not self.reused_connection:
+            parts.append(f"dns {self.dns * 1000:.0f}ms, connect {self.connect * 1000:.0f}ms")
+            if self.tls:
+                parts.append(f"tls {self.tls * 1000:.0f}ms")
+        return parts[0] + (f" ({', '.join(parts[1:])})" if len(parts) > 1 else "")
+
+
+def parse_server_timing(header):
+    """``db-connect;dur=1.2, total;dur=30`` -> ``{'db-connect': 1.2, 'total': 30.0}``"""
+    metrics = {}
+    for entry in filter(None, (part.strip() for part in (header or '').split(','))):
+        name, *params = [piece.strip() for piece in entry.split(';')]
+        duration = None
+        for param in params:
+            key, _, value = param.partition('=')
+            if key == 'dur':
+                try:
+                    duration = float(value)
+                except ValueError:
+                    pass
+        metrics[name] = duration
+    return metrics
+
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        timing = getattr(_in_flight, 'timing', None)
+        host = self._dns_host
+        started = time.perf_counter()
+        # Resolve up front so DNS and TCP connect are timed separately. On a
+        # resolution error urllib3 resolves again and raises its usual error.
+        try:
+            address = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        except socket.gaierror:
+            address = None
+        resolved = time.perf_counter()
+
+        if address:
+            self._dns_host = address
+        try:
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = host
+
+        if timing is not None:
+            timing.dns += resolved - started
+            timing.connect += time.perf_counter() - resolved
+        return sock
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        timing = getattr(_in_flight, 'timing', None)
+        before = (timing.dns + timing.connect) if timing is not None else 0
+        started = time.perf_counter()
+        super().connect()
+        if timing is not None:
+            # connect() = socket setup (timed in _new_conn) + TLS handshake
+            timing.tls += (time.perf_counter() - started) - (timing.dns + timing.connect - before)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+def create_session(pool_size=10, headers=None):
+    """Keep-alive session whose connections record phase timings."""
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS if headers is None else headers)
+    return session
+
+
+class ApiClient:
+    """Pooled client for the HappyTools API.
+
+    ``path`` may be relative to ``base_url`` or an absolute URL. Every
+    response gets a ``timing`` attribute (:class:`RequestTiming`), and the
+    latest timing per thread is available from :meth:`pop_last_timing`.
+    """
+
+    def __init__(self, base_url=API_BASE_URL, timeout=DEFAULT_TIMEOUT, pool_size=10,
+                 headers=None, verbose=False):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.verbose = verbose
+        self.session = create_session(pool_size, headers)
+        self._last = threading.local()
+
+    def url(self, path):
+        return path if path.startswith(('http://', 'https://')) else f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method, path, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        url = self.url(path)
+        timing = RequestTiming(method, url)
+        self._last.timing = timing
+        _in_flight.timing = timing
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        finally:
+            _in_flight.timing = None
+            timing.total = time.perf_counter() - started
+
+        timing.ttfb = response.elapsed.total_seconds()
+        timing.status = response.status_code
+        timing.size = len(response.content)
+        timing.server_timing = parse_server_timing(response.headers.get('Server-Timing'))
+        response.timing = timing
+        if self.verbose:
+            print(f"   ⏱️  {method} {url.replace(self.base_url, '')} → {response.status_code} in {timing.summary()}")
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def wait_for_job(self, response, timeout=300, interval=1.0):
+        """Poll the job behind a 202 response (see lib/jobs.js) until it finishes; returns the job."""
+        if response.status_code != 202:
+            raise ValueError(f"Expected 202 with a job, got HTTP {response.status_code}: {response.text[:200]}")
+        job = response.json()['job']
+        deadline = time.monotonic() + timeout
+        while job['status'] in ('queued', 'running'):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job['id']} still {job['status']} after {timeout}s")
+            time.sleep(interval)
+            job = self.get(f"/jobs/{job['id']}").json()
+        return job
+
+    def pop_last_timing(self):
+        """Timing of the last request made on this thread, cleared once read."""
+        timing = getattr(self._last, 'timing', None)
+        self._last.timing = None
+        return timing
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI, Anthropic and Gemini HTTP APIs.
+
+Speaks the wire formats the API routes use (OpenAI chat completions and image
+generations, Anthropic messages, Gemini generateContent) with configurable
+latency, completion size and failure rate, so agent and builder success paths
+can be benchmarked without network access. Point the Next.js server at it:
+
+    python -m tests.llm_stub_server --port 8090 --latency lognormal:400:0.5
+    OPENAI_BASE_URL=http://localhost:8090 ANTHROPIC_BASE_URL=http://localhost:8090 \\
+        GEMINI_BASE_URL=http://localhost:8090 yarn dev
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FILLER_WORDS = (
+    "automation workflow customer growth strategy insight data team product "
+    "launch market value process quality review summary plan result action"
+).split()
+
+
+class LatencyDistribution:
+    """Parses ``fixed:MS``, ``uniform:MIN_MS:MAX_MS`` or ``lognormal:MEDIAN_MS:SIGMA``."""
+
+    def __init__(self, spec="fixed:0"):
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(self.params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+        self.spec = spec
+
+    def sample_ms(self, rng):
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        median, sigma = self.params
+        return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0
+
+
+class StubConfig:
+    def __init__(self, latency="fixed:0", ms_per_token=0.0, completion_tokens="300",
+                 failure_rate=0.0, failure_status=500, seed=None):
+        self.latency = LatencyDistribution(latency)
+        self.ms_per_token = ms_per_token
+        low, _, high = str(completion_tokens).partition(":")
+        self.completion_tokens = (int(low), int(high or low))
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+
+    def draw(self):
+        """Return (delay_seconds, completion_tokens, should_fail) for one request."""
+        with self.rng_lock:
+            tokens = self.rng.randint(*self.completion_tokens)
+            delay_ms = self.latency.sample_ms(self.rng) + tokens * self.ms_per_token
+            fail = self.rng.random() < self.failure_rate
+        return delay_ms / 1000, tokens, fail
+
+    def count(self, route, failed):
+        with self.stats_lock:
+            entry = self.stats.setdefault(route, {"requests": 0, "failures": 0})
+            entry["requests"] += 1
+            entry["failures"] += int(failed)
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def filler_text(tokens):
+    return " ".join(FILLER_WORDS[i % len(FILLER_WORDS)] for i in range(tokens))
+
+
+def n8n_workflow(description):
+    return {
+        "name": "Stub Workflow",
+        "nodes": [
+            {"id": "trigger", "name": "Webhook Trigger", "type": "n8n-nodes-base.webhook",
+             "position": [250, 300], "parameters": {"path": "stub", "httpMethod": "POST"}},
+            {"id": "process", "name": "Process Data", "type": "n8n-nodes-base.function",
+             "position": [450, 300], "parameters": {"functionCode": "return items;"}},
+            {"id": "notify", "name": "Send Email", "type": "n8n-nodes-base.emailSend",
+             "position": [650, 300], "parameters": {"text": description[:200]}},
+        ],
+        "connections": {
+            "trigger": {"main": [[{"node": "process", "type": "main", "index": 0}]]},
+            "process": {"main": [[{"node": "notify", "type": "main", "index": 0}]]},
+        },
+        "settings": {"executionOrder": "v1"},
+    }
+
+
+def make_scenario(description):
+    return {
+        "name": "Stub Scenario",
+        "scenario": {
+            "dsl": "1.0.0",
+            "flow": [
+                {"id": 1, "module": "webhook:customWebhook", "version": 1, "parameters": {}, "mapper": {}},
+                {"id": 2, "module": "email:ActionSendEmail", "version": 1, "parameters": {},
+                 "mapper": {"text": description[:200]}},
+            ],
+            "metadata": {"version": 1, "scenario": {"autoCommit": True}},
+        },
+    }
+
+
+def completion_text(prompt, tokens):
+    """Build a reply shaped like what the calling route expects to parse."""
+    if "workflow JSON" in prompt:
+        workflow = n8n_workflow(prompt) if "n8n" in prompt.split("\n", 1)[0] else make_scenario(prompt)
+        # Wrapped in prose and a code fence so the route's cleanup code runs
+        return f"Here is your workflow:\n```json\n{json.dumps(workflow, indent=2)}\n```"
+    if "website" in prompt.lower() and "HTML" in prompt:
+        paragraphs = "".join(f"<p class=\"lead\">{filler_text(40)}</p>" for _ in range(max(1, tokens // 40)))
+        return ("<nav class=\"navbar navbar-dark bg-dark\"><span class=\"navbar-brand\">Stub</span></nav>"
+                f"<section class=\"container py-5\"><h1 class=\"display-4\">Stub Site</h1>{paragraphs}</section>")
+    return filler_text(tokens)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    config = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path == "/__stats":
+            with self.config.stats_lock:
+                return self._send_json(200, self.config.stats)
+        self._send_json(404, {"error": {"message": f"Unknown route {self.path}"}})
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        routes = {
+            "/v1/chat/completions": ("openai", self.openai_chat),
+            "/v1/images/generations": ("openai", self.openai_image),
+            "/v1/messages": ("anthropic", self.anthropic_messages),
+        }
+        if path in routes:
+            provider, handler = routes[path]
+        elif re.match(r"^/v1beta/models/[^/:]+:generateContent$", path):
+            provider, handler = "gemini", self.gemini_generate
+        else:
+            return self._send_json(404, {"error": {"message": f"Unknown route {path}"}})
+
+        body = self._read_json()
+        delay, tokens, fail = self.config.draw()
+        self.config.count(path if provider != "gemini" else "/v1beta/models/*:generateContent", fail)
+        time.sleep(delay)
+
+        if fail:
+            return self._send_error(provider)
+        self._send_json(200, handler(body, tokens))
+
+    def _send_error(self, provider):
+        status = self.config.failure_status
+        message = "Stub provider failure (rate limited)" if status == 429 else "Stub provider failure"
+        if provider == "anthropic":
+            body = {"type": "error", "error": {"type": "api_error", "message": message}}
+        elif provider == "gemini":
+            body = {"error": {"code": status, "message": message, "status": "UNAVAILABLE"}}
+        else:
+            body = {"error": {"message": message, "type": "server_error", "code": None}}
+        self._send_json(status, body)
+
+    def openai_chat(self, body, tokens):
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        text = completion_text(prompt, tokens)
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(text)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def openai_image(self, body, tokens):
+        return {
+            "created": int(time.time()),
+            "data": [{"url": f"http://localhost/stub-images/{uuid.uuid4().hex}.png",
+                      "revised_prompt": body.get("prompt", "")}
+                     for _ in range(int(body.get("n", 1)))],
+        }
+
+    def anthropic_messages(self, body, tokens):
+        prompt = str(body.get("system", "")) + "\n" + "\n".join(
+            str(m.get("content", "")) for m in body.get("messages", []))
+        text = completion_text(prompt, tokens)
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "claude-3-5-sonnet-20241022"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": estimate_tokens(prompt), "output_tokens": estimate_tokens(text)},
+        }
+
+    def gemini_generate(self, body, tokens):
+        prompt = "\n".join(part.get("text", "") for content in body.get("contents", [])
+                           for part in content.get("parts", []))
+        text = completion_text(prompt, tokens)
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(text)
+        return {
+            "candidates": [{"content": {"parts": [{"text": text}], "role": "model"},
+                            "finishReason": "STOP", "index": 0}],
+            "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": completion_tokens,
+                              "totalTokenCount": prompt_tokens + completion_tokens},
+        }
+
+
+def create_stub_server(config, host="127.0.0.1", port=0):
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_stub_server(config, host="127.0.0.1", port=0):
+    """Start the stub in a background thread; returns the server (see ``server_address``)."""
+    server = create_stub_server(config, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stub for the OpenAI, Anthropic and Gemini APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", default="fixed:0",
+                        help="fixed:MS | uniform:MIN_MS:MAX_MS | lognormal:MEDIAN_MS:SIGMA (default fixed:0)")
+    parser.add_argument("--ms-per-token", type=float, default=0.0,
+                        help="extra delay per completion token, to mimic generation speed")
+    parser.add_argument("--completion-tokens", default="300",
+                        help="completion size in tokens, N or MIN:MAX (default 300)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--failure-status", type=int, default=500, help="HTTP status for failures (e.g. 429)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible latencies and failures")
+    args = parser.parse_args()
+
+    config = StubConfig(latency=args.latency, ms_per_token=args.ms_per_token,
+                        completion_tokens=args.completion_tokens, failure_rate=args.failure_rate,
+                        failure_status=args.failure_status, seed=args.seed)
+    server = create_stub_server(config, args.host, args.port)
+    print(f"🤖 LLM stub listening on http://{args.host}:{args.port} "
+          f"(latency {config.latency.spec}, failure rate {args.failure_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+"""
+Open-loop load generation for the HappyTools API test drivers.
+
+Requests are sent on a fixed arrival schedule (``--rps``) regardless of how
+fast the server answers, and latency is measured from each request's
+*scheduled* send time. A slow server therefore shows up as queueing delay in
+the percentiles instead of silently lowering the offered load (coordinated
+omission).
+
+One process is limited by the GIL to a few hundred requests per second, so
+the schedule can be split across forked worker processes (``--processes``)
+and across hosts: a coordinator (``--listen``) waits for agents (``--join``)
+running the same driver, hands each a slice of the schedule, and merges the
+histograms they send back. Worker ``w`` of ``n`` sends requests ``w, w + n,
+w + 2n, ...`` of the global schedule, so the combined traffic is the same as
+one process would send and the merged percentiles are exact.
+"""
+
+import json
+import math
+import multiprocessing
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from tests.http_client import create_session
+
+DEFAULT_RPS = 50
+DEFAULT_DURATION = 30
+DEFAULT_MAX_IN_FLIGHT = 256
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of latencies in microseconds.
+
+    Values keep ``significant_digits`` decimal digits of precision across the
+    whole range, so p99 of a 2s request is as accurate (relatively) as p50 of
+    a 2ms one. Buckets are stored sparsely and two histograms with the same
+    precision merge exactly.
+    """
+
+    def __init__(self, significant_digits=2):
+        self.significant_digits = significant_digits
+        self._sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.counts = {}
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = 0
+        self._sum = 0
+
+    def _bucket_shift(self, value):
+        return max(0, value.bit_length() - self._sub_bucket_bits)
+
+    def _lowest_equivalent(self, value):
+        shift = self._bucket_shift(value)
+        return (value >> shift) << shift
+
+    def _highest_equivalent(self, lowest):
+        return lowest + (1 << self._bucket_shift(lowest)) - 1
+
+    def record(self, value, count=1):
+        value = max(0, int(value))
+        bucket = self._lowest_equivalent(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total_count += count
+        self._sum += value * count
+        self.max_value = max(self.max_value, value)
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+
+    def merge(self, other):
+        if other.significant_digits != self.significant_digits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total_count += other.total_count
+        self._sum += other._sum
+        self.max_value = max(self.max_value, other.max_value)
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+        return self
+
+    def mean(self):
+        return self._sum / self.total_count if self.total_count else 0
+
+    def to_dict(self):
+        return {
+            'significant_digits': self.significant_digits,
+            'counts': sorted(self.counts.items()),
+            'total_count': self.total_count,
+            'min_value': self.min_value,
+            'max_value': self.max_value,
+            'sum': self._sum,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['significant_digits'])
+        histogram.counts = {bucket: count for bucket, count in data['counts']}
+        histogram.total_count = data['total_count']
+        histogram.min_value = data['min_value']
+        histogram.max_value = data['max_value']
+        histogram._sum = data['sum']
+        return histogram
+
+    def value_at_percentile(self, percentile):
+        if not self.total_count:
+            return 0
+        target = max(1, math.ceil(percentile / 100 * self.total_count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(self._highest_equivalent(bucket), self.max_value)
+        return self.max_value
+
+
+class LoadTarget:
+    """One request shape replayed by the load generator.
+
+    ``json`` may be a callable, in which case it is called for every request
+    (e.g. to give each chat message its own session id).
+    """
+
+    def __init__(self, name, method, path, json=None, expected_status=200, timeout=30):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.json = json
+        self.expected_status = expected_status
+        self.timeout = timeout
+
+    def payload(self):
+        return self.json() if callable(self.json) else self.json
+
+
+class RouteStats:
+    """Latency histogram and error counters for a single load target."""
+
+    def __init__(self, name):
+        self.name = name
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.status_counts = {}
+
+    def error_rate(self):
+        return self.errors / self.requests if self.requests else 0
+
+    def merge(self, other):
+        self.histogram.merge(other.histogram)
+        self.requests += other.requests
+        self.errors += other.errors
+        for status, count in other.status_counts.items():
+            self.status_counts[status] = self.status_counts.get(status, 0) + count
+        return self
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'histogram': self.histogram.to_dict(),
+            'requests': self.requests,
+            'errors': self.errors,
+            # JSON object keys must be strings; None is a transport error
+            'status_counts': [[status, count] for status, count in self.status_counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data['name'])
+        stats.histogram = LatencyHistogram.from_dict(data['histogram'])
+        stats.requests = data['requests']
+        stats.errors = data['errors']
+        stats.status_counts = {status: count for status, count in data['status_counts']}
+        return stats
+
+
+class LoadResult:
+    def __init__(self, stats, elapsed, rps, duration, workers=1):
+        self.stats = stats
+        self.elapsed = elapsed
+        self.rps = rps
+        self.duration = duration
+        self.workers = workers
+
+    def throughput(self, route_stats):
+        return route_stats.requests / self.elapsed if self.elapsed else 0
+
+    def to_dict(self):
+        return {
+            'stats': [route.to_dict() for route in self.stats.values()],
+            'elapsed': self.elapsed,
+            'rps': self.rps,
+            'duration': self.duration,
+            'workers': self.workers,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = {route['name']: RouteStats.from_dict(route) for route in data['stats']}
+        return cls(stats, data['elapsed'], data['rps'], data['duration'], data['workers'])
+
+
+def merge_results(results):
+    """Combine the results of workers that shared one schedule."""
+    results = list(results)
+    stats = {}
+    for result in results:
+        for name, route in result.stats.items():
+            if name not in stats:
+                stats[name] = RouteStats(name)
+            stats[name].merge(route)
+    first = results[0]
+    return LoadResult(stats, max(result.elapsed for result in results), first.rps, first.duration,
+                      sum(result.workers for result in results))
+
+
+def run_load(base_url, targets, rps=DEFAULT_RPS, duration=DEFAULT_DURATION,
+             max_in_flight=DEFAULT_MAX_IN_FLIGHT, headers=None, worker=0, workers=1, start_at=None):
+    """Replay ``targets`` round-robin at ``rps`` requests/second for ``duration`` seconds.
+
+    With ``workers`` > 1 only this worker's share of the schedule is sent
+    (every ``workers``-th request starting at ``worker``). ``start_at`` is a
+    ``time.time()`` timestamp to wait for, so workers start in step.
+    """
+    session = create_session(max_in_flight, headers)
+    stats = {target.name: RouteStats(target.name) for target in targets}
+    lock = threading.Lock()
+    total_requests = int(rps * duration)
+    interval = 1.0 / rps
+
+    def send(target, scheduled_at):
+        status = None
+        try:
+            response = session.request(target.method, f"{base_url}{target.path}",
+                                       json=target.payload(), timeout=target.timeout)
+            status = response.status_code
+        except requests.RequestException:
+            pass
+        latency_us = (time.perf_counter() - scheduled_at) * 1_000_000
+
+        route = stats[target.name]
+        with lock:
+            route.requests += 1
+            route.status_counts[status] = route.status_counts.get(status, 0) + 1
+            if status is None or status != target.expected_status:
+                route.errors += 1
+            # Failures and timeouts are recorded too, or a slow failing
+            # server would look fast
+            route.histogram.record(latency_us)
+
+    if start_at is not None:
+        time.sleep(max(0, start_at - time.time()))
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for i in range(worker, total_requests, workers):
+            scheduled_at = started + i * interval
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, targets[i % len(targets)], scheduled_at)
+    elapsed = time.perf_counter() - started
+
+    session.close()
+    return LoadResult(stats, elapsed, rps, duration)
+
+
+def _load_worker(queue, base_url, targets, rps, duration, max_in_flight, headers, worker, workers, start_at):
+    result = run_load(base_url, targets, rps, duration, max_in_flight, headers, worker, workers, start_at)
+    queue.put(result.to_dict())
+
+
+def run_load_processes(base_url, targets, rps=DEFAULT_RPS, duration=DEFAULT_DURATION,
+                       max_in_flight=DEFAULT_MAX_IN_FLIGHT, headers=None, processes=1,
+                       first_worker=0, workers=None, start_at=None):
+    """Run workers ``first_worker`` .. ``first_worker + processes - 1`` of ``workers`` as forked processes.
+
+    ``max_in_flight`` applies per process. Workers are forked rather than
+    spawned so targets built with lambdas (per-request payloads) need no
+    pickling; only the serialized results travel back.
+    """
+    workers = workers or processes
+    start_at = start_at or time.time() + 1
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    children = [
+        context.Process(target=_load_worker, daemon=True, args=(
+            queue, base_url, targets, rps, duration, max_in_flight, headers, worker, workers, start_at))
+        for worker in range(first_worker, first_worker + processes)
+    ]
+    for child in children:
+        child.start()
+    # Drain before joining so a child never blocks on a full queue pipe
+    results = [LoadResult.from_dict(queue.get()) for _ in children]
+    for child in children:
+        child.join()
+    return merge_results(results)
+
+
+def _send_message(sock, message):
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+def _read_message(reader):
+    line = reader.readline()
+    if not line:
+        raise ConnectionError("Load peer closed the connection")
+    return json.loads(line)
+
+
+def coordinate_load(base_url, targets, port, agents, rps=DEFAULT_RPS, duration=DEFAULT_DURATION,
+                    max_in_flight=DEFAULT_MAX_IN_FLIGHT, headers=None, processes=1, start_delay=2.0):
+    """Drive load from this host and ``agents`` joined hosts; returns the merged result.
+
+    Agents connect with :func:`join_load` and report how many processes they
+    run. Each host is then given a contiguous range of worker indexes of the
+    global schedule and a start delay, and sends its serialized result back.
+    """
+    server = socket.create_server(("", port))
+    peers = []
+    print(f"📡 Waiting for {agents} load agent(s) on port {port}")
+    while len(peers) < agents:
+        sock, address = server.accept()
+        reader = sock.makefile('rb')
+        hello = _read_message(reader)
+        peers.append((sock, reader, hello['processes']))
+        print(f"   Agent {address[0]} joined with {hello['processes']} process(es)")
+    server.close()
+
+    workers = processes + sum(peer_processes for _, _, peer_processes in peers)
+    first_worker = processes
+    for sock, _, peer_processes in peers:
+        _send_message(sock, {'rps': rps, 'duration': duration, 'max_in_flight': max_in_flight,
+                             'first_worker': first_worker, 'workers': workers, 'start_in': start_delay})
+        first_worker += peer_processes
+
+    local = run_load_processes(base_url, targets, rps, duration, max_in_flight, headers, processes,
+                               first_worker=0, workers=workers, start_at=time.time() + start_delay)
+    results = [local]
+    for sock, reader, _ in peers:
+        results.append(LoadResult.from_dict(_read_message(reader)))
+        sock.close()
+    return merge_results(results)
+
+
+def _connect_to_coordinator(host, port, wait):
+    deadline = time.time() + wait
+    while True:
+        try:
+            return socket.create_connection((host, port))
+        except ConnectionRefusedError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.5)
+
+
+def join_load(address, base_url, targets, headers=None, processes=1, wait=60):
+    """Run this host's share of a coordinated load test and send the result to the coordinator.
+
+    Agents may be started before the coordinator; connecting is retried for
+    ``wait`` seconds.
+    """
+    host, _, port = address.rpartition(":")
+    with _connect_to_coordinator(host, int(port), wait) as sock:
+        reader = sock.makefile('rb')
+        _send_message(sock, {'processes': processes})
+        job = _read_message(reader)
+        print(f"🚀 Running workers {job['first_worker']}-{job['first_worker'] + processes - 1} "
+              f"of {job['workers']} at {job['rps']} req/s total")
+        result = run_load_processes(base_url, targets, job['rps'], job['duration'], job['max_in_flight'],
+                                    headers, processes, first_worker=job['first_worker'],
+                                    workers=job['workers'], start_at=time.time() + job['start_in'])
+        _send_message(sock, result.to_dict())
+    return result
+
+
+def print_load_report(result):
+    print("\n" + "="*80)
+    workers = f", {result.workers} workers" if result.workers > 1 else ""
+    print(f"LOAD TEST REPORT - target {result.rps} req/s for {result.duration}s "
+          f"(ran {result.elapsed:.1f}s{workers})")
+    print("="*80)
+    print(f"{'route':<32}{'reqs':>7}{'err%':>7}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for route in result.stats.values():
+        h = route.histogram
+        ms = lambda value: f"{value / 1000:.1f}"
+        print(f"{route.name[:31]:<32}{route.requests:>7}{route.error_rate() * 100:>7.1f}"
+              f"{result.throughput(route):>8.1f}{ms(h.value_at_percentile(50)):>9}"
+              f"{ms(h.value_at_percentile(95)):>9}{ms(h.value_at_percentile(99)):>9}{ms(h.max_value):>9}")
+    print("Latencies in ms, measured from the scheduled send time.")
+
+
+def add_load_arguments(parser):
+    group = parser.add_argument_group("load mode")
+    group.add_argument("--load", action="store_true",
+                       help="replay the test payloads at a fixed arrival rate instead of checking correctness")
+    group.add_argument("--rps", type=float, default=DEFAULT_RPS,
+                       help=f"requests per second across all routes (default {DEFAULT_RPS})")
+    group.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                       help=f"seconds to sustain the load (default {DEFAULT_DURATION})")
+    group.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                       help=f"cap on concurrent requests per process (default {DEFAULT_MAX_IN_FLIGHT})")
+    group.add_argument("--processes", type=int, default=1,
+                       help="worker processes on this host (default 1)")
+    group.add_argument("--listen", type=int, metavar="PORT",
+                       help="coordinate a multi-host run: wait on PORT for --agents agents")
+    group.add_argument("--agents", type=int, default=0, help="number of agents to wait for with --listen")
+    group.add_argument("--join", metavar="HOST:PORT",
+                       help="run as an agent of the coordinator at HOST:PORT (rate and duration come from it)")
+
+
+def run_load_from_args(args, base_url, targets, headers=None):
+    """Run load mode for a driver script; returns True when no request failed."""
+    if args.join:
+        result = join_load(args.join, base_url, targets, headers, args.processes)
+        print(f"📤 Sent {sum(route.requests for route in result.stats.values())} results to {args.join}")
+        return all(route.errors == 0 for route in result.stats.values())
+
+    print(f"🚀 Load testing {base_url}: {', '.join(target.name for target in targets)}")
+    if args.listen:
+        result = coordinate_load(base_url, targets, args.listen, args.agents, rps=args.rps, duration=args.duration,
+                                 max_in_flight=args.max_in_flight, headers=headers, processes=args.processes)
+    elif args.processes > 1:
+        result = run_load_processes(base_url, targets, rps=args.rps, duration=args.duration,
+                                    max_in_flight=args.max_in_flight, headers=headers, processes=args.processes)
+    else:
+        result = run_load(base_url, targets, rps=args.rps, duration=args.duration,
+                          max_in_flight=args.max_in_flight, headers=headers)
+    print_load_report(result)
+    return all(route.errors == 0 for route in result.stats.values())
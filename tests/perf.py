@@ -0,0 +1,207 @@
+"""
+Performance regression checks on top of the load generator.
+
+A benchmark is a few short open-loop trials per route (see ``tests.load``).
+The p95 and throughput of each trial are kept as samples, so a new run can
+be compared with the stored baseline using the trial-to-trial spread as the
+noise estimate rather than a single fixed percentage. Budgets are absolute
+limits checked against the histogram merged over all trials.
+
+Baseline file layout (``schema_version`` 1)::
+
+    {
+      "schema_version": 1,
+      "budgets": {"GET /ai-tools?limit=50": {"p95_ms": 80, "max_error_rate": 0.01}},
+      "baseline": {
+        "recorded_at": "...", "git_commit": "...", "base_url": "...",
+        "rps": 20, "duration": 10, "runs": 5,
+        "routes": {"GET /ai-tools?limit=50": {"p95_ms": [...], "throughput": [...], ...}}
+      }
+    }
+"""
+
+import json
+import math
+import os
+import subprocess
+from datetime import datetime, timezone
+
+from tests.load import LatencyHistogram, run_load
+
+SCHEMA_VERSION = 1
+DEFAULT_RUNS = 5
+DEFAULT_TOLERANCE = 0.10
+DEFAULT_Z = 3.0
+
+
+class RouteSamples:
+    """Per-trial metrics for one route plus the histogram merged across trials."""
+
+    def __init__(self, name):
+        self.name = name
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.p50_ms = []
+        self.p95_ms = []
+        self.p99_ms = []
+        self.throughput = []
+
+    def add_trial(self, route, result):
+        h = route.histogram
+        self.histogram.merge(h)
+        self.requests += route.requests
+        self.errors += route.errors
+        self.p50_ms.append(h.value_at_percentile(50) / 1000)
+        self.p95_ms.append(h.value_at_percentile(95) / 1000)
+        self.p99_ms.append(h.value_at_percentile(99) / 1000)
+        # Successful responses per second; errors don't count as throughput
+        self.throughput.append((route.requests - route.errors) / result.elapsed if result.elapsed else 0)
+
+    def error_rate(self):
+        return self.errors / self.requests if self.requests else 0
+
+    def as_dict(self):
+        return {
+            'p50_ms': self.p50_ms,
+            'p95_ms': self.p95_ms,
+            'p99_ms': self.p99_ms,
+            'throughput': self.throughput,
+            'requests': self.requests,
+            'error_rate': self.error_rate(),
+            'merged_p95_ms': self.histogram.value_at_percentile(95) / 1000,
+        }
+
+
+def run_benchmark(base_url, targets, rps, duration, runs=DEFAULT_RUNS, warmup=0,
+                  max_in_flight=None, headers=None):
+    """Run ``runs`` load trials (after an optional discarded warmup); returns {route: RouteSamples}."""
+    kwargs = {'headers': headers}
+    if max_in_flight:
+        kwargs['max_in_flight'] = max_in_flight
+    if warmup:
+        print(f"🔥 Warmup: {warmup}s (discarded)")
+        run_load(base_url, targets, rps=rps, duration=warmup, **kwargs)
+
+    samples = {target.name: RouteSamples(target.name) for target in targets}
+    for trial in range(1, runs + 1):
+        result = run_load(base_url, targets, rps=rps, duration=duration, **kwargs)
+        for name, route in result.stats.items():
+            samples[name].add_trial(route, result)
+        summary = ", ".join(f"{name} p95 {s.p95_ms[-1]:.1f}ms" for name, s in samples.items())
+        print(f"   Trial {trial}/{runs}: {summary}")
+    return samples
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0
+
+
+def stdev(values):
+    if len(values) < 2:
+        return 0
+    m = mean(values)
+    return math.sqrt(sum((v - m) ** 2 for v in values) / (len(values) - 1))
+
+
+def significant_change(baseline, current, tolerance=DEFAULT_TOLERANCE, z=DEFAULT_Z):
+    """Relative change of ``current`` over ``baseline`` and whether it is beyond noise.
+
+    A change counts only when it is both larger than ``tolerance`` (relative
+    to the baseline mean) and larger than ``z`` standard errors of the
+    difference of the two trial means, so a noisy route needs a bigger shift
+    to be flagged than a stable one.
+    """
+    base_mean, cur_mean = mean(baseline), mean(current)
+    if not base_mean:
+        return 0, False
+    diff = cur_mean - base_mean
+    std_error = math.sqrt(stdev(baseline) ** 2 / len(baseline) + stdev(current) ** 2 / len(current))
+    relative = diff / base_mean
+    return relative, abs(relative) > tolerance and abs(diff) > z * std_error
+
+
+class Finding:
+    def __init__(self, route, check, passed, message):
+        self.route = route
+        self.check = check
+        self.passed = passed
+        self.message = message
+
+
+def compare(samples, baseline_file, tolerance=DEFAULT_TOLERANCE, z=DEFAULT_Z):
+    """Check a run against the budgets and baseline in ``baseline_file``; returns a list of Findings."""
+    findings = []
+    budgets = baseline_file.get('budgets', {})
+    baseline_routes = (baseline_file.get('baseline') or {}).get('routes', {})
+
+    for name, route in samples.items():
+        budget = budgets.get(name, {})
+        p95 = route.histogram.value_at_percentile(95) / 1000
+        if 'p95_ms' in budget:
+            findings.append(Finding(name, 'budget p95', p95 <= budget['p95_ms'],
+                                    f"p95 {p95:.1f}ms (budget {budget['p95_ms']}ms)"))
+        if 'max_error_rate' in budget:
+            findings.append(Finding(name, 'budget errors', route.error_rate() <= budget['max_error_rate'],
+                                    f"error rate {route.error_rate() * 100:.2f}% "
+                                    f"(budget {budget['max_error_rate'] * 100:.2f}%)"))
+
+        base = baseline_routes.get(name)
+        if not base:
+            continue
+        relative, significant = significant_change(base['p95_ms'], route.p95_ms, tolerance, z)
+        findings.append(Finding(name, 'baseline p95', not (significant and relative > 0),
+                                f"p95 {mean(route.p95_ms):.1f}ms vs {mean(base['p95_ms']):.1f}ms "
+                                f"({relative * 100:+.1f}%{', significant' if significant else ''})"))
+        relative, significant = significant_change(base['throughput'], route.throughput, tolerance, z)
+        findings.append(Finding(name, 'baseline req/s', not (significant and relative < 0),
+                                f"{mean(route.throughput):.1f} req/s vs {mean(base['throughput']):.1f} "
+                                f"({relative * 100:+.1f}%{', significant' if significant else ''})"))
+    return findings
+
+
+def load_baseline_file(path):
+    if not os.path.exists(path):
+        return {'schema_version': SCHEMA_VERSION, 'budgets': {}, 'baseline': None}
+    with open(path) as f:
+        data = json.load(f)
+    if data.get('schema_version') != SCHEMA_VERSION:
+        raise ValueError(f"{path}: unsupported schema_version {data.get('schema_version')}, "
+                         f"expected {SCHEMA_VERSION}")
+    return data
+
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def record_baseline(path, baseline_file, samples, base_url, rps, duration, runs):
+    """Store ``samples`` as the new baseline, keeping the budgets already in the file."""
+    baseline_file['schema_version'] = SCHEMA_VERSION
+    baseline_file['baseline'] = {
+        'recorded_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': current_commit(),
+        'base_url': base_url,
+        'rps': rps,
+        'duration': duration,
+        'runs': runs,
+        'routes': {name: route.as_dict() for name, route in samples.items()},
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline_file, f, indent=2)
+        f.write('\n')
+
+
+def print_findings(findings):
+    print("\n" + "="*80)
+    print("PERFORMANCE REGRESSION REPORT")
+    print("="*80)
+    for finding in findings:
+        status = "✅" if finding.passed else "❌"
+        print(f"{status} {finding.route} - {finding.check}: {finding.message}")
+    failed = sum(1 for finding in findings if not finding.passed)
+    print(f"\n{len(findings) - failed}/{len(findings)} checks passed")
@@ -0,0 +1,117 @@
+"""
+Machine-readable results for the Python test drivers.
+
+Every record is appended to an NDJSON file and flushed to disk as soon as it
+is written, so a run that hangs or is killed still leaves everything up to
+that point. A ``start`` record is written when a test case begins, which
+shows which case was running when a run stopped. The JUnit XML report is
+rewritten atomically after every result for CI and dashboards that ingest
+JUnit.
+
+NDJSON records::
+
+    {"event": "start", "suite": "backend", "case": "test_intro_email", "started_at": "..."}
+    {"event": "result", "suite": "backend", "case": "test_intro_email", "test": "Introduction Email Generator",
+     "passed": true, "message": "...", "started_at": "...", "duration_s": 0.41,
+     "http_status": 200, "response_size": 1532, "latency_ms": 402.1,
+     "server_timing_ms": {"db-connect": 0.0, "app": 35.2, "total": 35.2}, "timing": {...}}
+"""
+
+import json
+import os
+import socket
+import threading
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class ResultStream:
+    """Writes test results as NDJSON and JUnit XML while a run is in progress."""
+
+    def __init__(self, suite, ndjson_path=None, junit_path=None):
+        self.suite = suite
+        self.junit_path = junit_path
+        self.started_at = datetime.now(timezone.utc)
+        self.cases = []
+        self._lock = threading.Lock()
+        self._ndjson = open(ndjson_path, 'a', encoding='utf-8') if ndjson_path else None
+
+    @property
+    def enabled(self):
+        return bool(self._ndjson or self.junit_path)
+
+    def _write(self, record):
+        if not self._ndjson:
+            return
+        self._ndjson.write(json.dumps(record, default=str) + "\n")
+        self._ndjson.flush()
+        os.fsync(self._ndjson.fileno())
+
+    def start(self, case, started_at):
+        with self._lock:
+            self._write({'event': 'start', 'suite': self.suite, 'case': case, 'started_at': _iso(started_at)})
+
+    def record(self, test, passed, message="", case=None, started_at=None, duration=None, timing=None):
+        """Record one result; ``timing`` is the RequestTiming of the call that decided it, if any."""
+        record = {
+            'event': 'result',
+            'suite': self.suite,
+            'case': case,
+            'test': test,
+            'passed': passed,
+            'message': message,
+            'started_at': _iso(started_at) if started_at else None,
+            'duration_s': round(duration, 4) if duration is not None else None,
+            'http_status': timing.status if timing else None,
+            'response_size': timing.size if timing else None,
+            'latency_ms': round(timing.total * 1000, 1) if timing and timing.total is not None else None,
+            'server_timing_ms': timing.server_timing if timing else {},
+            'timing': timing.as_dict() if timing else None,
+        }
+        with self._lock:
+            self._write(record)
+            self.cases.append(record)
+            if self.junit_path:
+                self._write_junit()
+
+    def _write_junit(self):
+        failures = sum(1 for case in self.cases if not case['passed'])
+        total_time = sum(case['duration_s'] or 0 for case in self.cases)
+        suites = ET.Element('testsuites', tests=str(len(self.cases)), failures=str(failures),
+                            time=f"{total_time:.3f}")
+        suite = ET.SubElement(suites, 'testsuite', name=self.suite, tests=str(len(self.cases)),
+                              failures=str(failures), errors="0", time=f"{total_time:.3f}",
+                              timestamp=self.started_at.isoformat(), hostname=socket.gethostname())
+        for case in self.cases:
+            element = ET.SubElement(suite, 'testcase', classname=f"{self.suite}.{case['case'] or 'case'}",
+                                    name=case['test'], time=f"{case['duration_s'] or 0:.3f}")
+            properties = ET.SubElement(element, 'properties')
+            for key in ('http_status', 'response_size', 'latency_ms', 'started_at'):
+                if case[key] is not None:
+                    ET.SubElement(properties, 'property', name=key, value=str(case[key]))
+            for name, duration in case['server_timing_ms'].items():
+                ET.SubElement(properties, 'property', name=f"server_timing.{name}", value=str(duration))
+            if not case['passed']:
+                ET.SubElement(element, 'failure', message=case['message'] or 'failed')
+            elif case['message']:
+                ET.SubElement(element, 'system-out').text = case['message']
+
+        tmp_path = f"{self.junit_path}.tmp"
+        ET.ElementTree(suites).write(tmp_path, encoding='utf-8', xml_declaration=True)
+        os.replace(tmp_path, self.junit_path)
+
+    def close(self):
+        if self._ndjson:
+            self._ndjson.close()
+            self._ndjson = None
+
+
+def add_result_arguments(parser):
+    group = parser.add_argument_group("results")
+    group.add_argument("--results-ndjson", metavar="PATH",
+                       help="append every result to PATH as NDJSON while the run progresses")
+    group.add_argument("--junit", metavar="PATH", help="write a JUnit XML report to PATH (updated after every test)")
@@ -1,34 +1,60 @@
 #!/usr/bin/env python3
 
-import requests
+import argparse
 import json
 import time
 import sys
 from datetime import datetime
 
+from tests.http_client import API_BASE_URL, ApiClient
+from tests.load import LoadTarget, add_load_arguments, run_load_from_args
+
 # Configuration
-BASE_URL = "https://f2884661-c20b-483f-ad47-0b43883bbdde.preview.emergentagent.com/api"
-HEADERS = {
-    'Content-Type': 'application/json',
-    'Accept': 'application/json'
+BASE_URL = API_BASE_URL
+
+MISSING_FIELDS_PAYLOAD = {
+    "name": "Test Workflow",
+    # Missing apiKey, automationDescription, provider, platform
 }
 
+INVALID_PROVIDER_PAYLOAD = {
+    "name": "Test Workflow",
+    "provider": "invalid-provider",
+    "apiKey": "test-key",
+    "automationDescription": "Test automation",
+    "platform": "n8n"
+}
+
+# Requests replayed by --load. Only the validation paths are used so a load
+# run never fans out to the real LLM providers.
+LOAD_TARGETS = [
+    LoadTarget("POST /workflow-builder missing", "POST", "/workflow-builder/generate",
+               json=MISSING_FIELDS_PAYLOAD, expected_status=400),
+    LoadTarget("POST /workflow-builder provider", "POST", "/workflow-builder/generate",
+               json=INVALID_PROVIDER_PAYLOAD, expected_status=400),
+]
+
 class WorkflowBuilderTester:
     def __init__(self):
         self.passed_tests = 0
         self.failed_tests = 0
         self.test_results = []
+        self.client = ApiClient(BASE_URL)
         
     def log_test(self, test_name, passed, message=""):
         status = "✅ PASSED" if passed else "❌ FAILED"
         result = f"{status} - {test_name}"
         if message:
             result += f": {message}"
+        timing = self.client.pop_last_timing()
+        if timing:
+            result += f" [{timing.summary()}]"
         print(result)
         self.test_results.append({
             'test': test_name,
             'passed': passed,
-            'message': message
+            'message': message,
+            'timing': timing.as_dict() if timing else None
         })
         
         if passed:
@@ -54,7 +80,7 @@ class WorkflowBuilderTester:
                 "platform": "n8n"
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=60)
+            response = self.client.post("/workflow-builder/generate", json=payload, timeout=60)
             
             if response.status_code == 200:
                 data = response.json()
@@ -92,7 +118,7 @@ class WorkflowBuilderTester:
                 "platform": "make"
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=60)
+            response = self.client.post("/workflow-builder/generate", json=payload, timeout=60)
             
             if response.status_code == 200:
                 data = response.json()
@@ -121,12 +147,7 @@ class WorkflowBuilderTester:
         # Test 3: Missing required fields validation
         print("\n--- Testing Missing Required Fields ---")
         try:
-            payload = {
-                "name": "Test Workflow",
-                # Missing apiKey, automationDescription, provider, platform
-            }
-            
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS)
+            response = self.client.post("/workflow-builder/generate", json=MISSING_FIELDS_PAYLOAD)
             
             if response.status_code == 400:
                 data = response.json()
@@ -143,15 +164,7 @@ class WorkflowBuilderTester:
         # Test 4: Invalid provider validation
         print("\n--- Testing Invalid Provider Validation ---")
         try:
-            payload = {
-                "name": "Test Workflow",
-                "provider": "invalid-provider",
-                "apiKey": "test-key",
-                "automationDescription": "Test automation",
-                "platform": "n8n"
-            }
-            
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS)
+            response = self.client.post("/workflow-builder/generate", json=INVALID_PROVIDER_PAYLOAD)
             
             if response.status_code == 400:
                 data = response.json()
@@ -176,7 +189,7 @@ class WorkflowBuilderTester:
                 "platform": "invalid-platform"
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS)
+            response = self.client.post("/workflow-builder/generate", json=payload)
             
             if response.status_code == 400:
                 data = response.json()
@@ -202,7 +215,7 @@ class WorkflowBuilderTester:
                 "platform": "n8n"
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=60)
+            response = self.client.post("/workflow-builder/generate", json=payload, timeout=60)
             
             if response.status_code == 200:
                 data = response.json()
@@ -236,7 +249,7 @@ class WorkflowBuilderTester:
                 "platform": "n8n"
             }
             
-            response = requests.post(f"{BASE_URL}/workflow-builder/generate", json=payload, headers=HEADERS, timeout=30)
+            response = self.client.post("/workflow-builder/generate", json=payload, timeout=30)
             
             # Should either succeed with basic template or fail with API error
             if response.status_code == 200:
@@ -285,6 +298,13 @@ class WorkflowBuilderTester:
         return self.failed_tests == 0
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Workflow Builder backend tests")
+    add_load_arguments(parser)
+    args = parser.parse_args()
+    
+    if args.load:
+        sys.exit(0 if run_load_from_args(args, BASE_URL, LOAD_TARGETS) else 1)
+    
     tester = WorkflowBuilderTester()
     success = tester.run_all_tests()
     sys.exit(0 if success else 1)
\ No newline at end of file